@@ -1,4 +1,4 @@
 # app/api/endpoints/__init__.py
-from . import students, auth, attendance, grades, timetables, parents, staff, finance, communication, analytics, users
+from . import students, auth, attendance, grades, timetables, parents, staff, finance, communication, analytics, users, data_import_export
 
-__all__ = ["students", "auth", "attendance", "grades", "timetables", "parents", "staff", "finance", "communication", "analytics", "users"]
\ No newline at end of file
+__all__ = ["students", "auth", "attendance", "grades", "timetables", "parents", "staff", "finance", "communication", "analytics", "users", "data_import_export"]
\ No newline at end of file
@@ -1,9 +1,12 @@
 # app/api/endpoints/analytics.py
+import os
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import FileResponse
 from sqlalchemy.orm import Session
 from typing import List
 from datetime import date
 from app import crud, schemas, services
+from app.core.config import settings
 from app.database import get_db
 from app.dependencies import get_current_user
 
@@ -133,7 +136,14 @@ def create_generated_report(
             detail="Not authorized to create generated reports"
         )
     
-    return crud.create_generated_report(db=db, report=report, generated_by=current_user.id)
+    db_template = crud.get_report_template(db, template_id=report.template_id)
+    if db_template is None or not db_template.is_active:
+        raise HTTPException(status_code=404, detail="Report template not found")
+    
+    # The row is the job; a background worker renders the file and fills in file_path/file_size
+    db_report = crud.create_generated_report(db=db, report=report, generated_by=current_user.id)
+    services.report_worker.enqueue_report(db_report.id)
+    return db_report
 
 @router.get("/generated-reports/", response_model=List[schemas.GeneratedReport])
 def read_generated_reports(
@@ -187,6 +197,55 @@ def read_generated_report(
     
     return db_report
 
+@router.get("/generated-reports/{report_id}/status", response_model=schemas.GeneratedReportStatus)
+def read_generated_report_status(
+    report_id: int,
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    # Poll until status is "completed" or "failed"
+    db_report = crud.get_generated_report(db, report_id=report_id)
+    if db_report is None:
+        raise HTTPException(status_code=404, detail="Generated report not found")
+    
+    if current_user.role != "admin" and current_user.id != db_report.generated_by:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to access this generated report"
+        )
+    
+    return db_report
+
+@router.get("/generated-reports/{report_id}/download")
+def download_generated_report(
+    report_id: int,
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    db_report = crud.get_generated_report(db, report_id=report_id)
+    if db_report is None:
+        raise HTTPException(status_code=404, detail="Generated report not found")
+    
+    if current_user.role != "admin" and current_user.id != db_report.generated_by:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to access this generated report"
+        )
+    
+    if db_report.status != "completed" or not db_report.file_path:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Report is not ready (status: {db_report.status})"
+        )
+    
+    # Only ever serve rendered files from the reports directory
+    file_path = os.path.realpath(db_report.file_path)
+    reports_dir = os.path.realpath(settings.REPORTS_DIR)
+    if os.path.commonpath([file_path, reports_dir]) != reports_dir or not os.path.isfile(file_path):
+        raise HTTPException(status_code=404, detail="Report file not found")
+    
+    return FileResponse(file_path, filename=os.path.basename(file_path))
+
 @router.put("/generated-reports/{report_id}", response_model=schemas.GeneratedReport)
 def update_generated_report(
     report_id: int,
@@ -248,6 +307,33 @@ def get_attendance_analytics(
     )
     return analytics_data
 
+@router.get("/attendance-trend/", response_model=List[schemas.AttendanceTrendBucket])
+def get_attendance_trend(
+    start_date: date,
+    end_date: date,
+    granularity: str = "day",
+    class_name: str = None,
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    # Admins and teachers can access attendance trends
+    if current_user.role not in ["admin", "teacher"]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to access attendance analytics"
+        )
+    
+    if granularity not in services.analytics.TREND_GRANULARITIES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Granularity must be one of: day, week, month"
+        )
+    
+    trend_data = services.analytics.get_attendance_trend(
+        db, start_date=start_date, end_date=end_date, granularity=granularity, class_name=class_name
+    )
+    return trend_data
+
 @router.get("/grade-analytics/")
 def get_grade_analytics(
     subject: str = None,
@@ -267,9 +353,28 @@ def get_grade_analytics(
     )
     return analytics_data
 
+@router.get("/year-over-year/")
+def get_year_over_year_comparison(
+    class_name: str = None,
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    # Admins and teachers can access year-over-year comparisons
+    if current_user.role not in ["admin", "teacher"]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to access year-over-year comparisons"
+        )
+    
+    comparison_data = services.analytics.get_year_over_year_comparison(db, class_name=class_name)
+    return comparison_data
+
 @router.get("/student-performance-summary/")
 def get_student_performance_summary(
     student_id: int = None,
+    grade_level: str = None,
+    skip: int = 0,
+    limit: int = 100,
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
@@ -283,20 +388,58 @@ def get_student_performance_summary(
             )
         # If no student_id provided, use current user's ID
         student_id = current_user.id
-    elif current_user.role == "parent":
+    # Parents only ever see their own children
+    student_ids = None
+    if current_user.role == "parent":
+        parent_relationships = crud.get_parents_by_user(db, user_id=current_user.id)
+        student_ids = [p.student_id for p in parent_relationships]
         # Check if current user is parent of the student
-        if student_id:
-            parent_relationships = crud.get_parents_by_user(db, user_id=current_user.id)
-            student_ids = [p.student_id for p in parent_relationships]
-            if student_id not in student_ids:
-                raise HTTPException(
-                    status_code=status.HTTP_403_FORBIDDEN,
-                    detail="Not authorized to access this student's performance data"
-                )
-    
-    summary_data = services.analytics.get_student_performance_summary(db, student_id=student_id)
+        if student_id and student_id not in student_ids:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Not authorized to access this student's performance data"
+            )
+    
+    summary_data = services.analytics.get_student_performance_summary(
+        db, student_id=student_id, grade_level=grade_level, skip=skip, limit=limit, student_ids=student_ids
+    )
     return summary_data
 
+@router.get("/at-risk-students/", response_model=List[schemas.AtRiskStudentFlag])
+def get_at_risk_students(
+    grade_level: str = None,
+    skip: int = 0,
+    limit: int = 100,
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    # Admins and teachers can see the students flagged by the nightly batch
+    if current_user.role not in ["admin", "teacher"]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to access at-risk students"
+        )
+    
+    flags = crud.get_at_risk_flags(db, grade_level=grade_level, skip=skip, limit=limit)
+    return flags
+
+@router.get("/at-risk-students/{student_id}", response_model=schemas.AtRiskStudentFlag)
+def get_at_risk_student(
+    student_id: int,
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    if current_user.role not in ["admin", "teacher"]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to access at-risk students"
+        )
+    
+    flag = crud.get_at_risk_flag(db, student_id=student_id)
+    if flag is None:
+        raise HTTPException(status_code=404, detail="Student is not flagged as at risk")
+    return flag
+
 @router.get("/class-performance-summary/")
 def get_class_performance_summary(
     class_name: str = None,
@@ -1,18 +1,31 @@
 # app/api/endpoints/data_import_export.py
 from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from typing import List
-from app import crud, schemas
+from app import crud, schemas, services
+from app.core.config import settings
 from app.database import get_db
 from app.dependencies import get_current_user
 from app.services.data_import_export import (
-    import_students_from_csv,
-    import_teachers_from_csv,
-    import_parents_from_csv,
     export_students_to_csv,
     export_students_to_excel,
+    export_to_excel,
     export_students_to_pdf,
-    export_students_to_json
+    export_students_to_json,
+    export_entity_to_columnar,
+    EXPORT_ENTITIES,
+    EXPORT_ENTITY_ROLES,
+    WORKBOOK_SHEETS,
+    COLUMNAR_EXPORT_TYPES,
+    DELTA_EXPORT_TYPES,
+    delta_export_path,
+    export_entity_delta,
+    IMPORT_MODES,
+    SUPPORTED_IMPORT_TYPES,
+    stream_students_csv,
+    stream_students_ndjson,
+    stream_with_session
 )
 import os
 import uuid
@@ -20,15 +33,67 @@ from datetime import datetime
 
 router = APIRouter(prefix="/data", tags=["data-import-export"])
 
+# Bytes read from an upload at a time while saving it to disk
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
 # Import Endpoints
-@router.post("/import/students/csv")
-async def import_students_csv(
+def _check_import_mode(mode: str) -> None:
+    if mode not in IMPORT_MODES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unsupported import mode: {mode}. Use one of: {', '.join(IMPORT_MODES)}"
+        )
+
+def _check_import_file(file: UploadFile, file_type: str) -> None:
+    """The upload must be one of SUPPORTED_IMPORT_TYPES, and match the type in the path"""
+    if file_type not in SUPPORTED_IMPORT_TYPES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unsupported import type: {file_type}. Use one of: {', '.join(SUPPORTED_IMPORT_TYPES)}"
+        )
+    if not file.filename.lower().endswith(f".{file_type}"):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Only {file_type.upper()} files are allowed"
+        )
+
+async def _queue_import(file: UploadFile, import_type: str, db: Session, current_user, mode: str = "insert"):
+    """Save the upload and record it as a pending DataImport for the import worker"""
+    # Save uploaded file
+    upload_dir = settings.IMPORT_UPLOAD_DIR
+    os.makedirs(upload_dir, exist_ok=True)
+    file_extension = file.filename.split(".")[-1]
+    unique_filename = f"{uuid.uuid4()}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{file_extension}"
+    file_path = os.path.join(upload_dir, unique_filename)
+    
+    with open(file_path, "wb") as buffer:
+        # Copy in fixed-size chunks so a large upload is never held in memory
+        while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+            buffer.write(chunk)
+    
+    # Parsing and inserting run in the import worker, off the event loop
+    data_import = crud.create_data_import(db=db, data_import=schemas.DataImportCreate(
+        file_name=file.filename,
+        file_size=os.path.getsize(file_path),
+        file_type=file_extension.upper(),
+        import_type=import_type,
+        mode=mode,
+        imported_by=current_user.id
+    ), file_path=file_path)
+    services.import_worker.enqueue_import(data_import.id)
+    return data_import
+
+@router.post("/import/students/{file_type}", response_model=schemas.DataImport, status_code=status.HTTP_202_ACCEPTED)
+async def import_students_file(
+    file_type: str,
     file: UploadFile = File(...),
+    mode: str = "insert",
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
     """
-    Import students from CSV file
+    Queue an import of students from a CSV, xlsx or JSON file; poll /data/imports/{import_id} for progress.
+    With mode=upsert, rows matching an existing record update it instead of failing.
     """
     # Check if user has admin privileges
     if current_user.role != "admin":
@@ -37,35 +102,11 @@ async def import_students_csv(
             detail="Not authorized to import data"
         )
     
-    # Validate file type
-    if not file.filename.endswith(".csv"):
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Only CSV files are allowed"
-        )
+    _check_import_file(file, file_type)
+    _check_import_mode(mode)
     
     try:
-        # Save uploaded file
-        upload_dir = "uploads"
-        os.makedirs(upload_dir, exist_ok=True)
-        file_extension = file.filename.split(".")[-1]
-        unique_filename = f"{uuid.uuid4()}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{file_extension}"
-        file_path = os.path.join(upload_dir, unique_filename)
-        
-        with open(file_path, "wb") as buffer:
-            content = await file.read()
-            buffer.write(content)
-        
-        # Import data
-        result = import_students_from_csv(file_path, db)
-        
-        # Clean up uploaded file
-        os.remove(file_path)
-        
-        return {
-            "message": "Students imported successfully",
-            "result": result
-        }
+        return await _queue_import(file, "students", db, current_user, mode)
         
     except Exception as e:
         raise HTTPException(
@@ -73,14 +114,17 @@ async def import_students_csv(
             detail=f"Failed to import students: {str(e)}"
         )
 
-@router.post("/import/teachers/csv")
-async def import_teachers_csv(
+@router.post("/import/teachers/{file_type}", response_model=schemas.DataImport, status_code=status.HTTP_202_ACCEPTED)
+async def import_teachers_file(
+    file_type: str,
     file: UploadFile = File(...),
+    mode: str = "insert",
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
     """
-    Import teachers from CSV file
+    Queue an import of teachers from a CSV, xlsx or JSON file; poll /data/imports/{import_id} for progress.
+    With mode=upsert, rows matching an existing record update it instead of failing.
     """
     # Check if user has admin privileges
     if current_user.role != "admin":
@@ -89,35 +133,11 @@ async def import_teachers_csv(
             detail="Not authorized to import data"
         )
     
-    # Validate file type
-    if not file.filename.endswith(".csv"):
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Only CSV files are allowed"
-        )
+    _check_import_file(file, file_type)
+    _check_import_mode(mode)
     
     try:
-        # Save uploaded file
-        upload_dir = "uploads"
-        os.makedirs(upload_dir, exist_ok=True)
-        file_extension = file.filename.split(".")[-1]
-        unique_filename = f"{uuid.uuid4()}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{file_extension}"
-        file_path = os.path.join(upload_dir, unique_filename)
-        
-        with open(file_path, "wb") as buffer:
-            content = await file.read()
-            buffer.write(content)
-        
-        # Import data
-        result = import_teachers_from_csv(file_path, db)
-        
-        # Clean up uploaded file
-        os.remove(file_path)
-        
-        return {
-            "message": "Teachers imported successfully",
-            "result": result
-        }
+        return await _queue_import(file, "teachers", db, current_user, mode)
         
     except Exception as e:
         raise HTTPException(
@@ -125,14 +145,17 @@ async def import_teachers_csv(
             detail=f"Failed to import teachers: {str(e)}"
         )
 
-@router.post("/import/parents/csv")
-async def import_parents_csv(
+@router.post("/import/parents/{file_type}", response_model=schemas.DataImport, status_code=status.HTTP_202_ACCEPTED)
+async def import_parents_file(
+    file_type: str,
     file: UploadFile = File(...),
+    mode: str = "insert",
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
     """
-    Import parents from CSV file
+    Queue an import of parents from a CSV, xlsx or JSON file; poll /data/imports/{import_id} for progress.
+    With mode=upsert, rows matching an existing record update it instead of failing.
     """
     # Check if user has admin privileges
     if current_user.role != "admin":
@@ -141,43 +164,91 @@ async def import_parents_csv(
             detail="Not authorized to import data"
         )
     
-    # Validate file type
-    if not file.filename.endswith(".csv"):
+    _check_import_file(file, file_type)
+    _check_import_mode(mode)
+    
+    try:
+        return await _queue_import(file, "parents", db, current_user, mode)
+        
+    except Exception as e:
         raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Only CSV files are allowed"
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to import parents: {str(e)}"
+        )
+
+@router.post("/import/attendance/{file_type}", response_model=schemas.DataImport, status_code=status.HTTP_202_ACCEPTED)
+async def import_attendance_file(
+    file_type: str,
+    file: UploadFile = File(...),
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    """
+    Queue an import of attendance from a CSV, xlsx or JSON file; poll /data/imports/{import_id} for progress.
+    Records are attributed to the importing user; ones already recorded are skipped.
+    """
+    # Check if user has admin privileges
+    if current_user.role != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to import data"
         )
     
+    _check_import_file(file, file_type)
+    
     try:
-        # Save uploaded file
-        upload_dir = "uploads"
-        os.makedirs(upload_dir, exist_ok=True)
-        file_extension = file.filename.split(".")[-1]
-        unique_filename = f"{uuid.uuid4()}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{file_extension}"
-        file_path = os.path.join(upload_dir, unique_filename)
-        
-        with open(file_path, "wb") as buffer:
-            content = await file.read()
-            buffer.write(content)
-        
-        # Import data
-        result = import_parents_from_csv(file_path, db)
+        return await _queue_import(file, "attendance", db, current_user)
         
-        # Clean up uploaded file
-        os.remove(file_path)
-        
-        return {
-            "message": "Parents imported successfully",
-            "result": result
-        }
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to import attendance: {str(e)}"
+        )
+
+@router.post("/import/grades/{file_type}", response_model=schemas.DataImport, status_code=status.HTTP_202_ACCEPTED)
+async def import_grades_file(
+    file_type: str,
+    file: UploadFile = File(...),
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    """
+    Queue an import of grades from a CSV, xlsx or JSON file; poll /data/imports/{import_id} for progress.
+    Required columns: student_id, subject, assessment_type, assessment_name, date_assigned,
+    score and employee_id; optional: grade_value, max_score, date_due, date_submitted,
+    date_graded and comments. Grades that already exist are skipped.
+    """
+    # Check if user has admin privileges
+    if current_user.role != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to import data"
+        )
+    
+    _check_import_file(file, file_type)
+    
+    try:
+        return await _queue_import(file, "grades", db, current_user)
         
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to import parents: {str(e)}"
+            detail=f"Failed to import grades: {str(e)}"
         )
 
 # Export Endpoints
+def _check_export_entity(entity: str, current_user) -> None:
+    if entity not in EXPORT_ENTITIES:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Unknown export entity: {entity}. Use one of: {', '.join(EXPORT_ENTITIES)}"
+        )
+    if current_user.role not in EXPORT_ENTITY_ROLES[entity]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=f"Not authorized to export {entity.replace('_', ' ')}"
+        )
+
 @router.get("/export/students/csv")
 async def export_students_csv(
     db: Session = Depends(get_db),
@@ -330,6 +401,160 @@ async def export_students_json(
             detail=f"Failed to export students: {str(e)}"
         )
 
+# Streaming exports: format -> (row stream, media type, file extension)
+STREAM_EXPORT_FORMATS = {
+    "csv": (stream_students_csv, "text/csv", "csv"),
+    "ndjson": (stream_students_ndjson, "application/x-ndjson", "ndjson"),
+}
+
+@router.get("/export/students/stream")
+def stream_students_export(
+    format: str = "csv",
+    current_user = Depends(get_current_user)
+):
+    """
+    Stream every student as CSV or NDJSON straight from the database, without
+    writing a file first
+    """
+    # Check if user has appropriate privileges
+    if current_user.role not in ["admin", "teacher"]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to export data"
+        )
+    if format not in STREAM_EXPORT_FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unsupported export format: {format}. Use one of: {', '.join(STREAM_EXPORT_FORMATS)}"
+        )
+    
+    stream, media_type, extension = STREAM_EXPORT_FORMATS[format]
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    # The response body is produced after this returns, so the stream opens its own session
+    return StreamingResponse(
+        stream_with_session(stream),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="students_{timestamp}.{extension}"'}
+    )
+
+@router.get("/export/workbook/excel")
+def export_workbook_excel(
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    """
+    Export students, parents and fee payments to one Excel workbook, a sheet each;
+    only the sheets the user may export are included
+    """
+    sheets = [(title, entity) for title, entity in WORKBOOK_SHEETS if current_user.role in EXPORT_ENTITY_ROLES[entity]]
+    if not sheets:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to export data"
+        )
+    
+    try:
+        # Create export directory
+        export_dir = "exports"
+        os.makedirs(export_dir, exist_ok=True)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        file_path = os.path.join(export_dir, f"workbook_{timestamp}.xlsx")
+        
+        # Export data
+        result = export_to_excel(db, file_path, sheets)
+        
+        # Return file path for download
+        return {
+            "message": "Workbook exported successfully",
+            "file_path": file_path,
+            "result": result
+        }
+        
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to export workbook: {str(e)}"
+        )
+
+@router.post("/export/{entity}/delta", response_model=schemas.DataExport)
+def export_entity_delta_endpoint(
+    entity: str,
+    consumer: str,
+    file_type: str = "csv",
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    """
+    Export the rows of an entity changed since the consumer's previous delta export
+    (all rows the first time). The returned record carries the file path and the
+    new watermark.
+    """
+    # Check that the user may export this entity
+    _check_export_entity(entity, current_user)
+    if file_type not in DELTA_EXPORT_TYPES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unsupported export format: {file_type}. Use one of: {', '.join(DELTA_EXPORT_TYPES)}"
+        )
+    
+    try:
+        # Create export directory
+        export_dir = "exports"
+        os.makedirs(export_dir, exist_ok=True)
+        file_path = delta_export_path(export_dir, entity, consumer, file_type)
+        
+        return export_entity_delta(db, entity, consumer, file_path, file_type, exported_by=current_user.id)
+        
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to export {entity}: {str(e)}"
+        )
+
+# Columnar exports: file extension by export type
+COLUMNAR_EXTENSIONS = {"parquet": "parquet", "arrow": "arrow"}
+
+@router.get("/export/{entity}/{file_type}")
+def export_entity_columnar(
+    entity: str,
+    file_type: str,
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    """
+    Export students, attendance, grades or fee payments to a Parquet or Arrow IPC file
+    """
+    # Check that the user may export this entity
+    _check_export_entity(entity, current_user)
+    if file_type not in COLUMNAR_EXPORT_TYPES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unsupported export format: {file_type}. Use one of: {', '.join(COLUMNAR_EXPORT_TYPES)}"
+        )
+    
+    try:
+        # Create export directory
+        export_dir = "exports"
+        os.makedirs(export_dir, exist_ok=True)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        file_path = os.path.join(export_dir, f"{entity}_{timestamp}.{COLUMNAR_EXTENSIONS[file_type]}")
+        
+        # Export data
+        result = export_entity_to_columnar(db, entity, file_path, file_type)
+        
+        # Return file path for download
+        return {
+            "message": f"{entity.replace('_', ' ').capitalize()} exported successfully",
+            "file_path": file_path,
+            "result": result
+        }
+        
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to export {entity}: {str(e)}"
+        )
+
 # Data Import/Export Management Endpoints
 @router.post("/imports/", response_model=schemas.DataImport)
 def create_data_import(
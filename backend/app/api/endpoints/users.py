@@ -1,4 +1,5 @@
 # app/api/endpoints/users.py
+import secrets
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from typing import List
@@ -131,6 +132,32 @@ def create_user_for_admin(
     created_user = crud.create_user(db=db, user=user)
     return created_user
 
+@router.post("/admin/{user_id}/reset-password", response_model=schemas.PasswordReset)
+def reset_user_password(
+    user_id: int,
+    db: Session = Depends(get_db),
+    current_user = Depends(require_permission(Permission.RESET_PASSWORD))
+):
+    """
+    Give a user a new random temporary password, returned only in this response.
+    This is how accounts created by bulk teacher imports, which get no usable
+    password, are handed to their owners.
+    """
+    db_user = crud.get_user(db, user_id=user_id)
+    if not db_user:
+        raise HTTPException(status_code=404, detail="User not found")
+    
+    # Admins cannot reset the passwords of other admins or super admins
+    if current_user.role == "admin" and db_user.role in ["admin", "super_admin"]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admins cannot reset the passwords of other admins or super admins"
+        )
+    
+    temporary_password = secrets.token_urlsafe(12)
+    crud.set_user_password(db, user_id=user_id, password=temporary_password)
+    return schemas.PasswordReset(user_id=user_id, temporary_password=temporary_password)
+
 # User Profile Endpoints (Self-Management)
 @router.get("/me", response_model=schemas.User)
 def read_user_me(current_user = Depends(get_current_active_user)):
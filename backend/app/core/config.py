@@ -16,6 +16,47 @@ class Settings(BaseSettings):
     # Database
     SQLALCHEMY_DATABASE_URL: str = "sqlite:///./academic.db"
     
+    # Analytics caching
+    CLASS_SUMMARY_CACHE_TTL_SECONDS: int = 300
+    DASHBOARD_CACHE_TTL_SECONDS: int = 60
+    
+    # Where heavy analytics aggregations run: "sqlite" (the application database) or "duckdb"
+    ANALYTICS_BACKEND: str = "sqlite"
+    
+    # In-memory columnar snapshot of grades and attendance
+    ANALYTICS_SNAPSHOT_ENABLED: bool = False
+    ANALYTICS_SNAPSHOT_REFRESH_SECONDS: int = 60
+    ANALYTICS_SNAPSHOT_FULL_RELOAD_SECONDS: int = 3600
+    
+    # At-risk detection batch (app/detect_at_risk.py)
+    AT_RISK_ATTENDANCE_WINDOW_DAYS: int = 30
+    AT_RISK_ATTENDANCE_THRESHOLD: float = 75.0  # percent
+    AT_RISK_GRADE_WINDOW_DAYS: int = 120
+    AT_RISK_GRADE_SLOPE_THRESHOLD: float = -5.0  # normalized points per 30 days
+    AT_RISK_MIN_ASSESSMENTS: int = 3
+    
+    # Background report generation
+    REPORTS_DIR: str = "reports"
+    REPORT_WORKER_THREADS: int = 2
+    
+    # Rendered report files reused for identical template/parameters/data version
+    REPORT_CACHE_DIR: str = "reports/cache"
+    REPORT_CACHE_MAX_BYTES: int = 512 * 1024 * 1024
+    REPORT_CACHE_TTL_SECONDS: int = 3600
+    
+    # Background data imports; the worker only reads and removes files in IMPORT_UPLOAD_DIR
+    IMPORT_UPLOAD_DIR: str = "uploads"
+    IMPORT_WORKER_THREADS: int = 2
+    # Processes parsing large CSV imports in parallel (0 parses in the import thread),
+    # and the file size from which they are used
+    IMPORT_PARSE_PROCESSES: int = 4
+    IMPORT_PARALLEL_MIN_BYTES: int = 32 * 1024 * 1024
+    
+    # Delta exports stop this far behind the database clock. updated_at is stamped when
+    # a row is written, not when it commits, so this must exceed the longest write
+    # transaction (e.g. an import chunk) or rows committed late are never exported.
+    DELTA_EXPORT_WATERMARK_LAG_SECONDS: int = 300
+    
     class Config:
         case_sensitive = True
         # env_file = ".env" # Uncomment if you use a .env file
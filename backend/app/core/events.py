@@ -0,0 +1,20 @@
+# app/core/events.py
+from typing import Callable, Iterable, List, Optional
+
+# Listeners are called as listener(table_name, grade_levels) after data in
+# `table_name` changes. grade_levels lists the affected classes, or is empty
+# when they are unknown (listeners should then treat every class as affected).
+DataChangeListener = Callable[[str, List[str]], None]
+
+_data_change_listeners: List[DataChangeListener] = []
+
+def on_data_change(listener: DataChangeListener) -> DataChangeListener:
+    """Register a data change listener (usable as a decorator)"""
+    _data_change_listeners.append(listener)
+    return listener
+
+def notify_data_change(table_name: str, grade_levels: Optional[Iterable[str]] = None) -> None:
+    """Tell registered listeners that rows in `table_name` changed"""
+    affected = sorted({level for level in (grade_levels or []) if level is not None})
+    for listener in _data_change_listeners:
+        listener(table_name, affected)
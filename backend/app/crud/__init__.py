@@ -7,6 +7,7 @@ from .user import (
     get_user_by_email,
     get_users,
     create_user,
+    set_user_password,
     authenticate_user,
 )
 
@@ -29,6 +30,8 @@ from .attendance import (
     create_attendance,
     update_attendance,
     delete_attendance,
+    apply_attendance_rollup_deltas,
+    rebuild_attendance_daily_rollup,
 )
 
 # --- Grade CRUD ---
@@ -133,13 +136,45 @@ from .analytics import (
     get_generated_reports_by_user,
     create_generated_report,
     update_generated_report,
+    get_pending_generated_report_ids,
+    claim_generated_report,
+    complete_generated_report,
+    fail_generated_report,
     delete_generated_report,
+    get_at_risk_flag,
+    get_at_risk_flags,
+)
+
+# --- Data Import/Export CRUD ---
+from .data_import_export import (
+    get_data_import,
+    get_data_imports,
+    get_data_imports_by_user,
+    get_data_imports_by_type,
+    get_data_imports_by_status,
+    create_data_import,
+    update_data_import,
+    get_pending_data_import_ids,
+    claim_data_import,
+    delete_data_import,
+    get_data_export,
+    get_data_exports,
+    get_data_exports_by_user,
+    get_data_exports_by_type,
+    get_data_exports_by_status,
+    create_data_export,
+    create_delta_export,
+    complete_data_export,
+    fail_data_export,
+    get_export_watermark,
+    update_data_export,
+    delete_data_export,
 )
 
 # Explicitly list what this package exports
 __all__ = [
     # User
-    "get_user", "get_user_by_email", "get_users", "create_user", "authenticate_user",
+    "get_user", "get_user_by_email", "get_users", "create_user", "set_user_password", "authenticate_user",
     
     # Student
     "get_student", "get_student_by_student_id", "get_students", "create_student", "update_student", "delete_student",
@@ -147,6 +182,7 @@ __all__ = [
     # Attendance
     "get_attendance", "get_attendance_by_student_and_date", "get_attendance_by_student",
     "get_attendance_by_date", "create_attendance", "update_attendance", "delete_attendance",
+    "apply_attendance_rollup_deltas", "rebuild_attendance_daily_rollup",
     
     # Grade
     "get_grade", "get_grades_by_student", "get_grades_by_subject", "get_grades_by_teacher",
@@ -180,5 +216,14 @@ __all__ = [
     "get_report_template", "get_report_templates", "get_report_templates_by_type", "create_report_template",
     "update_report_template", "delete_report_template", "get_generated_report", "get_generated_reports",
     "get_generated_reports_by_template", "get_generated_reports_by_user", "create_generated_report",
-    "update_generated_report", "delete_generated_report",
+    "update_generated_report", "get_pending_generated_report_ids", "claim_generated_report",
+    "complete_generated_report", "fail_generated_report", "delete_generated_report", "get_at_risk_flag", "get_at_risk_flags",
+    
+    # Data Import/Export
+    "get_data_import", "get_data_imports", "get_data_imports_by_user", "get_data_imports_by_type",
+    "get_data_imports_by_status", "create_data_import", "update_data_import", "get_pending_data_import_ids",
+    "claim_data_import", "delete_data_import", "get_data_export", "get_data_exports", "get_data_exports_by_user",
+    "get_data_exports_by_type", "get_data_exports_by_status", "create_data_export", "create_delta_export",
+    "complete_data_export", "fail_data_export", "get_export_watermark",
+    "update_data_export", "delete_data_export",
 ]
\ No newline at end of file
@@ -1,8 +1,9 @@
 # app/crud/analytics.py
 from sqlalchemy.orm import Session
-from app.models.analytics import ReportTemplate, GeneratedReport
+from app.models.analytics import ReportTemplate, GeneratedReport, AtRiskStudentFlag
 from app.schemas.analytics import ReportTemplateCreate, GeneratedReportCreate
 from app.schemas.analytics import ReportTemplateUpdate, GeneratedReportUpdate
+from datetime import datetime
 from typing import List, Optional
 
 # Report Template CRUD
@@ -69,9 +70,57 @@ def update_generated_report(db: Session, report_id: int, report_update: Generate
         db.refresh(db_report)
     return db_report
 
+# Report job lifecycle: pending -> processing -> completed | failed
+def get_pending_generated_report_ids(db: Session) -> List[int]:
+    rows = db.query(GeneratedReport.id).filter(GeneratedReport.status == "pending").order_by(GeneratedReport.id).all()
+    return [report_id for (report_id,) in rows]
+
+def claim_generated_report(db: Session, report_id: int) -> Optional[GeneratedReport]:
+    """Move a pending report to processing; returns None if another worker already claimed it"""
+    claimed = db.query(GeneratedReport).filter(
+        GeneratedReport.id == report_id,
+        GeneratedReport.status == "pending"
+    ).update({"status": "processing", "started_at": datetime.now()}, synchronize_session=False)
+    db.commit()
+    if not claimed:
+        return None
+    return get_generated_report(db, report_id)
+
+def complete_generated_report(db: Session, report_id: int, file_path: str, file_size: int) -> Optional[GeneratedReport]:
+    db_report = db.query(GeneratedReport).filter(GeneratedReport.id == report_id).first()
+    if db_report:
+        db_report.status = "completed"
+        db_report.file_path = file_path
+        db_report.file_size = file_size
+        db_report.error = None
+        db_report.completed_at = datetime.now()
+        db.commit()
+        db.refresh(db_report)
+    return db_report
+
+def fail_generated_report(db: Session, report_id: int, error: str) -> Optional[GeneratedReport]:
+    db_report = db.query(GeneratedReport).filter(GeneratedReport.id == report_id).first()
+    if db_report:
+        db_report.status = "failed"
+        db_report.error = error
+        db_report.completed_at = datetime.now()
+        db.commit()
+        db.refresh(db_report)
+    return db_report
+
 def delete_generated_report(db: Session, report_id: int) -> Optional[GeneratedReport]:
     db_report = db.query(GeneratedReport).filter(GeneratedReport.id == report_id).first()
     if db_report:
         db.delete(db_report)
         db.commit()
-    return db_report
\ No newline at end of file
+    return db_report
+
+# At-risk Student Flags (written by services.at_risk)
+def get_at_risk_flag(db: Session, student_id: int) -> Optional[AtRiskStudentFlag]:
+    return db.query(AtRiskStudentFlag).filter(AtRiskStudentFlag.student_id == student_id).first()
+
+def get_at_risk_flags(db: Session, grade_level: str = None, skip: int = 0, limit: int = 100) -> List[AtRiskStudentFlag]:
+    query = db.query(AtRiskStudentFlag)
+    if grade_level:
+        query = query.filter(AtRiskStudentFlag.grade_level == grade_level)
+    return query.order_by(AtRiskStudentFlag.student_id).offset(skip).limit(limit).all()
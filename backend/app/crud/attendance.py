@@ -1,9 +1,14 @@
 # app/crud/attendance.py
+from sqlalchemy import func, delete
 from sqlalchemy.orm import Session
-from app.models.attendance import Attendance
+from app.core.events import notify_data_change
+from app.database import upsert_insert
+from app.models.attendance import Attendance, AttendanceDailyRollup
+from app.models.student import Student
 from app.schemas.attendance import AttendanceCreate
+from collections import Counter
 from datetime import date
-from typing import List
+from typing import List, Dict, Tuple
 
 def get_attendance(db: Session, attendance_id: int):
     return db.query(Attendance).filter(Attendance.id == attendance_id).first()
@@ -29,22 +34,101 @@ def create_attendance(db: Session, attendance: AttendanceCreate, recorded_by: in
         recorded_by=recorded_by
     )
     db.add(db_attendance)
+    key = (attendance.date, _get_grade_level(db, attendance.student_id), attendance.status.lower())
+    apply_attendance_rollup_deltas(db, {key: 1})
     db.commit()
     db.refresh(db_attendance)
+    notify_data_change("attendance", [key[1]])
     return db_attendance
 
 def update_attendance(db: Session, attendance_id: int, attendance_data):
     db_attendance = db.query(Attendance).filter(Attendance.id == attendance_id).first()
     if db_attendance:
+        old_key = _rollup_key(db, db_attendance)
         for key, value in attendance_data.dict(exclude_unset=True).items():
             setattr(db_attendance, key, value)
+        new_key = _rollup_key(db, db_attendance)
+        if new_key != old_key:
+            apply_attendance_rollup_deltas(db, {old_key: -1, new_key: 1})
         db.commit()
         db.refresh(db_attendance)
+        notify_data_change("attendance", [old_key[1], new_key[1]])
     return db_attendance
 
 def delete_attendance(db: Session, attendance_id: int):
     db_attendance = db.query(Attendance).filter(Attendance.id == attendance_id).first()
     if db_attendance:
+        key = _rollup_key(db, db_attendance)
+        apply_attendance_rollup_deltas(db, {key: -1})
         db.delete(db_attendance)
         db.commit()
-    return db_attendance
\ No newline at end of file
+        notify_data_change("attendance", [key[1]])
+    return db_attendance
+
+# --- Daily rollup maintenance ---
+def _get_grade_level(db: Session, student_id: int):
+    return db.query(Student.grade_level).filter(Student.id == student_id).scalar()
+
+def _rollup_key(db: Session, db_attendance: Attendance) -> Tuple[date, str, str]:
+    return (
+        db_attendance.date,
+        _get_grade_level(db, db_attendance.student_id),
+        db_attendance.status.lower()
+    )
+
+def apply_attendance_rollup_deltas(db: Session, deltas: Dict[Tuple[date, str, str], int]) -> None:
+    """
+    Add count deltas keyed by (date, grade_level, status) to attendance_daily_rollup.
+    Runs inside the caller's transaction; the caller commits.
+    """
+    rows = [
+        {"date": day, "grade_level": grade_level, "status": status, "count": delta}
+        for (day, grade_level, status), delta in deltas.items()
+        if delta and grade_level is not None
+    ]
+    if not rows:
+        return
+    stmt = upsert_insert(AttendanceDailyRollup)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["date", "grade_level", "status"],
+        set_={"count": AttendanceDailyRollup.count + stmt.excluded["count"]}
+    )
+    db.execute(stmt, rows)
+
+def move_student_attendance_rollup(db: Session, student_id: int, old_grade_level: str, new_grade_level: str) -> None:
+    """Re-file a student's attendance counts under a new grade level"""
+    counts = db.query(
+        Attendance.date, func.lower(Attendance.status), func.count(Attendance.id)
+    ).filter(Attendance.student_id == student_id).group_by(
+        Attendance.date, func.lower(Attendance.status)
+    ).all()
+    deltas = Counter()
+    for day, status, count in counts:
+        deltas[(day, old_grade_level, status)] -= count
+        deltas[(day, new_grade_level, status)] += count
+    apply_attendance_rollup_deltas(db, deltas)
+
+def rebuild_attendance_daily_rollup(db: Session) -> int:
+    """
+    Recompute attendance_daily_rollup from the attendance table (backfills and repairs).
+    Replaces the whole table in one transaction, so it is safe to re-run at any time.
+    Returns the number of rollup rows written.
+    """
+    status = func.lower(Attendance.status)
+    # Students without a grade level are not counted, as in apply_attendance_rollup_deltas
+    source = db.query(
+        Attendance.date, Student.grade_level, status, func.count(Attendance.id)
+    ).join(Student, Student.id == Attendance.student_id).filter(
+        Student.grade_level.isnot(None)
+    ).group_by(
+        Attendance.date, Student.grade_level, status
+    )
+    db.execute(delete(AttendanceDailyRollup))
+    db.execute(
+        AttendanceDailyRollup.__table__.insert().from_select(
+            ["date", "grade_level", "status", "count"], source.statement
+        )
+    )
+    db.commit()
+    notify_data_change("attendance")
+    return db.query(func.count()).select_from(AttendanceDailyRollup).scalar()
@@ -1,8 +1,11 @@
 # app/crud/data_import_export.py
+import os
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from app.models.data_import_export import DataImport, DataExport
 from app.schemas.data_import_export import DataImportCreate, DataExportCreate
 from app.schemas.data_import_export import DataImportUpdate, DataExportUpdate
+from datetime import datetime
 from typing import List, Optional
 
 # Data Import CRUD
@@ -21,8 +24,11 @@ def get_data_imports_by_type(db: Session, import_type: str, skip: int = 0, limit
 def get_data_imports_by_status(db: Session, status: str, skip: int = 0, limit: int = 100) -> List[DataImport]:
     return db.query(DataImport).filter(DataImport.status == status).offset(skip).limit(limit).all()
 
-def create_data_import(db: Session, data_import: DataImportCreate) -> DataImport:
-    db_data_import = DataImport(**data_import.dict())
+def create_data_import(db: Session, data_import: DataImportCreate, imported_by: int = None, file_path: str = "") -> DataImport:
+    """file_path is the saved upload; records created without one are never run by the import worker"""
+    db_data_import = DataImport(**data_import.dict(), file_path=file_path)
+    if imported_by is not None:
+        db_data_import.imported_by = imported_by
     db.add(db_data_import)
     db.commit()
     db.refresh(db_data_import)
@@ -38,6 +44,28 @@ def update_data_import(db: Session, data_import_id: int, data_import_update: Dat
         db.refresh(db_data_import)
     return db_data_import
 
+# Import job lifecycle: pending -> processing -> completed | failed. Only queued uploads
+# (records with a file_path) take part; records created through POST /data/imports/
+# are bookkeeping and stay as they were created.
+def get_pending_data_import_ids(db: Session) -> List[int]:
+    rows = db.query(DataImport.id).filter(
+        DataImport.status == "pending",
+        DataImport.file_path != ""
+    ).order_by(DataImport.id).all()
+    return [data_import_id for (data_import_id,) in rows]
+
+def claim_data_import(db: Session, data_import_id: int) -> Optional[DataImport]:
+    """Move a pending import to processing; returns None if another worker already claimed it"""
+    claimed = db.query(DataImport).filter(
+        DataImport.id == data_import_id,
+        DataImport.status == "pending",
+        DataImport.file_path != ""
+    ).update({"status": "processing", "started_at": datetime.now()}, synchronize_session=False)
+    db.commit()
+    if not claimed:
+        return None
+    return get_data_import(db, data_import_id)
+
 def delete_data_import(db: Session, data_import_id: int) -> Optional[DataImport]:
     db_data_import = db.query(DataImport).filter(DataImport.id == data_import_id).first()
     if db_data_import:
@@ -61,13 +89,63 @@ def get_data_exports_by_type(db: Session, export_type: str, skip: int = 0, limit
 def get_data_exports_by_status(db: Session, status: str, skip: int = 0, limit: int = 100) -> List[DataExport]:
     return db.query(DataExport).filter(DataExport.status == status).offset(skip).limit(limit).all()
 
-def create_data_export(db: Session, data_export: DataExportCreate) -> DataExport:
+def create_data_export(db: Session, data_export: DataExportCreate, exported_by: int = None) -> DataExport:
     db_data_export = DataExport(**data_export.dict())
+    if exported_by is not None:
+        db_data_export.exported_by = exported_by
+    db.add(db_data_export)
+    db.commit()
+    db.refresh(db_data_export)
+    return db_data_export
+
+# Delta export lifecycle: processing -> completed | failed; only the server writes these
+def create_delta_export(db: Session, file_path: str, file_type: str, export_type: str, exported_by: int,
+                        consumer: str, since: Optional[datetime], watermark: datetime) -> DataExport:
+    db_data_export = DataExport(
+        file_name=os.path.basename(file_path),
+        file_path=file_path,
+        file_type=file_type,
+        export_type=export_type,
+        status="processing",
+        exported_by=exported_by,
+        consumer=consumer,
+        since=since,
+        watermark=watermark,
+        started_at=datetime.now()
+    )
     db.add(db_data_export)
     db.commit()
     db.refresh(db_data_export)
     return db_data_export
 
+def complete_data_export(db: Session, data_export_id: int, total_records: int, file_size: int) -> Optional[DataExport]:
+    db_data_export = db.query(DataExport).filter(DataExport.id == data_export_id).first()
+    if db_data_export:
+        db_data_export.status = "completed"
+        db_data_export.total_records = total_records
+        db_data_export.file_size = file_size
+        db_data_export.completed_at = datetime.now()
+        db.commit()
+        db.refresh(db_data_export)
+    return db_data_export
+
+def fail_data_export(db: Session, data_export_id: int) -> Optional[DataExport]:
+    db_data_export = db.query(DataExport).filter(DataExport.id == data_export_id).first()
+    if db_data_export:
+        db_data_export.status = "failed"
+        db_data_export.completed_at = datetime.now()
+        db.commit()
+        db.refresh(db_data_export)
+    return db_data_export
+
+def get_export_watermark(db: Session, consumer: str, export_type: str) -> Optional[datetime]:
+    """Latest watermark of the consumer's completed delta exports of export_type; None if there are none"""
+    return db.query(func.max(DataExport.watermark)).filter(
+        DataExport.consumer == consumer,
+        DataExport.export_type == export_type,
+        DataExport.status == "completed"
+    ).scalar()
+
 def update_data_export(db: Session, data_export_id: int, data_export_update: DataExportUpdate) -> Optional[DataExport]:
     db_data_export = db.query(DataExport).filter(DataExport.id == data_export_id).first()
     if db_data_export:
@@ -1,7 +1,8 @@
 # app/crud/finance.py
 from sqlalchemy.orm import Session
-from app.models.finance import FeeStructure, FeePayment  # Remove Expense from this line
-from app.schemas.finance import FeeStructureCreate, FeePaymentCreate  # Remove ExpenseCreate
+from app.core.events import notify_data_change
+from app.models.finance import FeeStructure, FeePayment
+from app.schemas.finance import FeeStructureCreate, FeePaymentCreate
 from typing import List, Optional
 
 # --- Fee Structure CRUD ---
@@ -22,6 +23,7 @@ def create_fee_structure(db: Session, fee_structure: FeeStructureCreate):
     db.add(db_fee_structure)
     db.commit()
     db.refresh(db_fee_structure)
+    notify_data_change("fee_structures")
     return db_fee_structure
 
 def update_fee_structure(db: Session, fee_structure_id: int, fee_structure_update):
@@ -32,6 +34,7 @@ def update_fee_structure(db: Session, fee_structure_id: int, fee_structure_updat
             setattr(db_fee_structure, field, value)
         db.commit()
         db.refresh(db_fee_structure)
+        notify_data_change("fee_structures")
     return db_fee_structure
 
 def delete_fee_structure(db: Session, fee_structure_id: int):
@@ -39,6 +42,7 @@ def delete_fee_structure(db: Session, fee_structure_id: int):
     if db_fee_structure:
         db.delete(db_fee_structure)
         db.commit()
+        notify_data_change("fee_structures")
     return db_fee_structure
 
 # --- Fee Payment CRUD ---
@@ -62,6 +66,7 @@ def create_fee_payment(db: Session, fee_payment: FeePaymentCreate):
     db.add(db_fee_payment)
     db.commit()
     db.refresh(db_fee_payment)
+    notify_data_change("fee_payments")
     return db_fee_payment
 
 def update_fee_payment(db: Session, fee_payment_id: int, fee_payment_update):
@@ -72,6 +77,7 @@ def update_fee_payment(db: Session, fee_payment_id: int, fee_payment_update):
             setattr(db_fee_payment, field, value)
         db.commit()
         db.refresh(db_fee_payment)
+        notify_data_change("fee_payments")
     return db_fee_payment
 
 def delete_fee_payment(db: Session, fee_payment_id: int):
@@ -79,7 +85,5 @@ def delete_fee_payment(db: Session, fee_payment_id: int):
     if db_fee_payment:
         db.delete(db_fee_payment)
         db.commit()
+        notify_data_change("fee_payments")
     return db_fee_payment
-
-# Remove all Expense-related functions since Expense model doesn't exist yet
-# If you want to add Expense functionality later, create the Expense model first
\ No newline at end of file
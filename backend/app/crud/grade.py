@@ -1,6 +1,8 @@
 # app/crud/grade.py
 from sqlalchemy.orm import Session
+from app.core.events import notify_data_change
 from app.models.grade import Grade
+from app.models.student import Student
 from app.schemas.grade import GradeCreate, GradeUpdate
 from typing import List, Optional
 
@@ -21,21 +23,31 @@ def create_grade(db: Session, grade: GradeCreate) -> Grade:
     db.add(db_grade)
     db.commit()
     db.refresh(db_grade)
+    notify_data_change("grades", [_get_grade_level(db, db_grade.student_id)])
     return db_grade
 
 def update_grade(db: Session, grade_id: int, grade_update: GradeUpdate) -> Optional[Grade]:
     db_grade = db.query(Grade).filter(Grade.id == grade_id).first()
     if db_grade:
+        old_student_id = db_grade.student_id
         update_data = grade_update.dict(exclude_unset=True)
         for field, value in update_data.items():
             setattr(db_grade, field, value)
         db.commit()
         db.refresh(db_grade)
+        notify_data_change("grades", [
+            _get_grade_level(db, old_student_id), _get_grade_level(db, db_grade.student_id)
+        ])
     return db_grade
 
 def delete_grade(db: Session, grade_id: int) -> Optional[Grade]:
     db_grade = db.query(Grade).filter(Grade.id == grade_id).first()
     if db_grade:
+        grade_level = _get_grade_level(db, db_grade.student_id)
         db.delete(db_grade)
         db.commit()
-    return db_grade
\ No newline at end of file
+        notify_data_change("grades", [grade_level])
+    return db_grade
+
+def _get_grade_level(db: Session, student_id: int) -> Optional[str]:
+    return db.query(Student.grade_level).filter(Student.id == student_id).scalar()
\ No newline at end of file
@@ -1,7 +1,9 @@
 # app/crud/student.py
 from sqlalchemy.orm import Session
+from app.core.events import notify_data_change
 from app.models.student import Student
 from app.schemas.student import StudentCreate
+from app.crud.attendance import move_student_attendance_rollup
 from typing import List, Optional
 
 def get_student(db: Session, student_id: int) -> Optional[Student]:
@@ -18,21 +20,28 @@ def create_student(db: Session, student: StudentCreate) -> Student:
     db.add(db_student)
     db.commit()
     db.refresh(db_student)
+    notify_data_change("students", [db_student.grade_level])
     return db_student
 
 def update_student(db: Session, student_id: int, student_update) -> Optional[Student]:
     db_student = db.query(Student).filter(Student.id == student_id).first()
     if db_student:
+        old_grade_level = db_student.grade_level
         update_data = student_update.dict(exclude_unset=True)
         for field, value in update_data.items():
             setattr(db_student, field, value)
+        if db_student.grade_level != old_grade_level:
+            move_student_attendance_rollup(db, db_student.id, old_grade_level, db_student.grade_level)
         db.commit()
         db.refresh(db_student)
+        notify_data_change("students", [old_grade_level, db_student.grade_level])
     return db_student
 
 def delete_student(db: Session, student_id: int) -> Optional[Student]:
     db_student = db.query(Student).filter(Student.id == student_id).first()
     if db_student:
+        grade_level = db_student.grade_level
         db.delete(db_student)
         db.commit()
+        notify_data_change("students", [grade_level])
     return db_student
\ No newline at end of file
@@ -47,6 +47,14 @@ def update_user(db: Session, user_id: int, user_update: UserUpdate):
         db.refresh(db_user)
     return db_user
 
+def set_user_password(db: Session, user_id: int, password: str):
+    db_user = db.query(User).filter(User.id == user_id).first()
+    if db_user:
+        db_user.hashed_password = get_password_hash(password)
+        db.commit()
+        db.refresh(db_user)
+    return db_user
+
 def delete_user(db: Session, user_id: int):
     db_user = db.query(User).filter(User.id == user_id).first()
     if db_user:
@@ -0,0 +1,29 @@
+# app/detect_at_risk.py
+import sys
+import os
+
+# Add the parent directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database import Base, SessionLocal, engine
+from app.models.analytics import AtRiskStudentFlag
+from app.services.at_risk import detect_at_risk_students
+
+# Run nightly, e.g. from cron: 0 2 * * * cd /path/to/backend && python app/detect_at_risk.py
+def detect_at_risk():
+    # Make sure the flags table exists on databases created before it was added
+    Base.metadata.create_all(bind=engine, tables=[AtRiskStudentFlag.__table__])
+    
+    print("Scanning active students for at-risk indicators...")
+    db = SessionLocal()
+    try:
+        result = detect_at_risk_students(db)
+    finally:
+        db.close()
+    print(
+        f"Scanned {result['students_scanned']} students, flagged {result['flagged']} "
+        f"({result['low_attendance']} low attendance, {result['declining_grades']} declining grades)."
+    )
+
+if __name__ == "__main__":
+    detect_at_risk()
@@ -5,20 +5,15 @@ import os
 # Add the parent directory to Python path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from sqlalchemy import create_engine
-from app.database import Base
-# Import ALL models to ensure they are registered with the Base
-# This is crucial for Base.metadata.create_all() to work
-from app.models import user, student, attendance, grade, timetable, parent, staff, finance, communication, analytics
-
-# Use SQLite for simplicity (adjust for production DB)
-SQLALCHEMY_DATABASE_URL = "sqlite:///./academic.db"
-engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
+# The application's engine (settings.SQLALCHEMY_DATABASE_URL); app.migrations imports
+# ALL models, so every table is registered with Base before upgrade_schema runs
+from app.database import engine
+from app.migrations import upgrade_schema
 
 def init_db():
-    # Create all tables defined in models and imported above
+    # Create missing tables and bring existing ones up to date with the models
     print("Creating tables...")
-    Base.metadata.create_all(bind=engine)
+    upgrade_schema(engine)
     print("Database initialized successfully!")
 
 if __name__ == "__main__":
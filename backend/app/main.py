@@ -1,12 +1,16 @@
 # app/main.py
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.api.endpoints import students, auth, attendance, grades, timetables, parents, staff, finance, communication, analytics, users
-from app.database import engine, Base
+from app.api.endpoints import students, auth, attendance, grades, timetables, parents, staff, finance, communication, analytics, users, data_import_export
+from app.database import engine
 from app import models
+from app.migrations import upgrade_schema
+from app.core.config import settings
+from app.services.analytics_snapshot import analytics_snapshot
+from app.services import report_worker, import_worker
 
-# Create all tables
-Base.metadata.create_all(bind=engine)
+# Create all tables, and bring tables from older databases up to date
+upgrade_schema(engine)
 
 app = FastAPI(title="Project Academic - School Management System")
 
@@ -19,6 +23,22 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.on_event("startup")
+def start_analytics_snapshot():
+    # Periodically load grades and attendance into memory for analytics reads
+    if settings.ANALYTICS_SNAPSHOT_ENABLED:
+        analytics_snapshot.start_periodic_refresh(settings.ANALYTICS_SNAPSHOT_REFRESH_SECONDS)
+
+@app.on_event("startup")
+def resume_report_generation():
+    # Reports queued before a restart are still pending in generated_reports
+    report_worker.resume_pending_reports()
+
+@app.on_event("startup")
+def resume_data_imports():
+    # Uploads queued before a restart are still pending in data_imports
+    import_worker.resume_pending_imports()
+
 # Include routers
 app.include_router(auth.router, prefix="/api/v1")
 app.include_router(students.router, prefix="/api/v1")
@@ -31,6 +51,7 @@ app.include_router(finance.router, prefix="/api/v1")
 app.include_router(communication.router, prefix="/api/v1")
 app.include_router(analytics.router, prefix="/api/v1")
 app.include_router(users.router, prefix="/api/v1")
+app.include_router(data_import_export.router, prefix="/api/v1")
 
 @app.get("/")
 def read_root():
@@ -0,0 +1,92 @@
+# app/migrations.py
+# In-place upgrades for databases created before a model gained tables, columns or indexes.
+# Base.metadata.create_all only creates missing tables, so columns and indexes added
+# to existing tables are applied here, and derived tables are filled in, before
+# anything queries them.
+import logging
+from sqlalchemy import UniqueConstraint, inspect, text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from app.database import Base
+from app import models  # noqa: F401 - registers every table on Base.metadata
+from app.crud.attendance import rebuild_attendance_daily_rollup
+
+logger = logging.getLogger(__name__)
+
+# Run once, right after the column is added, to fill it in for existing rows
+COLUMN_BACKFILLS = {
+    # Reports rendered before the worker queue existed were written synchronously
+    ("generated_reports", "status"): (
+        "UPDATE generated_reports SET status = CASE WHEN file_path IS NULL THEN 'failed' ELSE 'completed' END"
+    ),
+}
+
+# Run once, right after the table is created on an existing database, to derive its
+# rows from data written before it existed
+TABLE_BACKFILLS = {
+    "attendance_daily_rollup": rebuild_attendance_daily_rollup,
+}
+
+def _add_missing_columns(connection, table, existing_columns) -> None:
+    for column in table.columns:
+        if column.name in existing_columns:
+            continue
+        column_type = column.type.compile(dialect=connection.dialect)
+        connection.execute(text(f'ALTER TABLE {table.name} ADD COLUMN "{column.name}" {column_type}'))
+        backfill = COLUMN_BACKFILLS.get((table.name, column.name))
+        if backfill:
+            connection.execute(text(backfill))
+        logger.info("Added column %s.%s", table.name, column.name)
+
+def _add_missing_indexes(connection, table, existing_indexes) -> None:
+    for index in table.indexes:
+        if index.name not in existing_indexes:
+            index.create(connection)
+            logger.info("Created index %s", index.name)
+
+def _add_missing_unique_constraints(connection, table, existing_indexes) -> None:
+    # SQLite cannot add a constraint to an existing table; a unique index over the
+    # same columns enforces it and serves as an ON CONFLICT target just as well
+    for constraint in table.constraints:
+        if not isinstance(constraint, UniqueConstraint) or not constraint.name:
+            continue
+        if constraint.name in existing_indexes:
+            continue
+        columns = ", ".join(f'"{column.name}"' for column in constraint.columns)
+        try:
+            with connection.begin_nested():
+                connection.execute(text(
+                    f'CREATE UNIQUE INDEX "{constraint.name}" ON {table.name} ({columns})'
+                ))
+        except IntegrityError:
+            logger.warning("Cannot create %s: %s has duplicate (%s) rows", constraint.name, table.name, columns)
+            continue
+        logger.info("Created unique index %s", constraint.name)
+
+def upgrade_schema(engine: Engine) -> None:
+    """
+    Create missing tables, then add the columns, indexes and unique constraints existing
+    tables lack, then backfill derived tables that were just created
+    """
+    existing_tables = set(inspect(engine).get_table_names())
+    Base.metadata.create_all(bind=engine)
+    inspector = inspect(engine)
+    for table in Base.metadata.sorted_tables:
+        existing_columns = {column["name"] for column in inspector.get_columns(table.name)}
+        existing_indexes = {index["name"] for index in inspector.get_indexes(table.name)}
+        existing_indexes |= {constraint["name"] for constraint in inspector.get_unique_constraints(table.name)}
+        with engine.begin() as connection:
+            _add_missing_columns(connection, table, existing_columns)
+            _add_missing_indexes(connection, table, existing_indexes)
+            _add_missing_unique_constraints(connection, table, existing_indexes)
+    
+    # A brand-new database has nothing to derive from
+    if not existing_tables:
+        return
+    for table_name, backfill in TABLE_BACKFILLS.items():
+        if table_name in existing_tables:
+            continue
+        with Session(bind=engine) as db:
+            row_count = backfill(db)
+        logger.info("Backfilled %s with %s rows", table_name, row_count)
@@ -6,7 +6,7 @@ from . import user, student, attendance, grade, timetable, parent, staff, financ
 # This makes `from app.models import User` work.
 from .user import User, UserRole
 from .student import Student
-from .attendance import Attendance
+from .attendance import Attendance, AttendanceDailyRollup
 from .grade import Grade
 from .timetable import Timetable
 from .parent import Parent
@@ -17,6 +17,6 @@ from .finance import FeeStructure, FeePayment # Based on previous fixes
 # Define what this package exports when imported with `from app.models import *`
 __all__ = [
     "user", "student", "attendance", "grade", "timetable", "parent", "staff", "finance", "communication", "analytics",
-    "User", "UserRole", "Student", "Attendance", "Grade", "Timetable", "Parent", "Staff", "FeeStructure", "FeePayment"
+    "User", "UserRole", "Student", "Attendance", "AttendanceDailyRollup", "Grade", "Timetable", "Parent", "Staff", "FeeStructure", "FeePayment"
     # Add Expense if/when it's added
 ]
@@ -1,5 +1,5 @@
 # app/models/analytics.py
-from sqlalchemy import Column, Integer, String, Date, DateTime, ForeignKey, Float, Boolean
+from sqlalchemy import Column, Integer, String, Date, DateTime, ForeignKey, Float, Boolean, Text, JSON
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
@@ -30,7 +30,26 @@ class GeneratedReport(Base):
     generated_at = Column(DateTime, server_default=func.now())
     file_path = Column(String(500), nullable=True)
     file_size = Column(Integer, nullable=True)  # in bytes
+    parameters = Column(JSON, nullable=True)  # e.g. start_date, end_date, class_name
+    status = Column(String(20), default="pending", index=True)  # pending, processing, completed, failed
+    error = Column(Text, nullable=True)
+    started_at = Column(DateTime, nullable=True)
+    completed_at = Column(DateTime, nullable=True)
     
     # Relationships
     template = relationship("ReportTemplate")
-    generated_by_user = relationship("User", foreign_keys=[generated_by])
\ No newline at end of file
+    generated_by_user = relationship("User", foreign_keys=[generated_by])
+
+class AtRiskStudentFlag(Base):
+    __tablename__ = "at_risk_student_flags"
+    
+    # Rewritten in full by the at-risk detection batch (services.at_risk); one row per flagged student
+    student_id = Column(Integer, ForeignKey("students.id"), primary_key=True)
+    grade_level = Column(String, nullable=True, index=True)
+    attendance_rate = Column(Float, nullable=True)  # trailing window, percent
+    grade_slope = Column(Float, nullable=True)  # normalized score points per 30 days
+    reasons = Column(String(100), nullable=False)  # comma-separated: low_attendance, declining_grades
+    computed_at = Column(DateTime, nullable=False)
+    
+    # Relationships
+    student = relationship("Student")
@@ -1,12 +1,16 @@
 # app/models/attendance.py
-from sqlalchemy import Column, Integer, Date, DateTime, String, ForeignKey
+from sqlalchemy import Column, Integer, Date, DateTime, String, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
 
 class Attendance(Base):
     __tablename__ = "attendance"
-    __table_args__ = {'extend_existing': True}  # Add this line
+    __table_args__ = (
+        # Covers the date-range GROUP BY in the attendance analytics
+        Index("ix_attendance_date_status_student", "date", "status", "student_id"),
+        {'extend_existing': True},
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     student_id = Column(Integer, ForeignKey("students.id"), nullable=False)
@@ -15,8 +19,18 @@ class Attendance(Base):
     remarks = Column(String, nullable=True)
     recorded_by = Column(Integer, ForeignKey("users.id"), nullable=False)
     created_at = Column(DateTime, server_default=func.now())
-    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now(), index=True)
     
     # Relationships
     student = relationship("Student", back_populates="attendance_records")
-    recorded_by_user = relationship("User", foreign_keys=[recorded_by])
\ No newline at end of file
+    recorded_by_user = relationship("User", foreign_keys=[recorded_by])
+
+class AttendanceDailyRollup(Base):
+    __tablename__ = "attendance_daily_rollup"
+    __table_args__ = {'extend_existing': True}
+    
+    # Pre-aggregated attendance counts, maintained by crud.attendance
+    date = Column(Date, primary_key=True)
+    grade_level = Column(String, primary_key=True)
+    status = Column(String(20), primary_key=True)  # lower-cased: present, absent, late, excused
+    count = Column(Integer, nullable=False, default=0)
\ No newline at end of file
@@ -13,6 +13,7 @@ class DataImport(Base):
     file_size = Column(Integer, nullable=False)
     file_type = Column(String(50), nullable=False)  # CSV, Excel, JSON
     import_type = Column(String(50), nullable=False)  # students, teachers, parents, etc.
+    mode = Column(String(20), default="insert")  # insert, upsert
     status = Column(String(20), default="pending")  # pending, processing, completed, failed
     total_records = Column(Integer, nullable=True)
     successful_records = Column(Integer, nullable=True)
@@ -39,6 +40,10 @@ class DataExport(Base):
     status = Column(String(20), default="pending")  # pending, processing, completed, failed
     total_records = Column(Integer, nullable=True)
     exported_by = Column(Integer, ForeignKey("users.id"), nullable=False)
+    # Delta exports: who the export is for, and the updated_at range it covers (since, watermark]
+    consumer = Column(String(100), nullable=True, index=True)
+    since = Column(DateTime, nullable=True)
+    watermark = Column(DateTime, nullable=True)
     started_at = Column(DateTime, nullable=True)
     completed_at = Column(DateTime, nullable=True)
     created_at = Column(DateTime, server_default=func.now())
@@ -1,5 +1,5 @@
 # app/models/finance.py
-from sqlalchemy import Column, Integer, String, Float, DateTime, Date, Text, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, String, Float, DateTime, Date, Text, Boolean, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
@@ -25,7 +25,11 @@ class FeeStructure(Base):
 
 class FeePayment(Base):
     __tablename__ = "fee_payments"
-    __table_args__ = {'extend_existing': True}  # Add this line
+    __table_args__ = (
+        # Date-range revenue aggregation in the financial summary
+        Index("ix_fee_payments_payment_date_fee_structure", "payment_date", "fee_structure_id"),
+        {'extend_existing': True},
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     student_id = Column(Integer, ForeignKey("students.id"), nullable=False)
@@ -39,7 +43,7 @@ class FeePayment(Base):
     receipt_number = Column(String(50), nullable=True, unique=True)
     created_by = Column(Integer, ForeignKey("users.id"), nullable=False)
     created_at = Column(DateTime, server_default=func.now())
-    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now(), index=True)
     
     # Relationships
     student = relationship("Student", back_populates="fee_payments")
@@ -48,7 +52,11 @@ class FeePayment(Base):
 
 class Expense(Base):
     __tablename__ = "expenses"
-    __table_args__ = {'extend_existing': True}  # Add this line - This fixes the issue!
+    __table_args__ = (
+        # Date-range expense aggregation in the financial summary
+        Index("ix_expenses_expense_date_category", "expense_date", "category"),
+        {'extend_existing': True},
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     description = Column(Text, nullable=False)
@@ -23,7 +23,7 @@ class Grade(Base):
     teacher_id = Column(Integer, ForeignKey("staff.id"), nullable=False)
     comments = Column(Text, nullable=True)
     created_at = Column(DateTime, server_default=func.now())
-    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now(), index=True)
     
     # Relationships
     student = relationship("Student", back_populates="grades")
@@ -1,12 +1,16 @@
 # app/models/parent.py
-from sqlalchemy import Column, Integer, String, DateTime, Date, Text, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Date, Text, Boolean, ForeignKey, UniqueConstraint
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
 
 class Parent(Base):
     __tablename__ = "parents"
-    __table_args__ = {'extend_existing': True}  # Add this line
+    __table_args__ = (
+        # Natural key of a parent record; the conflict target of upsert imports
+        UniqueConstraint("user_id", "student_id", name="uq_parents_user_student"),
+        {'extend_existing': True},
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
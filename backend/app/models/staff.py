@@ -20,7 +20,7 @@ class Staff(Base):
     emergency_contact = Column(String(50), nullable=True)
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime, server_default=func.now())
-    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now(), index=True)
     
     # Relationships
     user = relationship("User", back_populates="staff_profile")
@@ -21,7 +21,7 @@ class Student(Base):
     grade_level = Column(String, nullable=False)
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime, server_default=func.now())
-    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now(), index=True)
     
     # Relationships
     attendance_records = relationship("Attendance", back_populates="student")
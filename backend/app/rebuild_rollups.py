@@ -0,0 +1,26 @@
+# app/rebuild_rollups.py
+import sys
+import os
+
+# Add the parent directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database import Base, SessionLocal, engine
+from app.models.attendance import AttendanceDailyRollup
+from app.crud.attendance import rebuild_attendance_daily_rollup
+
+def rebuild_rollups():
+    # upgrade_schema backfills the rollup when it creates the table; this repairs it on demand
+    # and also creates it on databases that have not been upgraded yet
+    Base.metadata.create_all(bind=engine, tables=[AttendanceDailyRollup.__table__])
+    
+    print("Rebuilding attendance_daily_rollup...")
+    db = SessionLocal()
+    try:
+        row_count = rebuild_attendance_daily_rollup(db)
+    finally:
+        db.close()
+    print(f"Rollup rebuilt with {row_count} rows.")
+
+if __name__ == "__main__":
+    rebuild_rollups()
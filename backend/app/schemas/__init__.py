@@ -1,6 +1,6 @@
 # app/schemas/__init__.py
 from .student import Student, StudentCreate, StudentUpdate, StudentInDBBase, StudentBase
-from .user import User, UserCreate, UserUpdate, UserInDBBase, UserBase, UserRole
+from .user import User, UserCreate, UserUpdate, UserInDBBase, UserBase, UserRole, PasswordReset
 from .auth import Token, TokenPayload, LoginRequest
 from .attendance import Attendance, AttendanceCreate, AttendanceUpdate, AttendanceInDBBase, AttendanceBase
 from .grade import Grade, GradeCreate, GradeUpdate, GradeInDBBase, GradeBase
@@ -25,8 +25,11 @@ from .data_import_export import (
 
 from .analytics import (
     AttendanceAnalytics,
+    AttendanceTrendBucket,
     GradeAnalytics,
+    YearOverYearComparison,
     StudentPerformanceSummary,
+    AtRiskStudentFlag,
     ClassPerformanceSummary,
     FinancialSummary,
     DashboardData,
@@ -39,12 +42,13 @@ from .analytics import (
     GeneratedReportCreate,
     GeneratedReportUpdate,
     GeneratedReportInDBBase,
-    GeneratedReportBase
+    GeneratedReportBase,
+    GeneratedReportStatus
 )
 
 __all__ = [
     "Student", "StudentCreate", "StudentUpdate", "StudentInDBBase", "StudentBase",
-    "User", "UserCreate", "UserUpdate", "UserInDBBase", "UserBase", "UserRole",
+    "User", "UserCreate", "UserUpdate", "UserInDBBase", "UserBase", "UserRole", "PasswordReset",
     "Token", "TokenPayload", "LoginRequest",
     "Attendance", "AttendanceCreate", "AttendanceUpdate", "AttendanceInDBBase", "AttendanceBase",
     "Grade", "GradeCreate", "GradeUpdate", "GradeInDBBase", "GradeBase",
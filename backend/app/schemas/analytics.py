@@ -9,6 +9,16 @@ class AttendanceAnalytics(BaseModel):
     present: int
     absent: int
     late: int
+    excused: int = 0
+    total: int
+    attendance_rate: float
+
+class AttendanceTrendBucket(BaseModel):
+    period_start: date  # first day of the day/week/month bucket
+    present: int
+    absent: int
+    late: int
+    excused: int = 0
     total: int
     attendance_rate: float
 
@@ -20,16 +30,39 @@ class GradeAnalytics(BaseModel):
     lowest_score: float
     passing_rate: float
     total_students: int
+    percentiles: Dict[str, float] = {}  # p25, p50, p75, p90 of normalized scores
+    histogram: Dict[str, int] = {}  # score buckets of 10 points, e.g. "80-90"
+
+# Year-over-year comparison
+class YearOverYearComparison(BaseModel):
+    year: int
+    attendance_rate: Optional[float] = None
+    attendance_records: int
+    average_grade: Optional[float] = None
+    assessments: int
 
 # Student Performance Summary Schemas
 class StudentPerformanceSummary(BaseModel):
     student_id: int
     student_name: str
+    grade_level: Optional[str] = None
     total_subjects: int
     average_grade: float
     attendance_rate: float
     rank: Optional[int] = None
 
+# At-risk Student Flag Schemas
+class AtRiskStudentFlag(BaseModel):
+    student_id: int
+    grade_level: Optional[str] = None
+    attendance_rate: Optional[float] = None
+    grade_slope: Optional[float] = None  # normalized score points per 30 days
+    reasons: str
+    computed_at: datetime
+    
+    class Config:
+        from_attributes = True
+
 # Class Performance Summary Schemas
 class ClassPerformanceSummary(BaseModel):
     class_name: str
@@ -56,6 +89,7 @@ class DashboardData(BaseModel):
     average_grade: float
     total_revenue: float
     total_expenses: float
+    at_risk_students: int = 0
     recent_announcements: List[Dict[str, Any]]
     upcoming_events: List[Dict[str, Any]]
 
@@ -89,8 +123,7 @@ class GeneratedReportBase(BaseModel):
     template_id: int
     report_name: str
     report_type: str
-    file_path: Optional[str] = None
-    file_size: Optional[int] = None
+    parameters: Optional[Dict[str, Any]] = None
 
 class GeneratedReportCreate(GeneratedReportBase):
     pass
@@ -102,9 +135,27 @@ class GeneratedReportInDBBase(GeneratedReportBase):
     id: int
     generated_by: int
     generated_at: Optional[datetime] = None
+    # Set only by the report worker
+    file_path: Optional[str] = None
+    file_size: Optional[int] = None
+    status: Optional[str] = None
+    error: Optional[str] = None
+    started_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
     
     class Config:
         from_attributes = True
 
 class GeneratedReport(GeneratedReportInDBBase):
-    pass
\ No newline at end of file
+    pass
+
+class GeneratedReportStatus(BaseModel):
+    id: int
+    status: Optional[str] = None
+    error: Optional[str] = None
+    file_size: Optional[int] = None
+    started_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+    
+    class Config:
+        from_attributes = True
\ No newline at end of file
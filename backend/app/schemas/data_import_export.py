@@ -7,11 +7,10 @@ from typing import Optional
 # Data Import Schemas
 class DataImportBase(BaseModel):
     file_name: str
-    file_path: str
     file_size: int
     file_type: str
     import_type: str
-    status: str = "pending"
+    mode: str = "insert"
     total_records: Optional[int] = None
     successful_records: Optional[int] = None
     failed_records: Optional[int] = None
@@ -33,6 +32,9 @@ class DataImportUpdate(BaseModel):  # ← Fixed: Inherit from BaseModel, not Dat
 
 class DataImportInDBBase(DataImportBase):
     id: int
+    # Set only by the server: the saved upload and the job status
+    file_path: str
+    status: str = "pending"
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
     
@@ -49,7 +51,6 @@ class DataExportBase(BaseModel):
     file_size: Optional[int] = None
     file_type: str
     export_type: str
-    status: str = "pending"
     total_records: Optional[int] = None
     exported_by: int
     started_at: Optional[datetime] = None
@@ -59,12 +60,17 @@ class DataExportCreate(DataExportBase):
     pass
 
 class DataExportUpdate(BaseModel):  # ← Fixed: Inherit from BaseModel, not DataExportBase
-    status: Optional[str] = None
     total_records: Optional[int] = None
+    file_size: Optional[int] = None
     completed_at: Optional[datetime] = None
 
 class DataExportInDBBase(DataExportBase):
     id: int
+    # Set only by the server; delta exports trust consumer/watermark of completed exports
+    status: str = "pending"
+    consumer: Optional[str] = None
+    since: Optional[datetime] = None
+    watermark: Optional[datetime] = None
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
     
@@ -41,6 +41,10 @@ class User(UserInDBBase):
 class UserInDB(UserInDBBase):
     hashed_password: str
 
+class PasswordReset(BaseModel):
+    user_id: int
+    temporary_password: str
+
 # --- Auth Schemas ---
 class Token(BaseModel):
     access_token: str
@@ -1,4 +1,4 @@
 # app/services/__init__.py
-from . import analytics
+from . import analytics, analytics_snapshot, at_risk, duckdb_analytics, report_cache, reports, report_worker, data_import_export, import_worker
 
-__all__ = ["analytics"]
\ No newline at end of file
+__all__ = ["analytics", "analytics_snapshot", "at_risk", "duckdb_analytics", "report_cache", "reports", "report_worker", "data_import_export", "import_worker"]
\ No newline at end of file
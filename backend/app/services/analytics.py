@@ -1,148 +1,586 @@
 # app/services/analytics.py
+import numpy as np
+from sqlalchemy import func, case, cast, extract, type_coerce, Date
 from sqlalchemy.orm import Session
-from datetime import date, datetime, timedelta
-from typing import List, Dict, Any
-from app import crud, schemas
-from app.models import student, attendance, grade, user, finance, communication
+from datetime import date
+from typing import List, Dict
+from app import schemas
+from app.core.cache import KeyedCache, StaleWhileRevalidateCache
+from app.core.config import settings
+from app.core.events import on_data_change
+from app.database import SessionLocal
+from app.models import student, attendance, grade, user, finance, communication, staff
+from app.models.analytics import AtRiskStudentFlag
+from app.services import duckdb_analytics
+from app.services.analytics_snapshot import analytics_snapshot
+
+# Normalized score (percent of max_score) needed to pass an assessment
+PASSING_PERCENTAGE = 50.0
+GRADE_PERCENTILES = (25, 50, 75, 90)
+# Attendance statuses that count towards the attendance rate
+ATTENDED_STATUSES = ("present", "late")
+
+def _use_snapshot() -> bool:
+    """Answer from the in-memory columnar snapshot when it is enabled and loaded"""
+    return settings.ANALYTICS_SNAPSHOT_ENABLED and analytics_snapshot.is_loaded
+
+def _use_duckdb() -> bool:
+    """Run heavy aggregations in the optional DuckDB backend"""
+    return settings.ANALYTICS_BACKEND == "duckdb"
+
+def _status_count(status_column, status: str, weight=1):
+    """SUM(CASE ...) counting rows (or summing `weight`) with the given status"""
+    return func.sum(case((func.lower(status_column) == status, weight), else_=0))
+
+def _attendance_rate(present: int, late: int, total: int) -> float:
+    """Late arrivals still count as attended"""
+    if not total:
+        return 0.0
+    return round((present + late) * 100.0 / total, 2)
 
 def get_attendance_analytics(db: Session, start_date: date, end_date: date, class_name: str = None) -> List[schemas.AttendanceAnalytics]:
     """Get attendance analytics for a date range"""
-    # This would query attendance data and calculate analytics
-    # For now, returning sample data
-    analytics_data = []
-    
-    # In a real implementation, you would:
-    # 1. Query attendance records for the date range
-    # 2. Group by date
-    # 3. Calculate present/absent/late counts
-    # 4. Calculate attendance rates
-    
-    current_date = start_date
-    while current_date <= end_date:
-        # Sample data - replace with actual database queries
-        analytics_data.append(schemas.AttendanceAnalytics(
-            date=current_date,
-            present=45,
-            absent=3,
-            late=2,
-            total=50,
-            attendance_rate=90.0
-        ))
-        current_date += timedelta(days=1)
-    
-    return analytics_data
+    if _use_snapshot():
+        days, statuses, counts = analytics_snapshot.attendance_counts(start_date, end_date, grade_level=class_name)
+        status_totals = {
+            status: counts[:, statuses.index(status)] if status in statuses else np.zeros(len(days), dtype=np.int64)
+            for status in ("present", "absent", "late", "excused")
+        }
+        totals = counts.sum(axis=1)
+        return [
+            schemas.AttendanceAnalytics(
+                date=days[i].item(),
+                present=int(status_totals["present"][i]),
+                absent=int(status_totals["absent"][i]),
+                late=int(status_totals["late"][i]),
+                excused=int(status_totals["excused"][i]),
+                total=int(totals[i]),
+                attendance_rate=_attendance_rate(
+                    int(status_totals["present"][i]), int(status_totals["late"][i]), int(totals[i])
+                )
+            )
+            for i in range(len(days))
+        ]
+    
+    if _use_duckdb():
+        rows = duckdb_analytics.attendance_daily_counts(start_date, end_date, class_name=class_name)
+    else:
+        # Reads the pre-aggregated daily rollup (a few rows per day) instead of raw attendance records
+        rollup = attendance.AttendanceDailyRollup
+        query = db.query(
+            rollup.date,
+            _status_count(rollup.status, "present", rollup.count),
+            _status_count(rollup.status, "absent", rollup.count),
+            _status_count(rollup.status, "late", rollup.count),
+            _status_count(rollup.status, "excused", rollup.count),
+            func.sum(rollup.count),
+        ).filter(
+            rollup.date >= start_date,
+            rollup.date <= end_date
+        )
+        
+        if class_name:
+            query = query.filter(rollup.grade_level == class_name)
+        
+        rows = query.group_by(rollup.date).having(func.sum(rollup.count) > 0).order_by(rollup.date).all()
+    
+    return [
+        schemas.AttendanceAnalytics(
+            date=day,
+            present=present or 0,
+            absent=absent or 0,
+            late=late or 0,
+            excused=excused or 0,
+            total=total,
+            attendance_rate=_attendance_rate(present or 0, late or 0, total)
+        )
+        for day, present, absent, late, excused, total in rows
+    ]
+
+# Bucket start expressions for the attendance trend (weeks start on Monday)
+TREND_GRANULARITIES = ("day", "week", "month")
+
+def _period_start(date_column, granularity: str, dialect_name: str):
+    if dialect_name == "postgresql":
+        # date_trunc weeks also start on Monday
+        return cast(func.date_trunc(granularity, date_column), Date)
+    # SQLite date modifiers: "weekday 0" moves forward to Sunday, "-6 days" back to its Monday
+    if granularity == "week":
+        truncated = func.date(date_column, "weekday 0", "-6 days")
+    elif granularity == "month":
+        truncated = func.date(date_column, "start of month")
+    else:
+        truncated = func.date(date_column)
+    return type_coerce(truncated, Date)
+
+def get_attendance_trend(db: Session, start_date: date, end_date: date, granularity: str = "day", class_name: str = None) -> List[schemas.AttendanceTrendBucket]:
+    """Get attendance counts bucketed by day, week or month"""
+    if granularity not in TREND_GRANULARITIES:
+        raise ValueError(f"Unsupported granularity: {granularity}")
+    
+    rollup = attendance.AttendanceDailyRollup
+    period_start = _period_start(rollup.date, granularity, db.get_bind().dialect.name).label("period_start")
+    query = db.query(
+        period_start,
+        _status_count(rollup.status, "present", rollup.count),
+        _status_count(rollup.status, "absent", rollup.count),
+        _status_count(rollup.status, "late", rollup.count),
+        _status_count(rollup.status, "excused", rollup.count),
+        func.sum(rollup.count),
+    ).filter(
+        rollup.date >= start_date,
+        rollup.date <= end_date
+    )
+    
+    if class_name:
+        query = query.filter(rollup.grade_level == class_name)
+    
+    rows = query.group_by(period_start).having(func.sum(rollup.count) > 0).order_by(period_start).all()
+    
+    return [
+        schemas.AttendanceTrendBucket(
+            period_start=bucket,
+            present=present or 0,
+            absent=absent or 0,
+            late=late or 0,
+            excused=excused or 0,
+            total=total,
+            attendance_rate=_attendance_rate(present or 0, late or 0, total)
+        )
+        for bucket, present, absent, late, excused, total in rows
+    ]
 
 def get_grade_analytics(db: Session, subject: str = None, class_name: str = None) -> List[schemas.GradeAnalytics]:
     """Get grade analytics by subject or class"""
-    # This would query grade data and calculate analytics
-    # For now, returning sample data
-    analytics_data = [
-        schemas.GradeAnalytics(
-            subject="Mathematics",
-            average_score=85.5,
-            highest_score=98.0,
-            lowest_score=45.0,
-            passing_rate=92.0,
-            total_students=50
-        ),
+    if _use_snapshot():
+        return _grade_statistics(*analytics_snapshot.grade_scores(subject=subject, grade_level=class_name))
+    if _use_duckdb():
+        return [
+            schemas.GradeAnalytics(
+                subject=stats["subject"],
+                average_score=round(stats["average_score"], 2),
+                highest_score=round(stats["highest_score"], 2),
+                lowest_score=round(stats["lowest_score"], 2),
+                passing_rate=round(stats["passing_rate"], 2),
+                total_students=stats["total_students"],
+                percentiles={name: round(value, 2) for name, value in stats["percentiles"].items()},
+                histogram={f"{b * 10}-{b * 10 + 10}": count for b, count in enumerate(stats["histogram"])}
+            )
+            for stats in duckdb_analytics.grade_statistics(
+                subject=subject, class_name=class_name,
+                passing_percentage=PASSING_PERCENTAGE, percentiles=GRADE_PERCENTILES
+            )
+        ]
+    
+    # Single fetch of the needed columns; all statistics are computed on NumPy arrays
+    query = db.query(
+        grade.Grade.subject, grade.Grade.score, grade.Grade.max_score, grade.Grade.student_id
+    ).filter(grade.Grade.score.isnot(None))
+    
+    if subject:
+        query = query.filter(grade.Grade.subject == subject)
+    if class_name:
+        query = query.join(
+            student.Student, student.Student.id == grade.Grade.student_id
+        ).filter(student.Student.grade_level == class_name)
+    
+    rows = query.all()
+    if not rows:
+        return []
+    
+    subjects, scores, max_scores, student_ids = zip(*rows)
+    return _grade_statistics(
+        np.asarray(subjects, dtype=object),
+        np.asarray(scores, dtype=float),
+        np.asarray([m or 0.0 for m in max_scores], dtype=float),
+        np.asarray(student_ids, dtype=np.int64)
+    )
+
+def _grade_statistics(subjects: np.ndarray, scores: np.ndarray, max_scores: np.ndarray, student_ids: np.ndarray) -> List[schemas.GradeAnalytics]:
+    """Per-subject statistics over parallel column arrays"""
+    if not len(scores):
+        return []
+    percent = np.where(max_scores > 0, scores * 100.0 / np.where(max_scores > 0, max_scores, 1.0), scores)
+    
+    # Encode subjects as group codes and sort scores within each group
+    subject_names, codes = np.unique(subjects, return_inverse=True)
+    group_count = len(subject_names)
+    counts = np.bincount(codes, minlength=group_count)
+    starts = np.cumsum(counts) - counts
+    sorted_percent = percent[np.lexsort((percent, codes))]
+    
+    means = np.bincount(codes, weights=percent, minlength=group_count) / counts
+    lowest = sorted_percent[starts]
+    highest = sorted_percent[starts + counts - 1]
+    passing = np.bincount(codes, weights=percent >= PASSING_PERCENTAGE, minlength=group_count) * 100.0 / counts
+    
+    # Linear-interpolated percentiles read straight off the sorted groups
+    percentiles = {}
+    for p in GRADE_PERCENTILES:
+        position = starts + (counts - 1) * (p / 100.0)
+        below = np.floor(position).astype(np.int64)
+        above = np.ceil(position).astype(np.int64)
+        fraction = position - below
+        percentiles[f"p{p}"] = sorted_percent[below] + (sorted_percent[above] - sorted_percent[below]) * fraction
+    
+    buckets = np.clip(percent // 10, 0, 9).astype(np.int64)
+    histogram = np.bincount(codes * 10 + buckets, minlength=group_count * 10).reshape(group_count, 10)
+    
+    # Distinct students per subject
+    pair_keys = np.unique(codes.astype(np.int64) * (student_ids.max() + 1) + student_ids)
+    distinct_students = np.bincount(pair_keys // (student_ids.max() + 1), minlength=group_count)
+    
+    return [
         schemas.GradeAnalytics(
-            subject="Science",
-            average_score=82.3,
-            highest_score=95.0,
-            lowest_score=52.0,
-            passing_rate=88.0,
-            total_students=48
+            subject=subject_names[i],
+            average_score=round(float(means[i]), 2),
+            highest_score=round(float(highest[i]), 2),
+            lowest_score=round(float(lowest[i]), 2),
+            passing_rate=round(float(passing[i]), 2),
+            total_students=int(distinct_students[i]),
+            percentiles={name: round(float(values[i]), 2) for name, values in percentiles.items()},
+            histogram={f"{b * 10}-{b * 10 + 10}": int(histogram[i, b]) for b in range(10)}
         )
+        for i in range(group_count)
     ]
+
+def get_year_over_year_comparison(db: Session, class_name: str = None) -> List[schemas.YearOverYearComparison]:
+    """Compare attendance and grades across calendar years"""
+    if _use_duckdb():
+        rows = duckdb_analytics.year_over_year(class_name=class_name)
+    else:
+        attendance_year = extract("year", attendance.Attendance.date)
+        attendance_query = db.query(
+            attendance_year.label("year"),
+            (_attended_count(attendance.Attendance.status) * 100.0 / func.count(attendance.Attendance.id)).label("attendance_rate"),
+            func.count(attendance.Attendance.id).label("attendance_records")
+        )
+        grade_year = extract("year", grade.Grade.date_assigned)
+        grade_query = db.query(
+            grade_year.label("year"),
+            func.avg(_normalized_score(grade.Grade.score, grade.Grade.max_score)).label("average_grade"),
+            func.count(grade.Grade.id).label("assessments")
+        ).filter(grade.Grade.score.isnot(None))
+        if class_name:
+            attendance_query = attendance_query.join(
+                student.Student, student.Student.id == attendance.Attendance.student_id
+            ).filter(student.Student.grade_level == class_name)
+            grade_query = grade_query.join(
+                student.Student, student.Student.id == grade.Grade.student_id
+            ).filter(student.Student.grade_level == class_name)
+        attendance_by_year = {row.year: row for row in attendance_query.group_by(attendance_year)}
+        grades_by_year = {row.year: row for row in grade_query.group_by(grade_year)}
+        rows = []
+        for year in sorted(set(attendance_by_year) | set(grades_by_year)):
+            attendance_row = attendance_by_year.get(year)
+            grade_row = grades_by_year.get(year)
+            rows.append((
+                int(year),
+                attendance_row.attendance_rate if attendance_row else None,
+                attendance_row.attendance_records if attendance_row else 0,
+                grade_row.average_grade if grade_row else None,
+                grade_row.assessments if grade_row else 0
+            ))
     
-    return analytics_data
+    return [
+        schemas.YearOverYearComparison(
+            year=year,
+            attendance_rate=round(attendance_rate, 2) if attendance_rate is not None else None,
+            attendance_records=attendance_records,
+            average_grade=round(average_grade, 2) if average_grade is not None else None,
+            assessments=assessments
+        )
+        for year, attendance_rate, attendance_records, average_grade, assessments in rows
+    ]
 
-def get_student_performance_summary(db: Session, student_id: int = None) -> List[schemas.StudentPerformanceSummary]:
-    """Get student performance summary"""
-    # This would query student, grade, and attendance data
-    # For now, returning sample data
-    summary_data = [
-        schemas.StudentPerformanceSummary(
-            student_id=1,
-            student_name="John Doe",
-            total_subjects=6,
-            average_grade=87.5,
-            attendance_rate=94.2
-        ),
+def _normalized_score(score_column, max_score_column):
+    """Score as a percentage of max_score; raw score when max_score is missing"""
+    return case(
+        (max_score_column > 0, score_column * 100.0 / max_score_column),
+        else_=score_column
+    )
+
+def _attended_count(status_column):
+    """Present and late rows both count as attended"""
+    return func.sum(case((func.lower(status_column).in_(ATTENDED_STATUSES), 1), else_=0))
+
+def get_student_performance_summary(db: Session, student_id: int = None, grade_level: str = None, skip: int = 0, limit: int = 100,
+                                    student_ids: List[int] = None) -> List[schemas.StudentPerformanceSummary]:
+    """
+    Get student performance summary, ranked by average grade within each grade level;
+    student_ids limits the rows returned (ranks still cover the whole cohort)
+    """
+    grade_stats = db.query(
+        grade.Grade.student_id.label("student_id"),
+        func.avg(_normalized_score(grade.Grade.score, grade.Grade.max_score)).label("average_grade"),
+        func.count(func.distinct(grade.Grade.subject)).label("total_subjects")
+    ).filter(grade.Grade.score.isnot(None))
+    attendance_stats = db.query(
+        attendance.Attendance.student_id.label("student_id"),
+        _attended_count(attendance.Attendance.status).label("attended"),
+        func.count(attendance.Attendance.id).label("total")
+    )
+    if grade_level:
+        grade_stats = grade_stats.join(
+            student.Student, student.Student.id == grade.Grade.student_id
+        ).filter(student.Student.grade_level == grade_level)
+        attendance_stats = attendance_stats.join(
+            student.Student, student.Student.id == attendance.Attendance.student_id
+        ).filter(student.Student.grade_level == grade_level)
+    grade_stats = grade_stats.group_by(grade.Grade.student_id).subquery()
+    attendance_stats = attendance_stats.group_by(attendance.Attendance.student_id).subquery()
+    
+    # Rank the whole cohort in one pass, then filter and paginate the ranked rows
+    average_grade = func.coalesce(grade_stats.c.average_grade, 0.0)
+    ranked = db.query(
+        student.Student.id.label("student_id"),
+        student.Student.first_name.label("first_name"),
+        student.Student.last_name.label("last_name"),
+        student.Student.grade_level.label("grade_level"),
+        func.coalesce(grade_stats.c.total_subjects, 0).label("total_subjects"),
+        average_grade.label("average_grade"),
+        case(
+            (attendance_stats.c.total > 0, attendance_stats.c.attended * 100.0 / attendance_stats.c.total),
+            else_=0.0
+        ).label("attendance_rate"),
+        func.rank().over(
+            partition_by=student.Student.grade_level,
+            order_by=average_grade.desc()
+        ).label("rank")
+    ).outerjoin(
+        grade_stats, grade_stats.c.student_id == student.Student.id
+    ).outerjoin(
+        attendance_stats, attendance_stats.c.student_id == student.Student.id
+    ).filter(student.Student.is_active == True)
+    if grade_level:
+        ranked = ranked.filter(student.Student.grade_level == grade_level)
+    ranked = ranked.subquery()
+    
+    query = db.query(ranked)
+    if student_id:
+        query = query.filter(ranked.c.student_id == student_id)
+    if student_ids is not None:
+        query = query.filter(ranked.c.student_id.in_(student_ids))
+    rows = query.order_by(ranked.c.grade_level, ranked.c.rank, ranked.c.student_id).offset(skip).limit(limit).all()
+    
+    return [
         schemas.StudentPerformanceSummary(
-            student_id=2,
-            student_name="Jane Smith",
-            total_subjects=6,
-            average_grade=92.1,
-            attendance_rate=98.0
+            student_id=row.student_id,
+            student_name=f"{row.first_name} {row.last_name}",
+            grade_level=row.grade_level,
+            total_subjects=row.total_subjects,
+            average_grade=round(row.average_grade, 2),
+            attendance_rate=round(row.attendance_rate, 2),
+            rank=row.rank
         )
+        for row in rows
     ]
+
+# Class summaries keyed by class name (grade_level), dropped when the class's data changes
+_class_summary_cache = KeyedCache(ttl_seconds=settings.CLASS_SUMMARY_CACHE_TTL_SECONDS)
+
+@on_data_change
+def _invalidate_class_summaries(table_name: str, grade_levels: List[str]) -> None:
+    if table_name not in ("students", "grades", "attendance"):
+        return
+    if not grade_levels:
+        _class_summary_cache.clear()
+    for grade_level in grade_levels:
+        _class_summary_cache.invalidate(grade_level)
+
+def _compute_class_performance(db: Session, class_names: List[str]) -> Dict[str, schemas.ClassPerformanceSummary]:
+    """Aggregate students, grades and attendance per grade_level in the database"""
+    student_counts = db.query(
+        student.Student.grade_level.label("grade_level"),
+        func.count(student.Student.id).label("total_students")
+    ).filter(
+        student.Student.is_active == True,
+        student.Student.grade_level.in_(class_names)
+    ).group_by(student.Student.grade_level).subquery()
+    
+    # Per-student averages first, so the passing rate counts students rather than assessments
+    normalized = _normalized_score(grade.Grade.score, grade.Grade.max_score)
+    student_grades = db.query(
+        student.Student.grade_level.label("grade_level"),
+        func.sum(normalized).label("score_sum"),
+        func.count(grade.Grade.id).label("score_count"),
+        func.avg(normalized).label("average_grade")
+    ).join(
+        grade.Grade, grade.Grade.student_id == student.Student.id
+    ).filter(
+        grade.Grade.score.isnot(None),
+        student.Student.grade_level.in_(class_names)
+    ).group_by(student.Student.id, student.Student.grade_level).subquery()
+    class_grades = db.query(
+        student_grades.c.grade_level.label("grade_level"),
+        (func.sum(student_grades.c.score_sum) / func.sum(student_grades.c.score_count)).label("average_grade"),
+        (func.sum(case((student_grades.c.average_grade >= PASSING_PERCENTAGE, 1), else_=0)) * 100.0
+            / func.count()).label("passing_rate")
+    ).group_by(student_grades.c.grade_level).subquery()
+    
+    rollup = attendance.AttendanceDailyRollup
+    class_attendance = db.query(
+        rollup.grade_level.label("grade_level"),
+        (func.sum(case((rollup.status.in_(ATTENDED_STATUSES), rollup.count), else_=0)) * 100.0
+            / func.nullif(func.sum(rollup.count), 0)).label("attendance_rate")
+    ).filter(rollup.grade_level.in_(class_names)).group_by(rollup.grade_level).subquery()
+    
+    rows = db.query(
+        student_counts.c.grade_level,
+        student_counts.c.total_students,
+        class_grades.c.average_grade,
+        class_grades.c.passing_rate,
+        class_attendance.c.attendance_rate
+    ).outerjoin(
+        class_grades, class_grades.c.grade_level == student_counts.c.grade_level
+    ).outerjoin(
+        class_attendance, class_attendance.c.grade_level == student_counts.c.grade_level
+    ).all()
     
-    return summary_data
+    return {
+        class_name: schemas.ClassPerformanceSummary(
+            class_name=class_name,
+            total_students=total_students,
+            average_grade=round(average_grade or 0.0, 2),
+            attendance_rate=round(attendance_rate or 0.0, 2),
+            passing_rate=round(passing_rate or 0.0, 2)
+        )
+        for class_name, total_students, average_grade, passing_rate, attendance_rate in rows
+    }
 
 def get_class_performance_summary(db: Session, class_name: str = None) -> List[schemas.ClassPerformanceSummary]:
     """Get class performance summary"""
-    # This would query class, student, grade, and attendance data
-    # For now, returning sample data
-    summary_data = [
-        schemas.ClassPerformanceSummary(
-            class_name="Grade 10A",
-            total_students=25,
-            average_grade=85.2,
-            attendance_rate=92.5,
-            passing_rate=96.0
-        ),
-        schemas.ClassPerformanceSummary(
-            class_name="Grade 10B",
-            total_students=23,
-            average_grade=83.7,
-            attendance_rate=90.8,
-            passing_rate=94.0
-        )
-    ]
+    if class_name:
+        class_names = [class_name]
+    else:
+        class_names = [
+            name for (name,) in db.query(student.Student.grade_level).filter(
+                student.Student.is_active == True
+            ).distinct().order_by(student.Student.grade_level)
+        ]
+    
+    summaries = {name: _class_summary_cache.get(name) for name in class_names}
+    missing = [name for name, summary in summaries.items() if summary is None]
+    if missing:
+        computed = _compute_class_performance(db, missing)
+        for name, summary in computed.items():
+            _class_summary_cache.set(name, summary)
+        summaries.update(computed)
     
-    return summary_data
+    return [summary for summary in summaries.values() if summary is not None]
 
 def get_financial_summary(db: Session, start_date: date, end_date: date) -> schemas.FinancialSummary:
     """Get financial summary for a date range"""
-    # This would query fee payments and expenses
-    # For now, returning sample data
+    # Two grouped SUMs; totals are derived from the per-category rows
+    revenue_rows = db.query(
+        finance.FeeStructure.name,
+        func.sum(finance.FeePayment.amount_paid)
+    ).join(
+        finance.FeeStructure, finance.FeeStructure.id == finance.FeePayment.fee_structure_id
+    ).filter(
+        finance.FeePayment.payment_date >= start_date,
+        finance.FeePayment.payment_date <= end_date,
+        finance.FeePayment.status == "completed"
+    ).group_by(finance.FeeStructure.name).all()
+    
+    expense_rows = db.query(
+        finance.Expense.category,
+        func.sum(finance.Expense.amount)
+    ).filter(
+        finance.Expense.expense_date >= start_date,
+        finance.Expense.expense_date <= end_date
+    ).group_by(finance.Expense.category).all()
+    
+    revenue_by_category = {name: round(total or 0.0, 2) for name, total in revenue_rows}
+    expenses_by_category = {category: round(total or 0.0, 2) for category, total in expense_rows}
+    total_revenue = round(sum(revenue_by_category.values()), 2)
+    total_expenses = round(sum(expenses_by_category.values()), 2)
+    
     return schemas.FinancialSummary(
-        total_revenue=50000.0,
-        total_expenses=35000.0,
-        net_income=15000.0,
-        revenue_by_category={
-            "Tuition Fees": 40000.0,
-            "Extra Activities": 5000.0,
-            "Other": 5000.0
-        },
-        expenses_by_category={
-            "Salaries": 25000.0,
-            "Utilities": 5000.0,
-            "Supplies": 3000.0,
-            "Maintenance": 2000.0
-        }
+        total_revenue=total_revenue,
+        total_expenses=total_expenses,
+        net_income=round(total_revenue - total_expenses, 2),
+        revenue_by_category=revenue_by_category,
+        expenses_by_category=expenses_by_category
     )
 
-def get_dashboard_data(db: Session, user_role: str) -> schemas.DashboardData:
-    """Get dashboard data for the user"""
-    # This would query various data sources to populate the dashboard
-    # For now, returning sample data
+# Dashboard payloads keyed by user role; stale entries are served while one thread refreshes them
+_dashboard_cache = StaleWhileRevalidateCache(ttl_seconds=settings.DASHBOARD_CACHE_TTL_SECONDS)
+
+# Roles that see school-wide revenue and expense totals on their dashboard
+FINANCE_DASHBOARD_ROLES = ("admin",)
+# Roles that see the count of students flagged by the nightly at-risk batch
+AT_RISK_DASHBOARD_ROLES = ("admin", "teacher")
+
+def _compute_dashboard_data(db: Session, user_role: str) -> schemas.DashboardData:
+    """Run the dashboard aggregates"""
+    today = date.today()
+    
+    # All headline counts in one round trip
+    total_students, active_students, total_teachers, total_staff, average_grade = db.query(
+        db.query(func.count(student.Student.id)).scalar_subquery(),
+        db.query(func.count(student.Student.id)).filter(student.Student.is_active == True).scalar_subquery(),
+        db.query(func.count(user.User.id)).filter(user.User.role == "teacher").scalar_subquery(),
+        db.query(func.count(staff.Staff.id)).scalar_subquery(),
+        db.query(func.avg(_normalized_score(grade.Grade.score, grade.Grade.max_score))).filter(
+            grade.Grade.score.isnot(None)
+        ).scalar_subquery()
+    ).one()
+    
+    rollup = attendance.AttendanceDailyRollup
+    attended_today, recorded_today = db.query(
+        func.sum(case((rollup.status.in_(ATTENDED_STATUSES), rollup.count), else_=0)),
+        func.sum(rollup.count)
+    ).filter(rollup.date == today).one()
+    
+    total_revenue = total_expenses = 0.0
+    if user_role in FINANCE_DASHBOARD_ROLES:
+        # Year to date
+        financial_summary = get_financial_summary(db, start_date=date(today.year, 1, 1), end_date=today)
+        total_revenue = financial_summary.total_revenue
+        total_expenses = financial_summary.total_expenses
+    
+    at_risk_students = 0
+    if user_role in AT_RISK_DASHBOARD_ROLES:
+        at_risk_students = db.query(func.count(AtRiskStudentFlag.student_id)).scalar()
+    
+    announcement = communication.Announcement
+    recent_announcements = db.query(announcement.title, announcement.start_date).filter(
+        announcement.is_active == True,
+        announcement.start_date <= today
+    ).order_by(announcement.start_date.desc()).limit(5).all()
+    upcoming_events = db.query(announcement.title, announcement.start_date).filter(
+        announcement.is_active == True,
+        announcement.announcement_type == "Event",
+        announcement.start_date > today
+    ).order_by(announcement.start_date).limit(5).all()
+    
     return schemas.DashboardData(
-        total_students=500,
-        total_teachers=25,
-        total_staff=15,
-        active_students=480,
-        attendance_today=92.5,
-        average_grade=84.7,
-        total_revenue=50000.0,
-        total_expenses=35000.0,
+        total_students=total_students,
+        total_teachers=total_teachers,
+        total_staff=total_staff,
+        active_students=active_students,
+        attendance_today=round((attended_today or 0) * 100.0 / recorded_today, 2) if recorded_today else 0.0,
+        average_grade=round(average_grade or 0.0, 2),
+        total_revenue=total_revenue,
+        total_expenses=total_expenses,
+        at_risk_students=at_risk_students,
         recent_announcements=[
-            {"title": "School Holiday", "date": "2024-09-20"},
-            {"title": "Parent-Teacher Meeting", "date": "2024-09-25"}
+            {"title": title, "date": start_date.isoformat()} for title, start_date in recent_announcements
         ],
         upcoming_events=[
-            {"title": "Annual Sports Day", "date": "2024-10-15"},
-            {"title": "Midterm Exams", "date": "2024-10-20"}
+            {"title": title, "date": start_date.isoformat()} for title, start_date in upcoming_events
         ]
-    )
\ No newline at end of file
+    )
+
+def _refresh_dashboard_data(user_role: str) -> schemas.DashboardData:
+    # Uses its own session: background refreshes outlive the request that triggered them
+    db = SessionLocal()
+    try:
+        return _compute_dashboard_data(db, user_role)
+    finally:
+        db.close()
+
+def get_dashboard_data(db: Session, user_role: str) -> schemas.DashboardData:
+    """Get dashboard data for the user"""
+    return _dashboard_cache.get(user_role, lambda: _refresh_dashboard_data(user_role))
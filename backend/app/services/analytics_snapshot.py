@@ -0,0 +1,228 @@
+# app/services/analytics_snapshot.py
+import logging
+import threading
+import time
+from datetime import date, datetime
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from sqlalchemy import select, func
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.database import SessionLocal
+from app.models.attendance import Attendance
+from app.models.grade import Grade
+from app.models.student import Student
+
+logger = logging.getLogger(__name__)
+
+# Rows fetched per cursor partition while loading
+LOAD_BATCH_SIZE = 50000
+
+class DictionaryEncoder:
+    """Maps string values to stable integer codes; categories only ever grow"""
+    def __init__(self):
+        self.categories: List[str] = []
+        self._codes: Dict[str, int] = {}
+
+    def encode(self, values) -> np.ndarray:
+        if not len(values):
+            return np.empty(0, dtype=np.int32)
+        uniques, inverse = np.unique(
+            np.asarray(["" if v is None else v for v in values], dtype=object), return_inverse=True
+        )
+        unique_codes = np.fromiter(
+            (self._codes.setdefault(value, len(self._codes)) for value in uniques),
+            dtype=np.int32, count=len(uniques)
+        )
+        self.categories.extend(list(self._codes)[len(self.categories):])
+        return unique_codes[inverse]
+
+    def code(self, value: str) -> int:
+        """Code for `value`, or -1 if it never occurred"""
+        return self._codes.get(value, -1)
+
+class ColumnarTable:
+    """
+    One table held as equal-length column arrays sorted by id.
+    Column dicts are replaced wholesale on merge, so readers that take a
+    reference to `columns` always see a consistent set of arrays.
+    """
+    def __init__(self, dtypes: Dict[str, str], encoded_columns: List[str]):
+        self.dtypes = dtypes
+        self.encoders = {name: DictionaryEncoder() for name in encoded_columns}
+        self.columns: Dict[str, np.ndarray] = {
+            name: np.empty(0, dtype=dtype) for name, dtype in dtypes.items()
+        }
+        self.columns.update({name: np.empty(0, dtype=np.int32) for name in encoded_columns})
+        self.watermark: Optional[datetime] = None
+
+    def __len__(self) -> int:
+        return len(self.columns["id"])
+
+    def build_batch(self, rows: List[tuple], names: List[str]) -> Dict[str, np.ndarray]:
+        values = dict(zip(names, zip(*rows)))
+        batch = {name: np.asarray(values[name], dtype=dtype) for name, dtype in self.dtypes.items()}
+        batch.update({name: encoder.encode(values[name]) for name, encoder in self.encoders.items()})
+        return batch
+
+    def merge(self, batches: List[Dict[str, np.ndarray]]) -> None:
+        """Upsert batches by id; a row in a later batch replaces an existing row with the same id"""
+        if not batches:
+            return
+        current = self.columns
+        combined = {
+            name: np.concatenate([current[name]] + [batch[name] for batch in batches])
+            for name in current
+        }
+        # Stable sort keeps arrival order among equal ids, so keeping the last one keeps the newest
+        order = np.argsort(combined["id"], kind="stable")
+        sorted_ids = combined["id"][order]
+        keep = np.ones(len(order), dtype=bool)
+        keep[:-1] = sorted_ids[:-1] != sorted_ids[1:]
+        order = order[keep]
+        self.columns = {name: column[order] for name, column in combined.items()}
+
+def _grades_query():
+    return select(
+        Grade.id, Grade.student_id, Grade.subject, Student.grade_level,
+        Grade.score, Grade.max_score, Grade.date_assigned, Grade.updated_at
+    ).join(Student, Student.id == Grade.student_id)
+
+def _attendance_query():
+    return select(
+        Attendance.id, Attendance.student_id, Attendance.date, func.lower(Attendance.status),
+        Student.grade_level, Attendance.updated_at
+    ).join(Student, Student.id == Attendance.student_id)
+
+_GRADE_COLUMNS = ["id", "student_id", "subject", "grade_level", "score", "max_score", "date_assigned", "updated_at"]
+_ATTENDANCE_COLUMNS = ["id", "student_id", "date", "status", "grade_level", "updated_at"]
+
+def _new_grades_table() -> ColumnarTable:
+    return ColumnarTable(
+        {"id": "int64", "student_id": "int64", "score": "float64", "max_score": "float64", "date_assigned": "datetime64[D]"},
+        ["subject", "grade_level"]
+    )
+
+def _new_attendance_table() -> ColumnarTable:
+    return ColumnarTable(
+        {"id": "int64", "student_id": "int64", "date": "datetime64[D]"},
+        ["status", "grade_level"]
+    )
+
+class AnalyticsSnapshot:
+    """
+    In-memory columnar copy of the grades and attendance tables.
+    Reloads incrementally by updated_at; a periodic full reload picks up
+    deletions and students moving between grade levels, which do not touch
+    grades/attendance updated_at.
+    """
+    def __init__(self):
+        self.grades: Optional[ColumnarTable] = None
+        self.attendance: Optional[ColumnarTable] = None
+        self.loaded_at: Optional[float] = None
+        self._full_loaded_at: Optional[float] = None
+        self._refresh_lock = threading.Lock()
+        self._refresh_thread: Optional[threading.Thread] = None
+
+    @property
+    def is_loaded(self) -> bool:
+        return self.grades is not None and self.attendance is not None
+
+    def refresh(self, db: Session, full: bool = False) -> None:
+        with self._refresh_lock:
+            full = (
+                full or not self.is_loaded
+                or time.monotonic() - self._full_loaded_at > settings.ANALYTICS_SNAPSHOT_FULL_RELOAD_SECONDS
+            )
+            if full:
+                grades, attendance = _new_grades_table(), _new_attendance_table()
+            else:
+                grades, attendance = self.grades, self.attendance
+
+            self._load(db, grades, _grades_query(), Grade.updated_at, _GRADE_COLUMNS)
+            self._load(db, attendance, _attendance_query(), Attendance.updated_at, _ATTENDANCE_COLUMNS)
+
+            if full:
+                self.grades, self.attendance = grades, attendance
+                self._full_loaded_at = time.monotonic()
+            self.loaded_at = time.monotonic()
+
+    def _load(self, db: Session, table: ColumnarTable, query, updated_at_column, names: List[str]) -> None:
+        if table.watermark is not None:
+            # >= because updated_at has one-second resolution; merging by id makes re-reads harmless
+            query = query.where(updated_at_column >= table.watermark)
+        batches = []
+        watermark = table.watermark
+        result = db.execute(query.execution_options(yield_per=LOAD_BATCH_SIZE))
+        for rows in result.partitions():
+            batches.append(table.build_batch(rows, names))
+            batch_max = max((row[-1] for row in rows if row[-1] is not None), default=None)
+            if batch_max is not None and (watermark is None or batch_max > watermark):
+                watermark = batch_max
+        table.merge(batches)
+        table.watermark = watermark
+
+    def start_periodic_refresh(self, interval_seconds: float) -> None:
+        """Refresh in a daemon thread every `interval_seconds`"""
+        if self._refresh_thread is not None:
+            return
+        self._refresh_thread = threading.Thread(
+            target=self._refresh_forever, args=(interval_seconds,), daemon=True
+        )
+        self._refresh_thread.start()
+
+    def _refresh_forever(self, interval_seconds: float) -> None:
+        while True:
+            db = SessionLocal()
+            try:
+                self.refresh(db)
+            except Exception:
+                logger.exception("Analytics snapshot refresh failed")
+            finally:
+                db.close()
+            time.sleep(interval_seconds)
+
+    # --- Slices ---
+    def attendance_counts(self, start_date: date, end_date: date, grade_level: str = None) -> Tuple[np.ndarray, List[str], np.ndarray]:
+        """
+        Per-day status counts in [start_date, end_date].
+        Returns (days, status names, counts) where counts has shape (len(days), len(status names)).
+        """
+        table = self.attendance
+        columns = table.columns
+        statuses = table.encoders["status"].categories
+        start, end = np.datetime64(start_date, "D"), np.datetime64(end_date, "D")
+        mask = (columns["date"] >= start) & (columns["date"] <= end)
+        if grade_level:
+            mask &= columns["grade_level"] == table.encoders["grade_level"].code(grade_level)
+
+        days, day_index = np.unique(columns["date"][mask], return_inverse=True)
+        status_count = len(statuses)
+        counts = np.bincount(
+            day_index * status_count + columns["status"][mask], minlength=len(days) * status_count
+        ).reshape(len(days), status_count)
+        return days, list(statuses), counts
+
+    def grade_scores(self, subject: str = None, grade_level: str = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Scored assessments matching the filters.
+        Returns (subjects, scores, max_scores, student_ids) as arrays.
+        """
+        table = self.grades
+        columns = table.columns
+        mask = ~np.isnan(columns["score"])
+        if subject:
+            mask &= columns["subject"] == table.encoders["subject"].code(subject)
+        if grade_level:
+            mask &= columns["grade_level"] == table.encoders["grade_level"].code(grade_level)
+
+        subject_names = np.asarray(table.encoders["subject"].categories, dtype=object)
+        return (
+            subject_names[columns["subject"][mask]] if len(subject_names) else np.empty(0, dtype=object),
+            columns["score"][mask],
+            np.nan_to_num(columns["max_score"][mask]),
+            columns["student_id"][mask]
+        )
+
+# Shared process-wide snapshot
+analytics_snapshot = AnalyticsSnapshot()
@@ -0,0 +1,131 @@
+# app/services/at_risk.py
+from datetime import date, datetime, timedelta
+from typing import Dict
+import numpy as np
+from sqlalchemy import delete, insert, func, case
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.events import notify_data_change
+from app.models.analytics import AtRiskStudentFlag
+from app.models.attendance import Attendance
+from app.models.grade import Grade
+from app.models.student import Student
+from app.services.analytics import ATTENDED_STATUSES
+
+def _trailing_attendance(db: Session, student_ids: np.ndarray, since: date):
+    """Attended and total attendance counts per student since `since`, aligned with `student_ids`"""
+    rows = db.query(
+        Attendance.student_id,
+        func.sum(case((func.lower(Attendance.status).in_(ATTENDED_STATUSES), 1), else_=0)),
+        func.count(Attendance.id)
+    ).filter(Attendance.date >= since).group_by(Attendance.student_id).all()
+    attended = np.zeros(len(student_ids), dtype=np.int64)
+    total = np.zeros(len(student_ids), dtype=np.int64)
+    if rows:
+        ids, attended_counts, totals = (np.asarray(column, dtype=np.int64) for column in zip(*rows))
+        index, found = _positions(student_ids, ids)
+        attended[index[found]] = attended_counts[found]
+        total[index[found]] = totals[found]
+    return attended, total
+
+def _grade_slopes(db: Session, student_ids: np.ndarray, since: date):
+    """
+    Least-squares slope of normalized score against time for every student at once.
+    Returns (slopes in points per 30 days, assessment counts), aligned with `student_ids`.
+    """
+    rows = db.query(
+        Grade.student_id, Grade.date_assigned, Grade.score, Grade.max_score
+    ).filter(Grade.score.isnot(None), Grade.date_assigned >= since).all()
+    slopes = np.full(len(student_ids), np.nan)
+    counts = np.zeros(len(student_ids), dtype=np.int64)
+    if not rows:
+        return slopes, counts
+
+    ids, days, scores, max_scores = zip(*rows)
+    index, found = _positions(student_ids, np.asarray(ids, dtype=np.int64))
+    index = index[found]
+    # Days since the window start keeps the sums small
+    x = (np.asarray(days, dtype="datetime64[D]") - np.datetime64(since, "D")).astype(np.float64)[found]
+    scores = np.asarray(scores, dtype=np.float64)[found]
+    max_scores = np.nan_to_num(np.asarray(max_scores, dtype=np.float64))[found]
+    y = np.where(max_scores > 0, scores * 100.0 / np.where(max_scores > 0, max_scores, 1.0), scores)
+
+    # slope = (n*Sxy - Sx*Sy) / (n*Sxx - Sx^2), every sum grouped by student with bincount
+    size = len(student_ids)
+    n = np.bincount(index, minlength=size).astype(np.float64)
+    sum_x = np.bincount(index, weights=x, minlength=size)
+    sum_y = np.bincount(index, weights=y, minlength=size)
+    sum_xx = np.bincount(index, weights=x * x, minlength=size)
+    sum_xy = np.bincount(index, weights=x * y, minlength=size)
+    denominator = n * sum_xx - sum_x * sum_x
+    # Assessments all on one day have no trend
+    has_trend = denominator > 0
+    slopes[has_trend] = (n * sum_xy - sum_x * sum_y)[has_trend] / denominator[has_trend] * 30.0
+    counts[:] = n
+    return slopes, counts
+
+def _positions(sorted_ids: np.ndarray, ids: np.ndarray):
+    """Index of each id in `sorted_ids`, and a mask of ids that are present"""
+    index = np.searchsorted(sorted_ids, ids)
+    index = np.minimum(index, max(len(sorted_ids) - 1, 0))
+    found = sorted_ids[index] == ids if len(sorted_ids) else np.zeros(len(ids), dtype=bool)
+    return index, found
+
+def detect_at_risk_students(db: Session, today: date = None) -> Dict[str, int]:
+    """
+    Flag active students with a low trailing attendance rate or a declining grade trend,
+    replacing the contents of at_risk_student_flags in one transaction.
+    """
+    today = today or date.today()
+    students = db.query(Student.id, Student.grade_level).filter(
+        Student.is_active == True
+    ).order_by(Student.id).all()
+    student_ids = np.asarray([row[0] for row in students], dtype=np.int64)
+    grade_levels = [row[1] for row in students]
+
+    attended, total = _trailing_attendance(
+        db, student_ids, today - timedelta(days=settings.AT_RISK_ATTENDANCE_WINDOW_DAYS)
+    )
+    slopes, assessments = _grade_slopes(
+        db, student_ids, today - timedelta(days=settings.AT_RISK_GRADE_WINDOW_DAYS)
+    )
+
+    attendance_rate = np.full(len(student_ids), np.nan)
+    recorded = total > 0
+    attendance_rate[recorded] = attended[recorded] * 100.0 / total[recorded]
+    low_attendance = recorded & (attendance_rate < settings.AT_RISK_ATTENDANCE_THRESHOLD)
+    declining_grades = (
+        (assessments >= settings.AT_RISK_MIN_ASSESSMENTS)
+        & ~np.isnan(slopes)
+        & (slopes < settings.AT_RISK_GRADE_SLOPE_THRESHOLD)
+    )
+
+    computed_at = datetime.now()
+    flags = []
+    for i in np.flatnonzero(low_attendance | declining_grades):
+        reasons = []
+        if low_attendance[i]:
+            reasons.append("low_attendance")
+        if declining_grades[i]:
+            reasons.append("declining_grades")
+        flags.append({
+            "student_id": int(student_ids[i]),
+            "grade_level": grade_levels[i],
+            "attendance_rate": round(float(attendance_rate[i]), 2) if recorded[i] else None,
+            "grade_slope": round(float(slopes[i]), 2) if not np.isnan(slopes[i]) else None,
+            "reasons": ",".join(reasons),
+            "computed_at": computed_at
+        })
+
+    db.execute(delete(AtRiskStudentFlag))
+    if flags:
+        db.execute(insert(AtRiskStudentFlag), flags)
+    db.commit()
+    notify_data_change("at_risk_student_flags")
+
+    return {
+        "students_scanned": len(student_ids),
+        "flagged": len(flags),
+        "low_attendance": int(low_attendance.sum()),
+        "declining_grades": int(declining_grades.sum())
+    }
@@ -1,252 +1,1177 @@
 # app/services/data_import_export.py
 import csv
+import io
+import itertools
 import json
+import multiprocessing
+import os
+import re
+import secrets
+import threading
 import pandas as pd
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, timedelta
+from sqlalchemy import func, insert, or_, select, tuple_, Boolean, Date, DateTime, Float, Integer, Numeric
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
-from typing import List, Dict, Any
-from app import crud, models, schemas
-from app.database import get_db
+from typing import List, Dict, Any, Tuple, Callable, Optional, Iterator
+from app import crud
+from app.core.config import settings
+from app.core.events import notify_data_change
+from app.core.security import get_password_hash
+from app.crud.attendance import apply_attendance_rollup_deltas, move_student_attendance_rollup
+from app.database import SessionLocal, upsert_insert
+from app.models.attendance import Attendance
+from app.models.data_import_export import DataExport
+from app.models.finance import FeePayment
+from app.models.grade import Grade
+from app.models.parent import Parent
+from app.models.staff import Staff
+from app.models.student import Student
+from app.models.user import User
 
 # Supported file types
 SUPPORTED_IMPORT_TYPES = ["csv", "xlsx", "json"]
-SUPPORTED_EXPORT_TYPES = ["csv", "xlsx", "pdf", "json"]
+SUPPORTED_EXPORT_TYPES = ["csv", "xlsx", "pdf", "json", "parquet", "arrow"]
 
-def import_students_from_csv(file_path: str, db: Session) -> Dict[str, Any]:
+# Rows per INSERT batch in bulk imports
+IMPORT_BATCH_SIZE = 1000
+# Rows parsed from the file at a time; bounds import memory regardless of file size
+IMPORT_CHUNK_SIZE = 10000
+# Per-row error messages kept per import; further failures are only counted
+MAX_IMPORT_ERRORS = 1000
+
+def _read_csv_chunks(file_path: str, required_columns: List[str], **read_options):
+    """
+    Iterate over the CSV in IMPORT_CHUNK_SIZE-row frames, after checking the header.
+    Frame indexes continue across chunks, so index + 1 is the row number in the file.
+    """
+    _check_columns(pd.read_csv(file_path, nrows=0).columns, required_columns)
+    return pd.read_csv(file_path, chunksize=IMPORT_CHUNK_SIZE, **read_options)
+
+def _check_columns(columns, required_columns: List[str]) -> None:
+    missing_columns = [col for col in required_columns if col not in columns]
+    if missing_columns:
+        raise ValueError(f"Missing required columns: {missing_columns}")
+
+def _cell_text(value: Any) -> Optional[str]:
+    """A spreadsheet or JSON value as the text a CSV would hold"""
+    if value is None:
+        return None
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, float) and value.is_integer():
+        # Excel stores every number as a float; IDs typed as 12 should not become "12.0"
+        return str(int(value))
+    return str(value)
+
+def _frames(records: Iterator[Tuple[int, Dict[str, Any]]], required_columns: List[str]) -> Iterator[pd.DataFrame]:
     """
-    Import students from CSV file
+    IMPORT_CHUNK_SIZE-row frames of string values from (row index, record) pairs,
+    indexed like _read_csv_chunks frames
     """
+    batch, index = [], []
+    for row_index, record in records:
+        batch.append(record)
+        index.append(row_index)
+        if len(batch) == IMPORT_CHUNK_SIZE:
+            yield pd.DataFrame.from_records(batch, index=index).reindex(columns=_frame_columns(batch, required_columns))
+            batch, index = [], []
+    if batch:
+        yield pd.DataFrame.from_records(batch, index=index).reindex(columns=_frame_columns(batch, required_columns))
+
+def _frame_columns(batch: List[Dict[str, Any]], required_columns: List[str]) -> List[str]:
+    columns = list(required_columns)
+    for record in batch:
+        columns.extend(key for key in record if key not in columns)
+    return columns
+
+def _read_xlsx_chunks(file_path: str, required_columns: List[str]) -> Iterator[pd.DataFrame]:
+    """
+    Frames of the first worksheet, whose first row is the header. The workbook is
+    opened read-only, so rows are streamed from the file rather than loaded at once.
+    """
+    from openpyxl import load_workbook
+    
+    workbook = load_workbook(file_path, read_only=True, data_only=True)
     try:
-        # Read CSV file
-        df = pd.read_csv(file_path)
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = [None if value is None else str(value).strip() for value in next(rows, ())]
+        _check_columns(header, required_columns)
+        
+        def records():
+            for row_index, row in enumerate(rows):
+                # Read-only sheets often report formatted but empty trailing rows
+                if all(value is None or value == "" for value in row):
+                    continue
+                yield row_index, {
+                    column: _cell_text(value) for column, value in zip(header, row) if column
+                }
         
-        # Validate required columns
-        required_columns = ["student_id", "first_name", "last_name", "date_of_birth", "gender", "email", "admission_date", "grade_level"]
-        missing_columns = [col for col in required_columns if col not in df.columns]
-        if missing_columns:
-            raise ValueError(f"Missing required columns: {missing_columns}")
+        yield from _frames(records(), required_columns)
+    finally:
+        workbook.close()
+
+# Characters read at a time by the standard-library JSON reader
+JSON_READ_SIZE = 64 * 1024
+
+def _stdlib_json_array_items(f) -> Iterator[Any]:
+    """
+    Items of the JSON array in text file f, decoded one at a time with the standard
+    library's raw_decode, so only the current item and one read are held in memory
+    """
+    decoder = json.JSONDecoder()
+    buffer, position = "", 0
+    # What may come next: "[" opening the array, a value, or what follows a value
+    expecting = "array"
+    while True:
+        while position < len(buffer) and buffer[position].isspace():
+            position += 1
+        if position == len(buffer):
+            buffer, position = f.read(JSON_READ_SIZE), 0
+            if not buffer:
+                if expecting == "array":
+                    raise ValueError("JSON imports must be an array of objects")
+                raise ValueError("Invalid JSON: the array is not closed")
+            continue
+        char = buffer[position]
+        if expecting == "array":
+            if char != "[":
+                raise ValueError("JSON imports must be an array of objects")
+            position += 1
+            expecting = "first value"
+            continue
+        if char == "]" and expecting != "value":
+            return
+        if expecting == "separator":
+            if char != ",":
+                raise ValueError(f"Invalid JSON: expected ',' or ']' but found {char!r}")
+            position += 1
+            expecting = "value"
+            continue
+        try:
+            item, position = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError:
+            # Most likely an item cut off by the end of the read; read on and retry
+            more = f.read(JSON_READ_SIZE)
+            if not more:
+                raise
+            buffer, position = buffer[position:] + more, 0
+            continue
+        yield item
+        expecting = "separator"
+
+def _json_array_items(f) -> Iterator[Any]:
+    """Items of the JSON array in binary file f, streamed by ijson when it is installed"""
+    # ijson would read any other document as an empty array
+    start = f.read(JSON_READ_SIZE).lstrip(b"\xef\xbb\xbf \t\r\n")[:1]
+    f.seek(0)
+    if start != b"[":
+        raise ValueError("JSON imports must be an array of objects")
+    try:
+        import ijson
+    except ImportError:
+        return _stdlib_json_array_items(io.TextIOWrapper(f, encoding="utf-8-sig"))
+    return ijson.items(f, "item")
+
+def _read_json_chunks(file_path: str, required_columns: List[str]) -> Iterator[pd.DataFrame]:
+    """
+    Frames of a JSON array of objects, parsed incrementally so the document is never
+    held in memory. Required columns are checked against the first object.
+    """
+    with open(file_path, "rb") as f:
+        items = _json_array_items(f)
+        first = next(items, None)
+        if first is None:
+            return
+        if not isinstance(first, dict):
+            raise ValueError("JSON imports must be an array of objects")
+        _check_columns(first, required_columns)
         
-        # Process each row
-        successful_count = 0
-        failed_count = 0
-        errors = []
+        def records():
+            for row_index, item in enumerate(itertools.chain([first], items)):
+                if not isinstance(item, dict):
+                    raise ValueError(f"Row {row_index + 1} is not an object")
+                yield row_index, {key: _cell_text(value) for key, value in item.items()}
         
-        for index, row in df.iterrows():
+        yield from _frames(records(), required_columns)
+
+def _import_file_type(file_path: str) -> str:
+    return os.path.splitext(file_path)[1].lstrip(".").lower()
+
+def _read_chunks(file_path: str, required_columns: List[str]) -> Iterator[pd.DataFrame]:
+    """
+    IMPORT_CHUNK_SIZE-row frames of string values from a CSV, xlsx or JSON file, by
+    its extension, so every importer accepts all of SUPPORTED_IMPORT_TYPES
+    """
+    file_type = _import_file_type(file_path)
+    if file_type == "xlsx":
+        return _read_xlsx_chunks(file_path, required_columns)
+    if file_type == "json":
+        return _read_json_chunks(file_path, required_columns)
+    # Strings, so IDs and phone numbers keep leading zeros
+    return _read_csv_chunks(file_path, required_columns, dtype=str)
+
+# Called with the running totals (same shape as an importer's result) after each chunk
+ProgressCallback = Optional[Callable[[Dict[str, Any]], None]]
+
+class _ErrorLog:
+    """Collects per-row error messages, keeping at most MAX_IMPORT_ERRORS"""
+    def __init__(self):
+        self.messages: List[str] = []
+        self.dropped = 0
+    
+    def extend(self, messages: List[str]) -> None:
+        room = MAX_IMPORT_ERRORS - len(self.messages)
+        self.messages.extend(messages[:max(room, 0)])
+        self.dropped += max(len(messages) - max(room, 0), 0)
+    
+    def as_list(self) -> List[str]:
+        if self.dropped:
+            return self.messages + [f"... and {self.dropped} more errors"]
+        return list(self.messages)
+
+def _import_result(total_count: int, successful_count: int, failed_count: int, errors: _ErrorLog) -> Dict[str, Any]:
+    return {
+        "total_records": total_count,
+        "successful_records": successful_count,
+        "failed_records": failed_count,
+        "errors": errors.as_list()
+    }
+
+STUDENT_REQUIRED_COLUMNS = ["student_id", "first_name", "last_name", "date_of_birth", "gender", "email", "admission_date", "grade_level"]
+STUDENT_OPTIONAL_COLUMNS = ["phone", "address"]
+STUDENT_DATE_COLUMNS = ["date_of_birth", "admission_date"]
+# Columns that must be unique, both within the file and against existing students
+STUDENT_UNIQUE_COLUMNS = ["student_id", "email"]
+EMAIL_PATTERN = r"^[^@\s]+@[^@\s]+\.[^@\s]+$"
+
+TEACHER_REQUIRED_COLUMNS = ["employee_id", "first_name", "last_name", "email", "department", "position", "hire_date"]
+TEACHER_OPTIONAL_COLUMNS = ["phone", "salary", "qualification", "experience", "emergency_contact"]
+TEACHER_UNIQUE_COLUMNS = ["employee_id", "email"]
+# Teacher file columns stored on the staff row (the rest go to the user account)
+TEACHER_STAFF_COLUMNS = ["employee_id", "department", "position", "hire_date", "salary", "qualification", "experience", "emergency_contact"]
+
+PARENT_REQUIRED_COLUMNS = ["user_id", "student_id", "relationship_type"]
+PARENT_OPTIONAL_COLUMNS = ["occupation", "emergency_contact"]
+
+# Attendance and grade files name students by their external student_id
+ATTENDANCE_REQUIRED_COLUMNS = ["student_id", "date", "status"]
+ATTENDANCE_OPTIONAL_COLUMNS = ["remarks"]
+ATTENDANCE_STATUSES = {"present": "Present", "absent": "Absent", "late": "Late", "excused": "Excused"}
+
+# Every column the grades table requires: the assessment is named by assessment_type
+# and assessment_name, and its teacher by employee_id
+GRADE_REQUIRED_COLUMNS = ["student_id", "subject", "assessment_type", "assessment_name", "date_assigned", "score", "employee_id"]
+GRADE_OPTIONAL_COLUMNS = ["grade_value", "max_score", "date_due", "date_submitted", "date_graded", "comments"]
+GRADE_DATE_COLUMNS = ["date_assigned", "date_due", "date_submitted", "date_graded"]
+
+# "insert" reports rows whose natural key (student_id, employee_id, or user_id +
+# student_id for parents) already exists; "upsert" updates those rows instead, so
+# a corrected file can simply be imported again
+IMPORT_MODES = ["insert", "upsert"]
+
+# --- Frame validation helpers ---
+def _clean_frame(df: pd.DataFrame, columns: List[str]) -> pd.DataFrame:
+    """The given columns as stripped strings, with blank values missing"""
+    frame = pd.DataFrame(index=df.index)
+    for col in columns:
+        values = df[col].astype("string").str.strip()
+        frame[col] = values.mask(values == "")
+    return frame
+
+def _file_columns(df: pd.DataFrame, required_columns: List[str], optional_columns: List[str]) -> List[str]:
+    return required_columns + [col for col in optional_columns if col in df.columns]
+
+def _required_checks(frame: pd.DataFrame, required_columns: List[str]) -> List[Tuple[pd.Series, str]]:
+    return [(frame[col].isna(), f"{col} is required") for col in required_columns]
+
+def _date_check(frame: pd.DataFrame, col: str) -> Tuple[pd.Series, str]:
+    """Parse an ISO date column in place"""
+    parsed = pd.to_datetime(frame[col], errors="coerce", format="ISO8601")
+    check = (frame[col].notna() & parsed.isna(), f"{col} is not a valid date")
+    frame[col] = parsed.dt.date
+    return check
+
+def _number_check(frame: pd.DataFrame, col: str, integer: bool = False) -> Tuple[pd.Series, str]:
+    """Parse a numeric column in place"""
+    parsed = pd.to_numeric(frame[col], errors="coerce")
+    invalid = frame[col].notna() & parsed.isna()
+    if integer:
+        invalid |= parsed.notna() & (parsed % 1 != 0)
+        frame[col] = parsed.where(~invalid).astype("Int64")
+    else:
+        frame[col] = parsed
+    return invalid, f"{col} is not a valid {'integer' if integer else 'number'}"
+
+def _email_check(frame: pd.DataFrame) -> Tuple[pd.Series, str]:
+    return (
+        frame["email"].notna() & ~frame["email"].str.match(EMAIL_PATTERN).fillna(False).astype(bool),
+        "email is not a valid email address"
+    )
+
+def _passing(frame: pd.DataFrame, checks: List[Tuple[pd.Series, str]]) -> pd.Series:
+    """Rows that fail none of the checks"""
+    passing = pd.Series(True, index=frame.index)
+    for mask, _ in checks:
+        passing &= ~mask
+    return passing
+
+def _duplicate_check(values: pd.Series, candidates: pd.Series, seen: set, name: str) -> Tuple[pd.Series, str]:
+    """
+    Repeats of a unique value among candidate rows, in this chunk or in `seen`
+    (values accepted from earlier chunks), so the first insertable occurrence wins
+    """
+    values = values.where(candidates)
+    return candidates & (values.duplicated(keep="first") | values.isin(seen)), f"{name} is duplicated in the file"
+
+def _failures(frame: pd.DataFrame, checks: List[Tuple[pd.Series, str]]) -> List[Tuple[int, str]]:
+    """(1-based row number, combined message) for every row failing a check"""
+    invalid = ~_passing(frame, checks)
+    return [
+        (index + 1, "; ".join(message for mask, message in checks if mask[index]))
+        for index in frame.index[invalid]
+    ]
+
+def _parse_result(frame: pd.DataFrame, checks: List[Tuple[pd.Series, str]]):
+    """A ParseFrame result: the rows passing every check as plain tuples, and the failures"""
+    valid = frame[_passing(frame, checks)].astype(object)
+    valid = valid.where(valid.notna(), None)
+    return list(frame.columns), list(valid.itertuples(index=False, name=None)), _row_numbers(valid), _failures(frame, checks)
+
+def _split_valid(frame: pd.DataFrame, checks: List[Tuple[pd.Series, str]]) -> Tuple[pd.DataFrame, List[str]]:
+    """(rows passing every check, "Row N: ..." messages for the others)"""
+    errors = [f"Row {row_number}: {message}" for row_number, message in _failures(frame, checks)]
+    return frame[_passing(frame, checks)].astype(object), errors
+
+def _records(frame: pd.DataFrame) -> List[Dict[str, Any]]:
+    return frame.where(frame.notna(), None).to_dict("records")
+
+def _row_numbers(frame: pd.DataFrame) -> List[int]:
+    return [index + 1 for index in frame.index]
+
+def _row_number(message: str) -> int:
+    """Row number of a "Row N: ..." error message"""
+    return int(message.split(":", 1)[0][4:])
+
+# --- Batched writes ---
+def _upsert_statement(model, key_columns: List[str], update_columns: List[str]):
+    """
+    INSERT ... ON CONFLICT (key_columns) DO UPDATE of update_columns. updated_at is
+    set here because the ORM's onupdate does not apply to Core statements.
+    """
+    stmt = upsert_insert(model)
+    set_ = {col: stmt.excluded[col] for col in update_columns}
+    set_["updated_at"] = func.now()
+    return stmt.on_conflict_do_update(index_elements=key_columns, set_=set_)
+
+def _bulk_insert(db: Session, model, rows: List[Dict[str, Any]], row_numbers: List[int], stmt=None) -> Tuple[int, List[str]]:
+    """
+    Insert rows in IMPORT_BATCH_SIZE executemany batches within the caller's transaction,
+    with a plain INSERT or the given variant of one (e.g. _upsert_statement).
+    A batch that fails (e.g. on a unique constraint) is retried row by row under
+    savepoints, so only the offending rows are reported. Returns (written count, errors).
+    """
+    inserted = 0
+    errors = []
+    stmt = insert(model) if stmt is None else stmt
+    for start in range(0, len(rows), IMPORT_BATCH_SIZE):
+        batch = rows[start:start + IMPORT_BATCH_SIZE]
+        try:
+            with db.begin_nested():
+                db.execute(stmt, batch)
+            inserted += len(batch)
+            continue
+        except SQLAlchemyError:
+            pass
+        for row, row_number in zip(batch, row_numbers[start:start + IMPORT_BATCH_SIZE]):
             try:
-                # Create student schema
-                student_data = schemas.StudentCreate(
-                    student_id=row["student_id"],
-                    first_name=row["first_name"],
-                    last_name=row["last_name"],
-                    date_of_birth=row["date_of_birth"],
-                    gender=row["gender"],
-                    email=row["email"],
-                    phone=row.get("phone"),
-                    address=row.get("address"),
-                    admission_date=row["admission_date"],
-                    grade_level=row["grade_level"],
-                    is_active=True
-                )
-                
-                # Create student in database
-                crud.create_student(db=db, student=student_data)
-                successful_count += 1
-                
-            except Exception as e:
-                failed_count += 1
-                errors.append(f"Row {index + 1}: {str(e)}")
+                with db.begin_nested():
+                    db.execute(stmt, [row])
+                inserted += 1
+            except SQLAlchemyError as e:
+                errors.append(f"Row {row_number}: {getattr(e, 'orig', e)}")
+    return inserted, errors
+
+def _run_chunked_import(db: Session, chunks, import_chunk: Callable[[pd.DataFrame], Tuple[int, List[str]]], on_progress: ProgressCallback) -> Dict[str, Any]:
+    """
+    Feed each chunk to import_chunk, which returns (rows written, error messages),
+    committing after every chunk and reporting progress
+    """
+    total_count = 0
+    successful_count = 0
+    errors = _ErrorLog()
+    for chunk in chunks:
+        try:
+            written, chunk_errors = import_chunk(chunk)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        total_count += len(chunk)
+        successful_count += written
+        errors.extend(sorted(chunk_errors, key=_row_number))
+        if on_progress:
+            on_progress(_import_result(total_count, successful_count, total_count - successful_count, errors))
+    return _import_result(total_count, successful_count, total_count - successful_count, errors)
+
+def _run_parsed_import(db: Session, chunks: Iterator[Tuple[int, Any]], table_name: str,
+                       import_rows: Callable[[List[Dict[str, Any]], List[int]], Tuple[int, List[str], set]],
+                       on_progress: ProgressCallback) -> Dict[str, Any]:
+    """
+    Feed the valid rows of each parsed chunk (see _parsed_chunks) to import_rows, which
+    returns (rows written, error messages, grade levels changed); commit after every
+    chunk, report its parse failures with the rest and notify data change listeners
+    """
+    total_count = 0
+    successful_count = 0
+    errors = _ErrorLog()
+    for row_count, (columns, tuples, row_numbers, failures) in chunks:
+        rows = [dict(zip(columns, values)) for values in tuples]
+        try:
+            written, chunk_errors, grade_levels = import_rows(rows, row_numbers)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        chunk_errors += [f"Row {row_number}: {message}" for row_number, message in failures]
+        total_count += row_count
+        successful_count += written
+        errors.extend(sorted(chunk_errors, key=_row_number))
+        if written:
+            notify_data_change(table_name, grade_levels)
+        if on_progress:
+            on_progress(_import_result(total_count, successful_count, total_count - successful_count, errors))
+    return _import_result(total_count, successful_count, total_count - successful_count, errors)
+
+# --- Parallel parsing ---
+# Large CSVs are parsed and validated in worker processes, one newline-aligned byte
+# range each, while the import's own thread is the single writer: it takes parsed
+# ranges in file order from a bounded window of in-flight results and writes them.
+# Ranges end only at line breaks outside quoted fields, so multi-line values stay whole.
+
+# Bytes of CSV per parse job
+IMPORT_PARSE_CHUNK_BYTES = 4 * 1024 * 1024
+
+_parse_executor = None
+_parse_executor_lock = threading.Lock()
+
+def _get_parse_executor() -> ProcessPoolExecutor:
+    global _parse_executor
+    with _parse_executor_lock:
+        if _parse_executor is None:
+            # spawn, not fork: the parent runs worker threads and holds DB connections
+            _parse_executor = ProcessPoolExecutor(
+                max_workers=settings.IMPORT_PARSE_PROCESSES, mp_context=multiprocessing.get_context("spawn")
+            )
+        return _parse_executor
+
+def _use_parallel_parse(file_path: str) -> bool:
+    """Only CSVs split into independently parseable byte ranges"""
+    return (
+        settings.IMPORT_PARSE_PROCESSES > 0
+        and _import_file_type(file_path) == "csv"
+        and os.path.getsize(file_path) >= settings.IMPORT_PARALLEL_MIN_BYTES
+    )
+
+def _record_end(f, quoted: bool) -> int:
+    """
+    Read on to the first line break that ends a record, and return the offset after it.
+    `quoted` says whether the bytes since the last record boundary leave a quoted field
+    open. Quotes inside a field are escaped by doubling them, so a line break is outside
+    quotes exactly when an even number of quote characters precede it.
+    """
+    while True:
+        line = f.readline()
+        if not line:
+            return f.tell()
+        quoted ^= line.count(b'"') % 2 == 1
+        if not quoted:
+            return f.tell()
+
+def _csv_byte_ranges(file_path: str, chunk_bytes: int) -> Iterator[Tuple[int, int]]:
+    """(start, end) offsets covering the rows after the header, each ending at a record boundary"""
+    size = os.path.getsize(file_path)
+    with open(file_path, "rb") as f:
+        start = _record_end(f, False)
+        while start < size:
+            data = f.read(chunk_bytes)
+            end = _record_end(f, data.count(b'"') % 2 == 1) if len(data) == chunk_bytes else f.tell()
+            yield start, end
+            start = end
+
+def _read_csv_range(file_path: str, start: int, end: int, columns: List[str]) -> pd.DataFrame:
+    """Rows in [start, end) as strings, indexed from 0 within the range"""
+    with open(file_path, "rb") as f:
+        f.seek(start)
+        data = f.read(end - start)
+    return pd.read_csv(io.BytesIO(data), header=None, names=columns, dtype=str)
+
+# Called with a frame of string columns; returns (columns, valid rows as tuples,
+# their 1-based row numbers within the frame, (row number, message) for invalid rows).
+# Must be a module-level function, so worker processes can import it.
+ParseFrame = Callable[[pd.DataFrame], Tuple[List[str], List[tuple], List[int], List[Tuple[int, str]]]]
+
+def _parse_range(parse_frame: ParseFrame, file_path: str, start: int, end: int, columns: List[str]):
+    """Worker process entry point: (row count, parse_frame result) for a byte range"""
+    df = _read_csv_range(file_path, start, end, columns)
+    return len(df), parse_frame(df)
+
+def _parse_in_parallel(file_path: str, required_columns: List[str], parse_frame: ParseFrame) -> Iterator[Tuple[int, int, Any]]:
+    """
+    Run parse_frame over the file's byte ranges in worker processes, yielding
+    (row offset of the range, row count, result) in file order. At most twice as many
+    ranges as there are processes are in flight, which bounds memory when the writer
+    falls behind.
+    """
+    columns = list(pd.read_csv(file_path, nrows=0).columns)
+    _check_columns(columns, required_columns)
+    executor = _get_parse_executor()
+    window = settings.IMPORT_PARSE_PROCESSES * 2
+    pending = deque()
+    row_offset = 0
+    try:
+        for start, end in _csv_byte_ranges(file_path, IMPORT_PARSE_CHUNK_BYTES):
+            pending.append(executor.submit(_parse_range, parse_frame, file_path, start, end, columns))
+            while len(pending) >= window:
+                row_count, result = pending.popleft().result()
+                yield row_offset, row_count, result
+                row_offset += row_count
+        while pending:
+            row_count, result = pending.popleft().result()
+            yield row_offset, row_count, result
+            row_offset += row_count
+    finally:
+        for future in pending:
+            future.cancel()
+
+# --- Students ---
+def _parse_student_frame(df: pd.DataFrame):
+    """
+    The per-row half of student validation (required values, dates, email format),
+    which needs no database and so can run in a worker process (a ParseFrame)
+    """
+    frame = _clean_frame(df, _file_columns(df, STUDENT_REQUIRED_COLUMNS, STUDENT_OPTIONAL_COLUMNS))
+    
+    # (mask of failing rows, message) pairs, each evaluated over the whole column
+    checks = _required_checks(frame, STUDENT_REQUIRED_COLUMNS)
+    checks += [_date_check(frame, col) for col in STUDENT_DATE_COLUMNS]
+    checks.append(_email_check(frame))
+    
+    return _parse_result(frame, checks)
+
+def _parsed_chunks(file_path: str, required_columns: List[str], parse_frame: ParseFrame) -> Iterator[Tuple[int, Any]]:
+    """
+    (row count, parse_frame result) per chunk of the file, with file-wide row numbers;
+    parsed in worker processes when the file is large enough to pay for them
+    """
+    if not _use_parallel_parse(file_path):
+        for chunk in _read_chunks(file_path, required_columns):
+            yield len(chunk), parse_frame(chunk)
+        return
+    for row_offset, row_count, (columns, rows, row_numbers, failures) in _parse_in_parallel(
+        file_path, required_columns, parse_frame
+    ):
+        yield row_count, (
+            columns, rows,
+            [row_number + row_offset for row_number in row_numbers],
+            [(row_number + row_offset, message) for row_number, message in failures]
+        )
+
+def _existing_students(db: Session, student_ids: List[str], emails: List[str]) -> Tuple[Dict[str, Tuple[int, str]], Dict[str, str]]:
+    """
+    Existing students with any of the student_ids or emails, found with one IN query.
+    Returns ({student_id: (id, grade_level)}, {email: student_id}).
+    """
+    by_student_id, email_owners = {}, {}
+    if not student_ids and not emails:
+        return by_student_id, email_owners
+    rows = db.query(Student.id, Student.student_id, Student.email, Student.grade_level).filter(
+        or_(Student.student_id.in_(student_ids), Student.email.in_(emails))
+    ).all()
+    for id, student_id, email, grade_level in rows:
+        by_student_id[student_id] = (id, grade_level)
+        if email is not None:
+            email_owners[email] = student_id
+    return by_student_id, email_owners
+
+def _check_student_uniqueness(db: Session, rows: List[Dict[str, Any]], row_numbers: List[int],
+                              seen: Dict[str, set], mode: str = "insert"):
+    """
+    The cross-row half of student validation, run by the writer: duplicates within the
+    file (`seen` carries values from earlier rows; the first occurrence wins) and
+    conflicts with existing students.
+    Returns (valid rows, their row numbers, error messages, {student_id: (id, grade_level)}
+    of the existing students the rows refer to).
+    """
+    existing, email_owners = _existing_students(
+        db, list({row["student_id"] for row in rows}), list({row["email"] for row in rows})
+    )
+    # Indexed by row number - 1, as the frames of the other importers are
+    frame = pd.DataFrame(rows, columns=STUDENT_UNIQUE_COLUMNS, index=[row_number - 1 for row_number in row_numbers])
+    checks = []
+    if mode == "insert":
+        checks.append((frame["student_id"].isin(list(existing)), "student_id already exists"))
+    # An upserted student may keep its own email, but not take another student's
+    email_taken = frame["email"].isin(list(email_owners))
+    if mode == "upsert":
+        email_taken &= frame["email"].map(email_owners) != frame["student_id"]
+    checks.append((email_taken, "email already exists"))
+    # Only rows that could otherwise be written claim their values, so a rejected row
+    # does not make a later, corrected one a duplicate
+    candidates = _passing(frame, checks)
+    checks += [_duplicate_check(frame[col], candidates, seen[col], col) for col in STUDENT_UNIQUE_COLUMNS]
+    
+    passing = _passing(frame, checks)
+    errors = [f"Row {row_number}: {message}" for row_number, message in _failures(frame, checks)]
+    valid_rows = [row for row, accepted in zip(rows, passing) if accepted]
+    valid_numbers = [row_number for row_number, accepted in zip(row_numbers, passing) if accepted]
+    for col in STUDENT_UNIQUE_COLUMNS:
+        seen[col].update(frame.loc[passing, col])
+    return valid_rows, valid_numbers, errors, existing
+
+def _move_regraded_students(db: Session, rows: List[Dict[str, Any]], row_numbers: List[int],
+                            write_errors: List[str], existing: Dict[str, Tuple[int, str]]) -> set:
+    """Re-file attendance rollup counts of upserted students whose grade_level changed; returns their old grade levels"""
+    failed = {_row_number(message) for message in write_errors}
+    old_grade_levels = set()
+    for row, row_number in zip(rows, row_numbers):
+        previous = existing.get(row["student_id"])
+        if previous and row_number not in failed and previous[1] != row["grade_level"]:
+            move_student_attendance_rollup(db, previous[0], previous[1], row["grade_level"])
+            old_grade_levels.add(previous[1])
+    return old_grade_levels
+
+def import_students_from_file(file_path: str, db: Session, on_progress: ProgressCallback = None,
+                             mode: str = "insert", imported_by: int = None) -> Dict[str, Any]:
+    """
+    Import students from a CSV, xlsx or JSON file; in "upsert" mode rows matching
+    an existing student_id update that student
+    """
+    try:
+        seen = {col: set() for col in STUDENT_UNIQUE_COLUMNS}
         
-        return {
-            "total_records": len(df),
-            "successful_records": successful_count,
-            "failed_records": failed_count,
-            "errors": errors
-        }
+        # Each chunk arrives parsed and format-checked; it is checked for duplicates
+        # and conflicts, then written in batches
+        def import_rows(rows: List[Dict[str, Any]], row_numbers: List[int]) -> Tuple[int, List[str], set]:
+            for row in rows:
+                row["is_active"] = True
+            rows, row_numbers, errors, existing = _check_student_uniqueness(db, rows, row_numbers, seen, mode)
+            grade_levels = {row["grade_level"] for row in rows}
+            stmt = None
+            if mode == "upsert" and rows:
+                update_columns = [col for col in rows[0] if col not in ("student_id", "is_active")]
+                stmt = _upsert_statement(Student, ["student_id"], update_columns)
+            written, write_errors = _bulk_insert(db, Student, rows, row_numbers, stmt)
+            if mode == "upsert":
+                grade_levels |= _move_regraded_students(db, rows, row_numbers, write_errors, existing)
+            return written, errors + write_errors, grade_levels
+        
+        return _run_parsed_import(
+            db, _parsed_chunks(file_path, STUDENT_REQUIRED_COLUMNS, _parse_student_frame), "students", import_rows, on_progress
+        )
         
     except Exception as e:
-        raise Exception(f"Failed to import students from CSV: {str(e)}")
+        raise Exception(f"Failed to import students: {str(e)}")
+
+# --- Teachers ---
+def _existing_teachers(db: Session, frame: pd.DataFrame, candidates: pd.Series) -> Tuple[Dict[str, int], Dict[str, Optional[str]]]:
+    """
+    Existing staff sharing an employee_id, and users sharing an email, with the frame.
+    Returns ({employee_id: user_id}, {email: employee_id of the user's staff record, or None}).
+    """
+    employee_ids = frame.loc[candidates, "employee_id"].dropna().unique().tolist()
+    emails = frame.loc[candidates, "email"].dropna().unique().tolist()
+    staff = dict(db.query(Staff.employee_id, Staff.user_id).filter(Staff.employee_id.in_(employee_ids)).all())
+    email_owners = dict(
+        db.query(User.email, Staff.employee_id).outerjoin(Staff, Staff.user_id == User.id).filter(User.email.in_(emails)).all()
+    )
+    return staff, email_owners
+
+def _validate_teacher_frame(df: pd.DataFrame, db: Session, seen: Dict[str, set], mode: str = "insert"):
+    """
+    Clean and validate a whole frame of teacher rows, including duplicates within the
+    file and conflicts with existing staff and user accounts.
+    Returns (valid row dicts, their row numbers, error messages, {employee_id: user_id} of existing staff).
+    """
+    frame = _clean_frame(df, _file_columns(df, TEACHER_REQUIRED_COLUMNS, TEACHER_OPTIONAL_COLUMNS))
+    checks = _required_checks(frame, TEACHER_REQUIRED_COLUMNS)
+    checks.append(_date_check(frame, "hire_date"))
+    checks.append(_email_check(frame))
+    if "salary" in frame.columns:
+        checks.append(_number_check(frame, "salary"))
+    
+    candidates = _passing(frame, checks)
+    existing, email_owners = _existing_teachers(db, frame, candidates)
+    if mode == "insert":
+        checks.append((candidates & frame["employee_id"].isin(list(existing)), "employee_id already exists"))
+    # The account's email may only belong to the same staff member being upserted
+    email_taken = candidates & frame["email"].isin(list(email_owners))
+    if mode == "upsert":
+        owners = frame["email"].astype(object).map(email_owners)
+        email_taken &= owners != frame["employee_id"].astype(object)
+    checks.append((email_taken, "email already exists"))
+    # Only rows that could otherwise be written claim their values, so a rejected row
+    # does not make a later, corrected one a duplicate
+    candidates = _passing(frame, checks)
+    for col in TEACHER_UNIQUE_COLUMNS:
+        checks.append(_duplicate_check(frame[col], candidates, seen[col], col))
+    
+    valid, errors = _split_valid(frame, checks)
+    for col in TEACHER_UNIQUE_COLUMNS:
+        seen[col].update(valid[col])
+    return _records(valid), _row_numbers(valid), errors, existing
 
-def import_teachers_from_csv(file_path: str, db: Session) -> Dict[str, Any]:
+def import_teachers_from_file(file_path: str, db: Session, on_progress: ProgressCallback = None,
+                             mode: str = "insert", imported_by: int = None) -> Dict[str, Any]:
     """
-    Import teachers from CSV file
+    Import teachers from a CSV, xlsx or JSON file: a user account (role "teacher")
+    and a staff record per row. In "upsert" mode rows matching an existing
+    employee_id update both. New accounts get no usable password; an admin
+    issues each teacher a temporary one via POST /users/admin/{user_id}/reset-password.
     """
     try:
-        # Read CSV file
-        df = pd.read_csv(file_path)
+        seen = {col: set() for col in TEACHER_UNIQUE_COLUMNS}
+        # New accounts share one random password hash (bcrypt per row would dominate
+        # the import); nobody knows the password, so teachers sign in after an admin reset
+        hashed_password = get_password_hash(secrets.token_urlsafe(32))
         
-        # Validate required columns
-        required_columns = ["employee_id", "first_name", "last_name", "email", "department", "position", "hire_date"]
-        missing_columns = [col for col in required_columns if col not in df.columns]
-        if missing_columns:
-            raise ValueError(f"Missing required columns: {missing_columns}")
+        def import_chunk(chunk: pd.DataFrame) -> Tuple[int, List[str]]:
+            rows, row_numbers, errors, existing = _validate_teacher_frame(chunk, db, seen, mode)
+            if not rows:
+                return 0, errors
+            staff_columns = [col for col in TEACHER_STAFF_COLUMNS if col in rows[0]]
+            # Columns absent from the file are left alone on existing accounts
+            user_update_columns = ["email", "full_name"] + (["phone_number"] if "phone" in rows[0] else [])
+            
+            # Accounts first: new teachers get a user, existing ones have theirs updated in place
+            new_users, new_numbers, updated_users, updated_numbers = [], [], [], []
+            for row, row_number in zip(rows, row_numbers):
+                user = {
+                    "email": row["email"],
+                    "full_name": f"{row['first_name']} {row['last_name']}",
+                    "role": "teacher",
+                    "hashed_password": hashed_password,
+                    "phone_number": row.get("phone"),
+                    "is_active": True
+                }
+                if row["employee_id"] in existing:
+                    updated_users.append({"id": existing[row["employee_id"]], **user})
+                    updated_numbers.append(row_number)
+                else:
+                    new_users.append(user)
+                    new_numbers.append(row_number)
+            _, user_errors = _bulk_insert(db, User, new_users, new_numbers)
+            _, update_errors = _bulk_insert(
+                db, User, updated_users, updated_numbers,
+                _upsert_statement(User, ["id"], user_update_columns)
+            )
+            errors += user_errors + update_errors
+            
+            # Then staff records, linked to the accounts by email
+            failed = {_row_number(message) for message in user_errors + update_errors}
+            user_ids = dict(db.query(User.email, User.id).filter(User.email.in_([row["email"] for row in rows])).all())
+            staff_rows, staff_numbers = [], []
+            for row, row_number in zip(rows, row_numbers):
+                if row_number not in failed:
+                    staff_rows.append({
+                        "user_id": user_ids[row["email"]], "is_active": True,
+                        **{col: row[col] for col in staff_columns}
+                    })
+                    staff_numbers.append(row_number)
+            stmt = None
+            if mode == "upsert":
+                stmt = _upsert_statement(Staff, ["employee_id"], ["user_id"] + [col for col in staff_columns if col != "employee_id"])
+            written, staff_errors = _bulk_insert(db, Staff, staff_rows, staff_numbers, stmt)
+            
+            # Drop accounts created for rows whose staff record could not be written
+            if staff_errors:
+                failed_staff = {_row_number(message) for message in staff_errors}
+                orphans = [user["email"] for user, row_number in zip(new_users, new_numbers) if row_number in failed_staff]
+                db.query(User).filter(User.email.in_(orphans)).delete(synchronize_session=False)
+            return written, errors + staff_errors
         
-        # Process each row
-        successful_count = 0
-        failed_count = 0
-        errors = []
+        return _run_chunked_import(db, _read_chunks(file_path, TEACHER_REQUIRED_COLUMNS), import_chunk, on_progress)
         
-        for index, row in df.iterrows():
-            try:
-                # Create teacher schema
-                teacher_data = schemas.TeacherCreate(
-                    employee_id=row["employee_id"],
-                    first_name=row["first_name"],
-                    last_name=row["last_name"],
-                    email=row["email"],
-                    department=row["department"],
-                    position=row["position"],
-                    hire_date=row["hire_date"],
-                    phone=row.get("phone"),
-                    address=row.get("address"),
-                    salary=row.get("salary"),
-                    qualification=row.get("qualification"),
-                    experience=row.get("experience")
-                )
-                
-                # Create teacher in database
-                crud.create_teacher(db=db, teacher=teacher_data)
-                successful_count += 1
-                
-            except Exception as e:
-                failed_count += 1
-                errors.append(f"Row {index + 1}: {str(e)}")
+    except Exception as e:
+        raise Exception(f"Failed to import teachers: {str(e)}")
+
+# --- Parents ---
+def _validate_parent_frame(df: pd.DataFrame, db: Session, seen: set, mode: str = "insert"):
+    """
+    Clean and validate a whole frame of parent rows, including duplicates within the
+    file and existing records. A parent row is keyed by its (user_id, student_id) pair.
+    Returns (valid row dicts, their row numbers, error messages).
+    """
+    frame = _clean_frame(df, _file_columns(df, PARENT_REQUIRED_COLUMNS, PARENT_OPTIONAL_COLUMNS))
+    checks = _required_checks(frame, PARENT_REQUIRED_COLUMNS)
+    checks += [_number_check(frame, col, integer=True) for col in ("user_id", "student_id")]
+    
+    candidates = _passing(frame, checks)
+    user_ids = frame.loc[candidates, "user_id"].unique().tolist()
+    student_ids = frame.loc[candidates, "student_id"].unique().tolist()
+    known_users = {id for (id,) in db.query(User.id).filter(User.id.in_(user_ids)).all()}
+    known_students = {id for (id,) in db.query(Student.id).filter(Student.id.in_(student_ids)).all()}
+    checks.append((candidates & ~frame["user_id"].isin(list(known_users)), "user_id does not exist"))
+    checks.append((candidates & ~frame["student_id"].isin(list(known_students)), "student_id does not exist"))
+    
+    candidates = _passing(frame, checks)
+    # Plain ints (not numpy scalars), so the pairs bind as query parameters
+    pairs = pd.Series(
+        list(zip(frame["user_id"].astype(object), frame["student_id"].astype(object))), index=frame.index, dtype=object
+    )
+    checks.append(_duplicate_check(pairs, candidates, seen, "user_id/student_id pair"))
+    if mode == "insert":
+        existing = set(db.query(Parent.user_id, Parent.student_id).filter(
+            tuple_(Parent.user_id, Parent.student_id).in_(pairs[candidates].tolist())
+        ).all())
+        checks.append((candidates & pairs.isin(existing), "parent already exists for this user_id and student_id"))
+    
+    valid, errors = _split_valid(frame, checks)
+    seen.update(pairs[valid.index])
+    return _records(valid), _row_numbers(valid), errors
+
+def import_parents_from_file(file_path: str, db: Session, on_progress: ProgressCallback = None,
+                            mode: str = "insert", imported_by: int = None) -> Dict[str, Any]:
+    """
+    Import parents from a CSV, xlsx or JSON file; in "upsert" mode rows matching
+    an existing (user_id, student_id) pair update that parent record
+    """
+    try:
+        seen = set()
         
-        return {
-            "total_records": len(df),
-            "successful_records": successful_count,
-            "failed_records": failed_count,
-            "errors": errors
-        }
+        def import_chunk(chunk: pd.DataFrame) -> Tuple[int, List[str]]:
+            rows, row_numbers, errors = _validate_parent_frame(chunk, db, seen, mode)
+            stmt = None
+            if mode == "upsert" and rows:
+                update_columns = [col for col in rows[0] if col not in ("user_id", "student_id")]
+                stmt = _upsert_statement(Parent, ["user_id", "student_id"], update_columns)
+            written, write_errors = _bulk_insert(db, Parent, rows, row_numbers, stmt)
+            return written, errors + write_errors
+        
+        return _run_chunked_import(db, _read_chunks(file_path, PARENT_REQUIRED_COLUMNS), import_chunk, on_progress)
         
     except Exception as e:
-        raise Exception(f"Failed to import teachers from CSV: {str(e)}")
+        raise Exception(f"Failed to import parents: {str(e)}")
+
+# --- Attendance and grades ---
+# Both name students by their external student_id, resolved to internal ids with one
+# query per chunk, and only insert: a record that already exists is reported and skipped.
+def _student_lookup(db: Session, student_ids: List[str]) -> Dict[str, Tuple[int, str]]:
+    """{student_id: (id, grade_level)} of the existing students among student_ids"""
+    rows = db.query(Student.student_id, Student.id, Student.grade_level).filter(Student.student_id.in_(student_ids)).all()
+    return {student_id: (id, grade_level) for student_id, id, grade_level in rows}
+
+def _resolve_rows(rows: List[Dict[str, Any]], row_numbers: List[int],
+                  check: Callable[[Dict[str, Any]], Optional[str]]) -> Tuple[List[Dict[str, Any]], List[int], List[str]]:
+    """Keep the rows check() accepts; it fills in internal ids, or returns an error message"""
+    kept, kept_numbers, errors = [], [], []
+    for row, row_number in zip(rows, row_numbers):
+        message = check(row)
+        if message:
+            errors.append(f"Row {row_number}: {message}")
+        else:
+            kept.append(row)
+            kept_numbers.append(row_number)
+    return kept, kept_numbers, errors
 
-def import_parents_from_csv(file_path: str, db: Session) -> Dict[str, Any]:
+def _check_insert_mode(mode: str, name: str) -> None:
+    if mode != "insert":
+        raise ValueError(f"{name} imports only support insert mode")
+
+def _parse_attendance_frame(df: pd.DataFrame):
+    """Required values, dates and statuses of attendance rows (a ParseFrame)"""
+    frame = _clean_frame(df, _file_columns(df, ATTENDANCE_REQUIRED_COLUMNS, ATTENDANCE_OPTIONAL_COLUMNS))
+    checks = _required_checks(frame, ATTENDANCE_REQUIRED_COLUMNS)
+    checks.append(_date_check(frame, "date"))
+    status = frame["status"].str.lower()
+    checks.append((
+        frame["status"].notna() & ~status.isin(list(ATTENDANCE_STATUSES)),
+        f"status must be one of {', '.join(ATTENDANCE_STATUSES.values())}"
+    ))
+    frame["status"] = status.map(ATTENDANCE_STATUSES)
+    return _parse_result(frame, checks)
+
+def import_attendance_from_file(file_path: str, db: Session, on_progress: ProgressCallback = None,
+                               mode: str = "insert", imported_by: int = None) -> Dict[str, Any]:
     """
-    Import parents from CSV file
+    Import attendance records (student_id, date, status) from a CSV, xlsx or JSON
+    file, recorded by the importing user, keeping the daily attendance rollup in step
     """
     try:
-        # Read CSV file
-        df = pd.read_csv(file_path)
+        _check_insert_mode(mode, "Attendance")
+        if imported_by is None:
+            raise ValueError("Attendance imports need the importing user")
+        seen = set()
         
-        # Validate required columns
-        required_columns = ["user_id", "student_id", "relationship_type"]
-        missing_columns = [col for col in required_columns if col not in df.columns]
-        if missing_columns:
-            raise ValueError(f"Missing required columns: {missing_columns}")
+        def import_rows(rows: List[Dict[str, Any]], row_numbers: List[int]) -> Tuple[int, List[str], set]:
+            if not rows:
+                return 0, [], set()
+            students = _student_lookup(db, list({row["student_id"] for row in rows}))
+            existing = set(db.query(Attendance.student_id, Attendance.date).filter(
+                Attendance.student_id.in_([id for id, _ in students.values()]),
+                Attendance.date.between(min(row["date"] for row in rows), max(row["date"] for row in rows))
+            ).all())
+            grade_levels = {}
+            
+            def check(row: Dict[str, Any]) -> Optional[str]:
+                student = students.get(row["student_id"])
+                if student is None:
+                    return "student_id does not exist"
+                key = (student[0], row["date"])
+                if key in existing:
+                    return "attendance is already recorded for this student and date"
+                if key in seen:
+                    return "attendance for this student and date is duplicated in the file"
+                row["student_id"] = student[0]
+                row["recorded_by"] = imported_by
+                grade_levels[student[0]] = student[1]
+                # Accepted: later rows with the same key are duplicates
+                seen.add(key)
+            
+            rows, row_numbers, errors = _resolve_rows(rows, row_numbers, check)
+            written, write_errors = _bulk_insert(db, Attendance, rows, row_numbers)
+            failed = {_row_number(message) for message in write_errors}
+            # Rows that could not be written were not accepted after all
+            seen.difference_update(
+                (row["student_id"], row["date"]) for row, row_number in zip(rows, row_numbers) if row_number in failed
+            )
+            deltas = Counter(
+                (row["date"], grade_levels[row["student_id"]], row["status"].lower())
+                for row, row_number in zip(rows, row_numbers) if row_number not in failed
+            )
+            apply_attendance_rollup_deltas(db, deltas)
+            return written, errors + write_errors, {grade_level for _, grade_level, _ in deltas}
         
-        # Process each row
-        successful_count = 0
-        failed_count = 0
-        errors = []
+        return _run_parsed_import(
+            db, _parsed_chunks(file_path, ATTENDANCE_REQUIRED_COLUMNS, _parse_attendance_frame), "attendance", import_rows, on_progress
+        )
         
-        for index, row in df.iterrows():
-            try:
-                # Create parent schema
-                parent_data = schemas.ParentCreate(
-                    user_id=row["user_id"],
-                    student_id=row["student_id"],
-                    relationship_type=row["relationship_type"],
-                    occupation=row.get("occupation"),
-                    emergency_contact=row.get("emergency_contact")
-                )
-                
-                # Create parent in database
-                crud.create_parent(db=db, parent=parent_data)
-                successful_count += 1
-                
-            except Exception as e:
-                failed_count += 1
-                errors.append(f"Row {index + 1}: {str(e)}")
+    except Exception as e:
+        raise Exception(f"Failed to import attendance: {str(e)}")
+
+def _parse_grade_frame(df: pd.DataFrame):
+    """Required values, dates and scores of grade rows (a ParseFrame)"""
+    frame = _clean_frame(df, _file_columns(df, GRADE_REQUIRED_COLUMNS, GRADE_OPTIONAL_COLUMNS))
+    checks = _required_checks(frame, GRADE_REQUIRED_COLUMNS)
+    checks += [_date_check(frame, col) for col in GRADE_DATE_COLUMNS if col in frame.columns]
+    checks += [_number_check(frame, col) for col in ("score", "max_score") if col in frame.columns]
+    return _parse_result(frame, checks)
+
+def import_grades_from_file(file_path: str, db: Session, on_progress: ProgressCallback = None,
+                           mode: str = "insert", imported_by: int = None) -> Dict[str, Any]:
+    """
+    Import grades from a CSV, xlsx or JSON file with the columns student_id, subject,
+    assessment_type, assessment_name, date_assigned, score and employee_id (the
+    grading teacher), all required by the grades table. A missing grade_value
+    defaults to the score. A grade is identified by its student, subject,
+    assessment_name and date_assigned.
+    """
+    try:
+        _check_insert_mode(mode, "Grade")
+        seen = set()
         
-        return {
-            "total_records": len(df),
-            "successful_records": successful_count,
-            "failed_records": failed_count,
-            "errors": errors
-        }
+        def import_rows(rows: List[Dict[str, Any]], row_numbers: List[int]) -> Tuple[int, List[str], set]:
+            if not rows:
+                return 0, [], set()
+            students = _student_lookup(db, list({row["student_id"] for row in rows}))
+            teachers = dict(db.query(Staff.employee_id, Staff.id).filter(
+                Staff.employee_id.in_(list({row["employee_id"] for row in rows}))
+            ).all())
+            existing = set(db.query(Grade.student_id, Grade.subject, Grade.assessment_name, Grade.date_assigned).filter(
+                Grade.student_id.in_([id for id, _ in students.values()]),
+                Grade.date_assigned.between(min(row["date_assigned"] for row in rows), max(row["date_assigned"] for row in rows))
+            ).all())
+            grade_levels = {}
+            
+            def check(row: Dict[str, Any]) -> Optional[str]:
+                student = students.get(row["student_id"])
+                teacher_id = teachers.get(row["employee_id"])
+                messages = []
+                if student is None:
+                    messages.append("student_id does not exist")
+                if teacher_id is None:
+                    messages.append("employee_id does not exist")
+                if messages:
+                    return "; ".join(messages)
+                key = (student[0], row["subject"], row["assessment_name"], row["date_assigned"])
+                if key in existing:
+                    return "grade already exists"
+                if key in seen:
+                    return "grade is duplicated in the file"
+                row["student_id"] = student[0]
+                row["teacher_id"] = teacher_id
+                del row["employee_id"]
+                if row.get("grade_value") is None:
+                    row["grade_value"] = f"{row['score']:g}"
+                grade_levels[student[0]] = student[1]
+                # Accepted: later rows with the same key are duplicates
+                seen.add(key)
+            
+            rows, row_numbers, errors = _resolve_rows(rows, row_numbers, check)
+            written, write_errors = _bulk_insert(db, Grade, rows, row_numbers)
+            # Rows that could not be written were not accepted after all
+            failed = {_row_number(message) for message in write_errors}
+            seen.difference_update(
+                (row["student_id"], row["subject"], row["assessment_name"], row["date_assigned"])
+                for row, row_number in zip(rows, row_numbers) if row_number in failed
+            )
+            return written, errors + write_errors, set(grade_levels.values())
+        
+        return _run_parsed_import(
+            db, _parsed_chunks(file_path, GRADE_REQUIRED_COLUMNS, _parse_grade_frame), "grades", import_rows, on_progress
+        )
         
     except Exception as e:
-        raise Exception(f"Failed to import parents from CSV: {str(e)}")
+        raise Exception(f"Failed to import grades: {str(e)}")
+
+# --- Exports ---
+# Rows fetched per server-side cursor batch while exporting
+EXPORT_BATCH_SIZE = 1000
+
+STUDENT_EXPORT_COLUMNS = [
+    "id", "student_id", "first_name", "last_name", "date_of_birth", "gender", "email", "phone",
+    "address", "admission_date", "grade_level", "is_active", "created_at", "updated_at"
+]
+
+def _table_columns(model) -> List[str]:
+    return [column.name for column in model.__table__.columns]
+
+# Entities exportable as whole tables (columnar files, workbook sheets): name -> (model, columns)
+EXPORT_ENTITIES: Dict[str, Tuple[Any, List[str]]] = {
+    "students": (Student, STUDENT_EXPORT_COLUMNS),
+    "parents": (Parent, _table_columns(Parent)),
+    "staff": (Staff, _table_columns(Staff)),
+    "attendance": (Attendance, _table_columns(Attendance)),
+    "grades": (Grade, _table_columns(Grade)),
+    "fee_payments": (FeePayment, _table_columns(FeePayment)),
+}
+
+# Roles that may export each entity; fee payments are limited like the finance endpoints
+EXPORT_ENTITY_ROLES: Dict[str, List[str]] = {
+    "students": ["admin", "teacher"],
+    "parents": ["admin", "teacher"],
+    "staff": ["admin", "teacher"],
+    "attendance": ["admin", "teacher"],
+    "grades": ["admin", "teacher"],
+    "fee_payments": ["admin", "finance"],
+}
+
+def _export_batches(db: Session, model, columns: List[str], conditions: List[Any] = ()) -> Iterator[List[tuple]]:
+    """Rows of `model` as `columns` tuples, EXPORT_BATCH_SIZE rows at a time, from a server-side cursor"""
+    query = select(*[getattr(model, col) for col in columns]).where(*conditions).order_by(model.id)
+    result = db.execute(query.execution_options(yield_per=EXPORT_BATCH_SIZE))
+    for rows in result.partitions():
+        yield rows
+
+def _student_batches(db: Session) -> Iterator[List[tuple]]:
+    return _export_batches(db, Student, STUDENT_EXPORT_COLUMNS)
+
+def _json_record(row: tuple, columns: List[str] = STUDENT_EXPORT_COLUMNS) -> Dict[str, Any]:
+    return {
+        col: str(value) if isinstance(value, (date, datetime)) else value
+        for col, value in zip(columns, row)
+    }
+
+def stream_students_csv(db: Session) -> Iterator[str]:
+    """CSV text for every student, one piece per batch; the header goes out first"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(STUDENT_EXPORT_COLUMNS)
+    yield buffer.getvalue()
+    for rows in _student_batches(db):
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(rows)
+        yield buffer.getvalue()
+
+def stream_students_ndjson(db: Session) -> Iterator[str]:
+    """One JSON object per line for every student, one piece per batch"""
+    for rows in _student_batches(db):
+        yield "".join(json.dumps(_json_record(row)) + "\n" for row in rows)
+
+def stream_with_session(stream: Callable[[Session], Iterator[str]]) -> Iterator[str]:
+    """
+    Run a stream on its own session, closed when the stream ends. A streaming
+    response is consumed after the endpoint returns, so it cannot use the
+    request-scoped session.
+    """
+    db = SessionLocal()
+    try:
+        yield from stream(db)
+    finally:
+        db.close()
 
 def export_students_to_csv(db: Session, file_path: str) -> Dict[str, Any]:
     """
     Export students to CSV file
     """
     try:
-        # Get all students
-        students = crud.get_students(db)
-        
-        # Convert to DataFrame
-        student_data = []
-        for student in students:
-            student_data.append({
-                "id": student.id,
-                "student_id": student.student_id,
-                "first_name": student.first_name,
-                "last_name": student.last_name,
-                "date_of_birth": student.date_of_birth,
-                "gender": student.gender,
-                "email": student.email,
-                "phone": student.phone,
-                "address": student.address,
-                "admission_date": student.admission_date,
-                "grade_level": student.grade_level,
-                "is_active": student.is_active,
-                "created_at": student.created_at,
-                "updated_at": student.updated_at
-            })
-        
-        df = pd.DataFrame(student_data)
-        df.to_csv(file_path, index=False)
+        # Write batch by batch straight from the cursor
+        total_records = 0
+        with open(file_path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(STUDENT_EXPORT_COLUMNS)
+            for rows in _student_batches(db):
+                writer.writerows(rows)
+                total_records += len(rows)
         
         return {
-            "total_records": len(students),
-            "file_size": df.memory_usage(deep=True).sum(),
+            "total_records": total_records,
+            "file_size": os.path.getsize(file_path),
             "file_path": file_path
         }
         
     except Exception as e:
         raise Exception(f"Failed to export students to CSV: {str(e)}")
 
-def export_students_to_excel(db: Session, file_path: str) -> Dict[str, Any]:
+# Sheets of the full workbook export, in order: (sheet title, EXPORT_ENTITIES name)
+WORKBOOK_SHEETS = [("Students", "students"), ("Parents", "parents"), ("Fees", "fee_payments")]
+
+def _excel_header(column: str) -> str:
+    return column.replace("_", " ").title().replace("Id", "ID")
+
+def export_to_excel(db: Session, file_path: str, sheets: List[Tuple[str, str]] = None) -> Dict[str, Any]:
     """
-    Export students to Excel file
+    Export entities to one Excel workbook, a sheet each (WORKBOOK_SHEETS by default).
+    Uses openpyxl's write-only mode, so rows go from the cursor to the file without
+    the workbook being held in memory.
     """
+    from openpyxl import Workbook
+
+    sheets = sheets or WORKBOOK_SHEETS
     try:
-        # Get all students
-        students = crud.get_students(db)
-        
-        # Convert to DataFrame
-        student_data = []
-        for student in students:
-            student_data.append({
-                "ID": student.id,
-                "Student ID": student.student_id,
-                "First Name": student.first_name,
-                "Last Name": student.last_name,
-                "Date of Birth": student.date_of_birth,
-                "Gender": student.gender,
-                "Email": student.email,
-                "Phone": student.phone,
-                "Address": student.address,
-                "Admission Date": student.admission_date,
-                "Grade Level": student.grade_level,
-                "Is Active": student.is_active,
-                "Created At": student.created_at,
-                "Updated At": student.updated_at
-            })
-        
-        df = pd.DataFrame(student_data)
-        df.to_excel(file_path, index=False, sheet_name="Students")
+        workbook = Workbook(write_only=True)
+        sheet_records = {}
+        for title, entity in sheets:
+            model, columns = EXPORT_ENTITIES[entity]
+            sheet = workbook.create_sheet(title=title)
+            sheet.append([_excel_header(col) for col in columns])
+            sheet_records[title] = 0
+            for rows in _export_batches(db, model, columns):
+                for row in rows:
+                    sheet.append(tuple(row))
+                sheet_records[title] += len(rows)
+        workbook.save(file_path)
         
         return {
-            "total_records": len(students),
-            "file_size": df.memory_usage(deep=True).sum(),
+            "total_records": sum(sheet_records.values()),
+            "sheets": sheet_records,
+            "file_size": os.path.getsize(file_path),
             "file_path": file_path
         }
         
     except Exception as e:
-        raise Exception(f"Failed to export students to Excel: {str(e)}")
+        raise Exception(f"Failed to export to Excel: {str(e)}")
+
+def export_students_to_excel(db: Session, file_path: str) -> Dict[str, Any]:
+    """
+    Export students to Excel file
+    """
+    result = export_to_excel(db, file_path, sheets=[("Students", "students")])
+    del result["sheets"]
+    return result
 
 def export_students_to_pdf(db: Session, file_path: str) -> Dict[str, Any]:
     """
@@ -260,7 +1185,7 @@ def export_students_to_pdf(db: Session, file_path: str) -> Dict[str, Any]:
         from reportlab.lib import colors
         
         # Get all students
-        students = crud.get_students(db)
+        students = db.query(Student).order_by(Student.id).yield_per(EXPORT_BATCH_SIZE)
         
         # Create PDF document
         doc = SimpleDocTemplate(file_path, pagesize=letter)
@@ -300,11 +1225,10 @@ def export_students_to_pdf(db: Session, file_path: str) -> Dict[str, Any]:
         doc.build(elements)
         
         # Get file size
-        import os
         file_size = os.path.getsize(file_path)
         
         return {
-            "total_records": len(students),
+            "total_records": len(data) - 1,
             "file_size": file_size,
             "file_path": file_path
         }
@@ -317,42 +1241,171 @@ def export_students_to_json(db: Session, file_path: str) -> Dict[str, Any]:
     Export students to JSON file
     """
     try:
-        # Get all students
-        students = crud.get_students(db)
-        
-        # Convert to JSON-serializable format
-        student_data = []
-        for student in students:
-            student_data.append({
-                "id": student.id,
-                "student_id": student.student_id,
-                "first_name": student.first_name,
-                "last_name": student.last_name,
-                "date_of_birth": str(student.date_of_birth) if student.date_of_birth else None,
-                "gender": student.gender,
-                "email": student.email,
-                "phone": student.phone,
-                "address": student.address,
-                "admission_date": str(student.admission_date) if student.admission_date else None,
-                "grade_level": student.grade_level,
-                "is_active": student.is_active,
-                "created_at": str(student.created_at) if student.created_at else None,
-                "updated_at": str(student.updated_at) if student.updated_at else None
-            })
-        
-        # Write to JSON file
+        # Write a JSON array record by record straight from the cursor
+        total_records = 0
         with open(file_path, 'w') as f:
-            json.dump(student_data, f, indent=2)
+            f.write("[")
+            for rows in _student_batches(db):
+                for row in rows:
+                    f.write(",\n" if total_records else "\n")
+                    f.write(json.dumps(_json_record(row)))
+                    total_records += 1
+            f.write("\n]\n")
         
         # Get file size
-        import os
         file_size = os.path.getsize(file_path)
         
         return {
-            "total_records": len(students),
+            "total_records": total_records,
             "file_size": file_size,
             "file_path": file_path
         }
         
     except Exception as e:
-        raise Exception(f"Failed to export students to JSON: {str(e)}")
\ No newline at end of file
+        raise Exception(f"Failed to export students to JSON: {str(e)}")
+
+# --- Columnar exports (Parquet / Arrow IPC); require the optional `pyarrow` package ---
+COLUMNAR_EXPORT_TYPES = ["parquet", "arrow"]
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.ipc
+        import pyarrow.parquet
+    except ImportError:
+        raise RuntimeError("Parquet and Arrow exports require the 'pyarrow' package")
+    return pyarrow
+
+def _arrow_schema(pa, model, columns: List[str]):
+    """Arrow schema matching the SQL column types, so dates and booleans survive the round trip"""
+    fields = []
+    for name in columns:
+        column_type = model.__table__.columns[name].type
+        if isinstance(column_type, Boolean):
+            arrow_type = pa.bool_()
+        elif isinstance(column_type, Integer):
+            arrow_type = pa.int64()
+        elif isinstance(column_type, (Float, Numeric)):
+            arrow_type = pa.float64()
+        elif isinstance(column_type, DateTime):
+            arrow_type = pa.timestamp("us")
+        elif isinstance(column_type, Date):
+            arrow_type = pa.date32()
+        else:
+            arrow_type = pa.string()
+        fields.append(pa.field(name, arrow_type))
+    return pa.schema(fields)
+
+def _write_columnar(file_path: str, file_type: str, model, columns: List[str], batches: Iterator[List[tuple]]) -> int:
+    """Write batches to a Parquet or Arrow IPC file, one row group / record batch each; returns the row count"""
+    pa = _import_pyarrow()
+    schema = _arrow_schema(pa, model, columns)
+    if file_type == "parquet":
+        writer = pa.parquet.ParquetWriter(file_path, schema, compression="zstd")
+    else:
+        writer = pa.ipc.new_file(file_path, schema)
+    total_records = 0
+    try:
+        for rows in batches:
+            batch = pa.RecordBatch.from_arrays(
+                [pa.array(values, type=field.type) for values, field in zip(zip(*rows), schema)],
+                schema=schema
+            )
+            writer.write_batch(batch)
+            total_records += len(rows)
+    finally:
+        writer.close()
+    return total_records
+
+def export_entity_to_columnar(db: Session, entity: str, file_path: str, file_type: str) -> Dict[str, Any]:
+    """
+    Export every row of an EXPORT_ENTITIES entity to a Parquet or Arrow IPC file,
+    one row group / record batch per cursor batch
+    """
+    if entity not in EXPORT_ENTITIES:
+        raise ValueError(f"Unsupported export entity: {entity}")
+    if file_type not in COLUMNAR_EXPORT_TYPES:
+        raise ValueError(f"Unsupported columnar export type: {file_type}")
+    model, columns = EXPORT_ENTITIES[entity]
+
+    try:
+        total_records = _write_columnar(file_path, file_type, model, columns, _export_batches(db, model, columns))
+
+        return {
+            "total_records": total_records,
+            "file_size": os.path.getsize(file_path),
+            "file_path": file_path
+        }
+
+    except Exception as e:
+        raise Exception(f"Failed to export {entity} to {file_type}: {str(e)}")
+
+# --- Delta exports ---
+def _write_csv(file_path: str, file_type: str, model, columns: List[str], batches: Iterator[List[tuple]]) -> int:
+    total_records = 0
+    with open(file_path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(columns)
+        for rows in batches:
+            writer.writerows(rows)
+            total_records += len(rows)
+    return total_records
+
+def _write_ndjson(file_path: str, file_type: str, model, columns: List[str], batches: Iterator[List[tuple]]) -> int:
+    total_records = 0
+    with open(file_path, "w") as f:
+        for rows in batches:
+            f.write("".join(json.dumps(_json_record(row, columns)) + "\n" for row in rows))
+            total_records += len(rows)
+    return total_records
+
+# Delta export formats: file_type -> (file extension, writer)
+DELTA_EXPORT_TYPES: Dict[str, Tuple[str, Callable[..., int]]] = {
+    "csv": ("csv", _write_csv),
+    "ndjson": ("ndjson", _write_ndjson),
+    "parquet": ("parquet", _write_columnar),
+    "arrow": ("arrow", _write_columnar),
+}
+
+def delta_export_path(export_dir: str, entity: str, consumer: str, file_type: str) -> str:
+    """Unique file path for a consumer's delta export of an entity"""
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+    safe_consumer = re.sub(r"[^A-Za-z0-9_-]", "_", consumer)
+    return os.path.join(export_dir, f"{entity}_delta_{safe_consumer}_{timestamp}.{DELTA_EXPORT_TYPES[file_type][0]}")
+
+def export_entity_delta(db: Session, entity: str, consumer: str, file_path: str, file_type: str, exported_by: int) -> DataExport:
+    """
+    Export the rows of an EXPORT_ENTITIES entity whose updated_at is newer than the
+    consumer's last completed delta export of it (every row on the first run), and
+    record the export in data_exports with its new watermark.
+    Deleted rows leave no trace in updated_at, so consumers still need an occasional full export.
+    """
+    if entity not in EXPORT_ENTITIES:
+        raise ValueError(f"Unsupported export entity: {entity}")
+    if file_type not in DELTA_EXPORT_TYPES:
+        raise ValueError(f"Unsupported delta export type: {file_type}")
+    model, columns = EXPORT_ENTITIES[entity]
+    writer = DELTA_EXPORT_TYPES[file_type][1]
+
+    since = crud.get_export_watermark(db, consumer, entity)
+    # Rows stamped within the lag may belong to transactions that have not committed
+    # yet; stop short of them and leave them to a later run
+    watermark = db.execute(select(func.now())).scalar() - timedelta(seconds=settings.DELTA_EXPORT_WATERMARK_LAG_SECONDS)
+    if since is not None:
+        watermark = max(watermark, since)
+    conditions = [model.updated_at <= watermark]
+    if since is not None:
+        conditions.append(model.updated_at > since)
+
+    data_export = crud.create_delta_export(
+        db, file_path, file_type, entity, exported_by, consumer=consumer, since=since, watermark=watermark
+    )
+    try:
+        total_records = writer(file_path, file_type, model, columns, _export_batches(db, model, columns, conditions))
+    except Exception as e:
+        db.rollback()
+        crud.fail_data_export(db, data_export.id)
+        raise Exception(f"Failed to export {entity} delta: {str(e)}")
+
+    # Only a completed export advances the consumer's watermark
+    return crud.complete_data_export(db, data_export.id, total_records, os.path.getsize(file_path))
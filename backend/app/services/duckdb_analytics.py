@@ -0,0 +1,144 @@
+# app/services/duckdb_analytics.py
+# Optional analytics backend (ANALYTICS_BACKEND="duckdb"): attaches the SQLite
+# database read-only in an embedded DuckDB and runs the heavy aggregations
+# there, so reports do not contend with OLTP writes. Requires the `duckdb`
+# package; its sqlite extension is installed on first use.
+import os
+import threading
+from datetime import date
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy.engine import make_url
+from app.core.config import settings
+
+_connection = None
+_connection_lock = threading.Lock()
+
+def _get_cursor():
+    """Per-call cursor on a shared DuckDB connection (cursors are safe to use from different threads)"""
+    global _connection
+    with _connection_lock:
+        if _connection is None:
+            try:
+                import duckdb
+            except ImportError:
+                raise RuntimeError("ANALYTICS_BACKEND=duckdb requires the 'duckdb' package")
+            database_path = os.path.abspath(make_url(settings.SQLALCHEMY_DATABASE_URL).database)
+            connection = duckdb.connect()
+            connection.execute("INSTALL sqlite")
+            connection.execute("LOAD sqlite")
+            # ATTACH takes no bind parameters; quote the path as a SQL string literal
+            quoted_path = database_path.replace("'", "''")
+            connection.execute(f"ATTACH '{quoted_path}' AS academic (TYPE SQLITE, READ_ONLY)")
+            _connection = connection
+        return _connection.cursor()
+
+def _query(sql: str, params: Optional[List[Any]] = None) -> List[tuple]:
+    cursor = _get_cursor()
+    try:
+        return cursor.execute(sql, params or []).fetchall()
+    finally:
+        cursor.close()
+
+def _class_filter(column: str, class_name: Optional[str], params: List[Any]) -> str:
+    if not class_name:
+        return ""
+    params.append(class_name)
+    return f" AND {column} = ?"
+
+_NORMALIZED_SCORE = "CASE WHEN g.max_score > 0 THEN g.score * 100.0 / g.max_score ELSE g.score END"
+
+def attendance_daily_counts(start_date: date, end_date: date, class_name: str = None) -> List[Tuple[date, int, int, int, int, int]]:
+    """(date, present, absent, late, excused, total) per day with attendance"""
+    params: List[Any] = [start_date, end_date]
+    class_filter = _class_filter("s.grade_level", class_name, params)
+    return _query(f"""
+        SELECT a.date,
+               count(*) FILTER (WHERE lower(a.status) = 'present'),
+               count(*) FILTER (WHERE lower(a.status) = 'absent'),
+               count(*) FILTER (WHERE lower(a.status) = 'late'),
+               count(*) FILTER (WHERE lower(a.status) = 'excused'),
+               count(*)
+        FROM academic.attendance a
+        JOIN academic.students s ON s.id = a.student_id
+        WHERE a.date BETWEEN ? AND ?{class_filter}
+        GROUP BY a.date
+        ORDER BY a.date
+    """, params)
+
+def grade_statistics(subject: str = None, class_name: str = None, passing_percentage: float = 50.0,
+                     percentiles: Tuple[int, ...] = (25, 50, 75, 90)) -> List[Dict[str, Any]]:
+    """Per-subject mean/min/max, passing rate, percentiles and 10-point histogram of normalized scores"""
+    params: List[Any] = []
+    filters = ""
+    if subject:
+        filters += " AND g.subject = ?"
+        params.append(subject)
+    filters += _class_filter("s.grade_level", class_name, params)
+    params.append(passing_percentage)
+    quantiles = ", ".join(str(p / 100.0) for p in percentiles)
+    bucket_counts = ",\n".join(
+        f"               count(*) FILTER (WHERE least(greatest(floor(percent / 10), 0), 9) = {bucket})"
+        for bucket in range(10)
+    )
+    rows = _query(f"""
+        WITH scores AS (
+            SELECT g.subject, g.student_id, {_NORMALIZED_SCORE} AS percent
+            FROM academic.grades g
+            JOIN academic.students s ON s.id = g.student_id
+            WHERE g.score IS NOT NULL{filters}
+        )
+        SELECT subject,
+               avg(percent), max(percent), min(percent),
+               avg(CASE WHEN percent >= ? THEN 100.0 ELSE 0.0 END),
+               count(DISTINCT student_id),
+               quantile_cont(percent, [{quantiles}]),
+{bucket_counts}
+        FROM scores
+        GROUP BY subject
+        ORDER BY subject
+    """, params)
+    results = []
+    for subject_name, mean, highest, lowest, passing_rate, students, quantile_values, *histogram in rows:
+        results.append({
+            "subject": subject_name,
+            "average_score": mean,
+            "highest_score": highest,
+            "lowest_score": lowest,
+            "passing_rate": passing_rate,
+            "total_students": students,
+            "percentiles": {f"p{p}": value for p, value in zip(percentiles, quantile_values)},
+            "histogram": histogram
+        })
+    return results
+
+def year_over_year(class_name: str = None) -> List[Tuple[int, Optional[float], int, Optional[float], int]]:
+    """(year, attendance rate, attendance records, average grade, assessments) per calendar year"""
+    attendance_params: List[Any] = []
+    attendance_filter = _class_filter("s.grade_level", class_name, attendance_params)
+    grade_params: List[Any] = []
+    grade_filter = _class_filter("s.grade_level", class_name, grade_params)
+    return _query(f"""
+        WITH attendance_by_year AS (
+            SELECT year(a.date) AS year,
+                   count(*) FILTER (WHERE lower(a.status) IN ('present', 'late')) * 100.0 / count(*) AS attendance_rate,
+                   count(*) AS attendance_records
+            FROM academic.attendance a
+            JOIN academic.students s ON s.id = a.student_id
+            WHERE TRUE{attendance_filter}
+            GROUP BY 1
+        ), grades_by_year AS (
+            SELECT year(g.date_assigned) AS year,
+                   avg({_NORMALIZED_SCORE}) AS average_grade,
+                   count(*) AS assessments
+            FROM academic.grades g
+            JOIN academic.students s ON s.id = g.student_id
+            WHERE g.score IS NOT NULL{grade_filter}
+            GROUP BY 1
+        )
+        SELECT coalesce(a.year, g.year) AS year,
+               a.attendance_rate, coalesce(a.attendance_records, 0),
+               g.average_grade, coalesce(g.assessments, 0)
+        FROM attendance_by_year a
+        FULL OUTER JOIN grades_by_year g ON g.year = a.year
+        ORDER BY year
+    """, attendance_params + grade_params)
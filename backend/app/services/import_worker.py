@@ -0,0 +1,92 @@
+# app/services/import_worker.py
+# Runs uploaded file imports in a background thread pool. The data_imports table is
+# the queue: rows start "pending", a worker claims one by moving it to "processing",
+# updates its counts after every chunk, and finishes it as "completed" or "failed".
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Dict
+from app import crud, schemas
+from app.core.config import settings
+from app.database import SessionLocal
+from app.services import data_import_export
+
+logger = logging.getLogger(__name__)
+
+# Importers by DataImport.import_type
+IMPORTERS = {
+    "students": data_import_export.import_students_from_file,
+    "teachers": data_import_export.import_teachers_from_file,
+    "parents": data_import_export.import_parents_from_file,
+    "attendance": data_import_export.import_attendance_from_file,
+    "grades": data_import_export.import_grades_from_file,
+}
+
+_executor = ThreadPoolExecutor(max_workers=settings.IMPORT_WORKER_THREADS, thread_name_prefix="import-worker")
+
+def enqueue_import(data_import_id: int) -> None:
+    """Schedule a pending import for processing"""
+    _executor.submit(_run_import, data_import_id)
+
+def resume_pending_imports() -> int:
+    """Re-enqueue imports left pending by a previous process; returns how many"""
+    db = SessionLocal()
+    try:
+        data_import_ids = crud.get_pending_data_import_ids(db)
+    finally:
+        db.close()
+    for data_import_id in data_import_ids:
+        enqueue_import(data_import_id)
+    return len(data_import_ids)
+
+def _progress_update(result: Dict[str, Any], **fields) -> schemas.DataImportUpdate:
+    return schemas.DataImportUpdate(
+        total_records=result["total_records"],
+        successful_records=result["successful_records"],
+        failed_records=result["failed_records"],
+        error_log="\n".join(result["errors"]) or None,
+        **fields
+    )
+
+def _is_upload(file_path: str) -> bool:
+    """Whether file_path is a file saved under IMPORT_UPLOAD_DIR, the only files the worker touches"""
+    upload_dir = os.path.realpath(settings.IMPORT_UPLOAD_DIR)
+    resolved = os.path.realpath(file_path)
+    return os.path.commonpath([resolved, upload_dir]) == upload_dir and os.path.isfile(resolved)
+
+def _run_import(data_import_id: int) -> None:
+    # Each job uses its own session; it outlives the request that enqueued it
+    db = SessionLocal()
+    try:
+        data_import = crud.claim_data_import(db, data_import_id)
+        if data_import is None:
+            return
+        file_path = data_import.file_path
+        try:
+            if not file_path or not _is_upload(file_path):
+                raise ValueError("Import file is not a queued upload")
+            importer = IMPORTERS.get(data_import.import_type)
+            if importer is None:
+                raise ValueError(f"Unsupported import type: {data_import.import_type}")
+            result = importer(
+                file_path, db,
+                mode=data_import.mode or "insert",
+                imported_by=data_import.imported_by,
+                on_progress=lambda progress: crud.update_data_import(db, data_import_id, _progress_update(progress))
+            )
+        except Exception as e:
+            logger.exception("Import %s failed", data_import_id)
+            db.rollback()
+            crud.update_data_import(db, data_import_id, schemas.DataImportUpdate(
+                status="failed", error_log=str(e), completed_at=datetime.now()
+            ))
+            return
+        crud.update_data_import(db, data_import_id, _progress_update(
+            result, status="completed", completed_at=datetime.now()
+        ))
+        # The upload is only needed until the import has run
+        if os.path.exists(file_path):
+            os.remove(file_path)
+    finally:
+        db.close()
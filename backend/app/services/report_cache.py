@@ -0,0 +1,131 @@
+# app/services/report_cache.py
+# Content-addressed store of rendered report files. A file is keyed by a hash of
+# the template, parameters and output format plus the data version of every table
+# the report reads, as read from the database (see reports.data_versions), so writes
+# made by any process change the key. Data change hooks in this process also drop
+# affected files early and stop a render that raced a write from being stored.
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from app.core.config import settings
+from app.core.events import on_data_change
+
+logger = logging.getLogger(__name__)
+
+class ReportStore:
+    """
+    Rendered report files under `directory`, evicted least recently used first
+    once they exceed `max_bytes`. The index lives in memory, so files left by a
+    previous process are swept on first use; entries also expire after
+    `ttl_seconds`.
+    """
+    def __init__(self, directory: str, max_bytes: int, ttl_seconds: Optional[float] = None):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        # key -> (stored_at, path, size, tables)
+        self._entries: "OrderedDict[str, Tuple[float, str, int, Tuple[str, ...]]]" = OrderedDict()
+        # Bumped by invalidate(); only compared within one render, never part of a key
+        self._generations: Dict[str, int] = {}
+        self._total_bytes = 0
+        self._swept = False
+        self._lock = threading.Lock()
+
+    def generations(self, tables: Iterable[str]) -> Tuple[int, ...]:
+        with self._lock:
+            return tuple(self._generations.get(table, 0) for table in tables)
+
+    @staticmethod
+    def make_key(parts: Dict[str, Any], data_versions: Dict[str, Any]) -> str:
+        """Key for a report built from `parts` over tables at `data_versions`"""
+        payload = json.dumps({"parts": parts, "data_versions": data_versions}, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def fetch(self, key: str, target_path: str) -> bool:
+        """Place the stored file for `key` at `target_path`; False on a miss"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False
+            stored_at, path, size, tables = entry
+            if self.ttl_seconds is not None and time.monotonic() - stored_at > self.ttl_seconds:
+                self._remove(key)
+                return False
+            self._entries.move_to_end(key)
+            try:
+                _link_or_copy(path, target_path)
+            except FileNotFoundError:
+                self._remove(key)
+                return False
+            return True
+
+    def add(self, key: str, generations: Tuple[int, ...], tables: Tuple[str, ...], source_path: str) -> None:
+        """Store a copy of `source_path` under `key`, unless this process changed its data while it was rendered"""
+        with self._lock:
+            if tuple(self._generations.get(table, 0) for table in tables) != generations or key in self._entries:
+                return
+            os.makedirs(self.directory, exist_ok=True)
+            if not self._swept:
+                self._sweep()
+            path = os.path.join(self.directory, key + os.path.splitext(source_path)[1])
+            _link_or_copy(source_path, path)
+            size = os.path.getsize(path)
+            self._entries[key] = (time.monotonic(), path, size, tables)
+            self._total_bytes += size
+            while self._total_bytes > self.max_bytes and self._entries:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate(self, table_name: str) -> None:
+        """Drop the files that read `table_name`; their keys can no longer be hit"""
+        with self._lock:
+            self._generations[table_name] = self._generations.get(table_name, 0) + 1
+            for key in [key for key, entry in self._entries.items() if table_name in entry[3]]:
+                self._remove(key)
+
+    def _remove(self, key: str) -> None:
+        stored_at, path, size, tables = self._entries.pop(key)
+        self._total_bytes -= size
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    def _sweep(self) -> None:
+        # Files from an earlier process are not in the index and can never be hit
+        indexed = {entry[1] for entry in self._entries.values()}
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            if path not in indexed and os.path.isfile(path):
+                try:
+                    os.remove(path)
+                except OSError:
+                    logger.warning("Could not remove stale cached report %s", path)
+        self._swept = True
+
+def _link_or_copy(source_path: str, target_path: str) -> None:
+    """Hard-link when possible (no extra disk space, survives eviction), else copy"""
+    if os.path.exists(target_path):
+        os.remove(target_path)
+    try:
+        os.link(source_path, target_path)
+    except OSError:
+        if not os.path.exists(source_path):
+            raise FileNotFoundError(source_path)
+        shutil.copyfile(source_path, target_path)
+
+# Shared process-wide store
+report_store = ReportStore(
+    settings.REPORT_CACHE_DIR,
+    max_bytes=settings.REPORT_CACHE_MAX_BYTES,
+    ttl_seconds=settings.REPORT_CACHE_TTL_SECONDS
+)
+
+@on_data_change
+def _invalidate_reports(table_name: str, grade_levels: List[str]) -> None:
+    report_store.invalidate(table_name)
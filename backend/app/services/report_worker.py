@@ -0,0 +1,47 @@
+# app/services/report_worker.py
+# Renders GeneratedReport rows in a background thread pool. The generated_reports
+# table is the queue: rows start "pending", a worker claims one by moving it to
+# "processing", and finishes it as "completed" (file_path/file_size set) or "failed".
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from app import crud
+from app.core.config import settings
+from app.database import SessionLocal
+from app.services import reports
+
+logger = logging.getLogger(__name__)
+
+_executor = ThreadPoolExecutor(max_workers=settings.REPORT_WORKER_THREADS, thread_name_prefix="report-worker")
+
+def enqueue_report(report_id: int) -> None:
+    """Schedule a pending report for rendering"""
+    _executor.submit(_run_report, report_id)
+
+def resume_pending_reports() -> int:
+    """Re-enqueue reports left pending by a previous process; returns how many"""
+    db = SessionLocal()
+    try:
+        report_ids = crud.get_pending_generated_report_ids(db)
+    finally:
+        db.close()
+    for report_id in report_ids:
+        enqueue_report(report_id)
+    return len(report_ids)
+
+def _run_report(report_id: int) -> None:
+    # Each job uses its own session; it outlives the request that enqueued it
+    db = SessionLocal()
+    try:
+        report = crud.claim_generated_report(db, report_id)
+        if report is None:
+            return
+        try:
+            file_path, file_size = reports.render_report(db, report)
+        except Exception as e:
+            logger.exception("Report %s failed", report_id)
+            db.rollback()
+            crud.fail_generated_report(db, report_id, error=str(e))
+            return
+        crud.complete_generated_report(db, report_id, file_path=file_path, file_size=file_size)
+    finally:
+        db.close()
@@ -0,0 +1,255 @@
+# app/services/reports.py
+import csv
+import hashlib
+import json
+import os
+from datetime import date, timedelta
+from typing import Any, Callable, Dict, List, Tuple
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from app import crud
+from app.core.config import settings
+from app.models.analytics import AtRiskStudentFlag, GeneratedReport
+from app.models.attendance import Attendance, AttendanceDailyRollup
+from app.models.finance import Expense, FeePayment, FeeStructure
+from app.models.grade import Grade
+from app.models.student import Student
+from app.services import analytics
+from app.services.report_cache import report_store
+
+# --- Report data, by ReportTemplate.template_type ---
+def _date_param(parameters: Dict[str, Any], name: str, default: date) -> date:
+    value = parameters.get(name)
+    return date.fromisoformat(value) if value else default
+
+def _date_range(parameters: Dict[str, Any]) -> Tuple[date, date]:
+    """start_date/end_date parameters; defaults to the last 30 days"""
+    end_date = _date_param(parameters, "end_date", date.today())
+    start_date = _date_param(parameters, "start_date", end_date - timedelta(days=30))
+    return start_date, end_date
+
+def _resolve_parameters(template_type: str, parameters: Dict[str, Any]) -> Dict[str, Any]:
+    """Fill in defaulted dates, so "last 30 days" reports from different days get different cache keys"""
+    if template_type not in DATE_RANGE_TEMPLATES:
+        return dict(parameters)
+    start_date, end_date = _date_range(parameters)
+    return {**parameters, "start_date": start_date.isoformat(), "end_date": end_date.isoformat()}
+
+def _flatten(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Spread dict-valued fields (percentiles, histogram) into their own columns"""
+    flat = {}
+    for key, value in row.items():
+        if isinstance(value, dict):
+            flat.update({f"{key}_{name}": item for name, item in value.items()})
+        else:
+            flat[key] = value
+    return flat
+
+def _student_rows(db: Session, parameters: Dict[str, Any]) -> List[Dict[str, Any]]:
+    summaries = analytics.get_student_performance_summary(
+        db, grade_level=parameters.get("class_name"), limit=None
+    )
+    return [summary.model_dump() for summary in summaries]
+
+def _class_rows(db: Session, parameters: Dict[str, Any]) -> List[Dict[str, Any]]:
+    summaries = analytics.get_class_performance_summary(db, class_name=parameters.get("class_name"))
+    return [summary.model_dump() for summary in summaries]
+
+def _attendance_rows(db: Session, parameters: Dict[str, Any]) -> List[Dict[str, Any]]:
+    start_date, end_date = _date_range(parameters)
+    buckets = analytics.get_attendance_trend(
+        db, start_date, end_date,
+        granularity=parameters.get("granularity", "day"),
+        class_name=parameters.get("class_name")
+    )
+    return [bucket.model_dump() for bucket in buckets]
+
+def _grade_rows(db: Session, parameters: Dict[str, Any]) -> List[Dict[str, Any]]:
+    subjects = analytics.get_grade_analytics(
+        db, subject=parameters.get("subject"), class_name=parameters.get("class_name")
+    )
+    return [_flatten(subject.model_dump()) for subject in subjects]
+
+def _financial_rows(db: Session, parameters: Dict[str, Any]) -> List[Dict[str, Any]]:
+    start_date, end_date = _date_range(parameters)
+    summary = analytics.get_financial_summary(db, start_date, end_date)
+    rows = [
+        {"type": "revenue", "category": category, "amount": amount}
+        for category, amount in summary.revenue_by_category.items()
+    ]
+    rows.extend(
+        {"type": "expense", "category": category, "amount": amount}
+        for category, amount in summary.expenses_by_category.items()
+    )
+    rows.append({"type": "net_income", "category": None, "amount": summary.net_income})
+    return rows
+
+def _at_risk_rows(db: Session, parameters: Dict[str, Any]) -> List[Dict[str, Any]]:
+    flags = crud.get_at_risk_flags(db, grade_level=parameters.get("class_name"), limit=None)
+    return [
+        {
+            "student_id": flag.student_id,
+            "grade_level": flag.grade_level,
+            "attendance_rate": flag.attendance_rate,
+            "grade_slope": flag.grade_slope,
+            "reasons": flag.reasons,
+            "computed_at": flag.computed_at
+        }
+        for flag in flags
+    ]
+
+# Tables each template type reads; changes to any of them invalidate cached files
+REPORT_SOURCE_TABLES: Dict[str, Tuple[str, ...]] = {
+    "student": ("students", "grades", "attendance"),
+    "class": ("students", "grades", "attendance"),
+    "attendance": ("students", "attendance", "attendance_daily_rollup"),
+    "grade": ("students", "grades"),
+    "financial": ("fee_structures", "fee_payments", "expenses"),
+    "at_risk": ("at_risk_student_flags",),
+}
+DATE_RANGE_TEMPLATES = ("attendance", "financial")
+
+# The column each source table stamps on every insert and update
+SOURCE_TABLE_STAMPS = {
+    "students": Student.updated_at,
+    "grades": Grade.updated_at,
+    "attendance": Attendance.updated_at,
+    "fee_structures": FeeStructure.updated_at,
+    "fee_payments": FeePayment.updated_at,
+    "expenses": Expense.updated_at,
+    "at_risk_student_flags": AtRiskStudentFlag.computed_at,
+}
+
+def data_versions(db: Session, tables: Tuple[str, ...]) -> Dict[str, Any]:
+    """
+    Version of each table's data, read from the database so that writes by other
+    processes (the at-risk batch, rollup rebuilds, other API workers) count too:
+    row count and latest stamp, which deletes, inserts and updates all move. The
+    attendance rollup has no stamp and is small, so it is versioned by its contents.
+    """
+    versions = {}
+    for table in tables:
+        if table == "attendance_daily_rollup":
+            rows = db.query(
+                AttendanceDailyRollup.date, AttendanceDailyRollup.grade_level,
+                AttendanceDailyRollup.status, AttendanceDailyRollup.count
+            ).order_by(AttendanceDailyRollup.date, AttendanceDailyRollup.grade_level, AttendanceDailyRollup.status).all()
+            versions[table] = hashlib.sha256(repr([tuple(row) for row in rows]).encode()).hexdigest()
+        else:
+            stamp = SOURCE_TABLE_STAMPS[table]
+            versions[table] = tuple(db.query(func.count(), func.max(stamp)).select_from(stamp.class_).one())
+    return versions
+
+# Keyed by lower-cased template_type, with spaces as underscores ("At Risk" -> "at_risk")
+REPORT_BUILDERS: Dict[str, Callable[[Session, Dict[str, Any]], List[Dict[str, Any]]]] = {
+    "student": _student_rows,
+    "class": _class_rows,
+    "attendance": _attendance_rows,
+    "grade": _grade_rows,
+    "financial": _financial_rows,
+    "at_risk": _at_risk_rows,
+}
+
+# --- Output formats, by GeneratedReport.report_type ---
+def _columns(rows: List[Dict[str, Any]]) -> List[str]:
+    columns = []
+    for row in rows:
+        columns.extend(key for key in row if key not in columns)
+    return columns
+
+def _write_csv(file_path: str, title: str, rows: List[Dict[str, Any]]) -> None:
+    with open(file_path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=_columns(rows))
+        writer.writeheader()
+        writer.writerows(rows)
+
+def _write_json(file_path: str, title: str, rows: List[Dict[str, Any]]) -> None:
+    with open(file_path, "w") as f:
+        json.dump({"title": title, "rows": rows}, f, indent=2, default=str)
+
+def _write_excel(file_path: str, title: str, rows: List[Dict[str, Any]]) -> None:
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(title=title[:31] or "Report")
+    columns = _columns(rows)
+    sheet.append(columns)
+    for row in rows:
+        sheet.append([row.get(column) for column in columns])
+    workbook.save(file_path)
+
+def _write_pdf(file_path: str, title: str, rows: List[Dict[str, Any]]) -> None:
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import letter, landscape
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph
+
+    columns = _columns(rows)
+    data = [columns] + [["" if row.get(column) is None else str(row.get(column)) for column in columns] for row in rows]
+    table = Table(data, repeatRows=1)
+    table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.black)
+    ]))
+    doc = SimpleDocTemplate(file_path, pagesize=landscape(letter))
+    doc.build([Paragraph(title, getSampleStyleSheet()['Title']), table])
+
+# Keyed by lower-cased report_type: (file extension, writer)
+REPORT_WRITERS: Dict[str, Tuple[str, Callable[[str, str, List[Dict[str, Any]]], None]]] = {
+    "csv": ("csv", _write_csv),
+    "json": ("json", _write_json),
+    "excel": ("xlsx", _write_excel),
+    "xlsx": ("xlsx", _write_excel),
+    "pdf": ("pdf", _write_pdf),
+}
+
+def render_report(db: Session, report: GeneratedReport) -> Tuple[str, int]:
+    """
+    Build the rows for the report's template and write them in the report's format,
+    or reuse a cached file for the same template, parameters and data version.
+    Returns (file_path, file_size).
+    """
+    template_type = report.template.template_type.lower().replace(" ", "_")
+    report_type = report.report_type.lower()
+    if template_type not in REPORT_BUILDERS:
+        raise ValueError(f"Unsupported report template type: {report.template.template_type}")
+    if report_type not in REPORT_WRITERS:
+        raise ValueError(f"Unsupported report type: {report.report_type}")
+
+    parameters = _resolve_parameters(template_type, report.parameters or {})
+    extension, writer = REPORT_WRITERS[report_type]
+    os.makedirs(settings.REPORTS_DIR, exist_ok=True)
+    file_path = os.path.join(settings.REPORTS_DIR, f"report_{report.id}.{extension}")
+
+    # Reuse the file from an identical earlier run if the data it read has not changed
+    tables = REPORT_SOURCE_TABLES[template_type]
+    generations = report_store.generations(tables)
+    versions = data_versions(db, tables)
+    cache_key = report_store.make_key(
+        {
+            "template_id": report.template_id,
+            "template_type": template_type,
+            "report_name": report.report_name,
+            "report_type": extension,
+            "parameters": parameters
+        },
+        versions
+    )
+    if report_store.fetch(cache_key, file_path):
+        return file_path, os.path.getsize(file_path)
+
+    rows = REPORT_BUILDERS[template_type](db, parameters)
+    # Write next to the target and rename, so a half-written file is never visible
+    temp_path = f"{file_path}.tmp"
+    try:
+        writer(temp_path, report.report_name, rows)
+        os.replace(temp_path, file_path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+    # A write that landed during rendering may or may not be in the file; do not cache it
+    if data_versions(db, tables) == versions:
+        report_store.add(cache_key, generations, tables, file_path)
+    return file_path, os.path.getsize(file_path)
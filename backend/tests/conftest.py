@@ -0,0 +1,49 @@
+# tests/conftest.py
+import os
+import sys
+import tempfile
+from datetime import date
+
+# Add the backend directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Point the application at a scratch database and scratch file directories;
+# settings are read when app.* is first imported
+_scratch_dir = tempfile.mkdtemp(prefix="academic-tests-")
+os.environ["SQLALCHEMY_DATABASE_URL"] = f"sqlite:///{os.path.join(_scratch_dir, 'test.db')}"
+os.environ["IMPORT_UPLOAD_DIR"] = os.path.join(_scratch_dir, "uploads")
+os.environ["REPORTS_DIR"] = os.path.join(_scratch_dir, "reports")
+os.environ["REPORT_CACHE_DIR"] = os.path.join(_scratch_dir, "reports", "cache")
+
+import pytest
+from app.database import Base, SessionLocal, engine
+from app.migrations import upgrade_schema
+from app.models.student import Student
+from app.models.user import User
+
+@pytest.fixture
+def db():
+    """A session on an empty, fully upgraded application database"""
+    Base.metadata.drop_all(bind=engine)
+    upgrade_schema(engine)
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+def add_user(db, email: str, role: str = "admin") -> User:
+    db_user = User(email=email, hashed_password="not-a-hash", full_name=email.split("@")[0], role=role)
+    db.add(db_user)
+    db.commit()
+    return db_user
+
+def add_student(db, student_id: str, grade_level: str = "Grade 1", email: str = None) -> Student:
+    db_student = Student(
+        student_id=student_id, first_name="Test", last_name=student_id,
+        date_of_birth=date(2015, 1, 1), gender="F", admission_date=date(2021, 9, 1),
+        grade_level=grade_level, email=email
+    )
+    db.add(db_student)
+    db.commit()
+    return db_student
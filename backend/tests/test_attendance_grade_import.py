@@ -0,0 +1,68 @@
+# tests/test_attendance_grade_import.py
+from datetime import date
+
+from app.models.attendance import Attendance, AttendanceDailyRollup
+from app.models.grade import Grade
+from app.models.staff import Staff
+from app.services.data_import_export import import_attendance_from_file, import_grades_from_file
+from conftest import add_student, add_user
+
+def _write_csv(tmp_path, name: str, text: str) -> str:
+    path = tmp_path / name
+    path.write_text(text)
+    return str(path)
+
+def test_attendance_import_skips_existing_unknown_and_repeated_rows(db, tmp_path):
+    teacher = add_user(db, "teacher@example.com", role="teacher")
+    first = add_student(db, "S001", grade_level="Grade 1")
+    add_student(db, "S002", grade_level="Grade 2")
+    db.add(Attendance(student_id=first.id, date=date(2024, 3, 1), status="Present", recorded_by=teacher.id))
+    db.commit()
+    file_path = _write_csv(tmp_path, "attendance.csv", (
+        "student_id,date,status\n"
+        "S001,2024-03-01,absent\n"   # already recorded
+        "S404,2024-03-02,present\n"  # unknown student
+        "S404,2024-03-02,present\n"  # rejected rows claim nothing
+        "S001,2024-03-02,late\n"
+        "S001,2024-03-02,present\n"  # repeat of the row above
+        "S002,2024-03-02,PRESENT\n"
+        "S002,2024-03-03,sick\n"     # invalid status
+    ))
+    
+    result = import_attendance_from_file(file_path, db, imported_by=teacher.id)
+    
+    assert result["successful_records"] == 2
+    assert result["errors"] == [
+        "Row 1: attendance is already recorded for this student and date",
+        "Row 2: student_id does not exist",
+        "Row 3: student_id does not exist",
+        "Row 5: attendance for this student and date is duplicated in the file",
+        "Row 7: status must be one of Present, Absent, Late, Excused",
+    ]
+    rollup = {
+        (row.grade_level, row.status): row.count
+        for row in db.query(AttendanceDailyRollup).filter(AttendanceDailyRollup.date == date(2024, 3, 2))
+    }
+    assert rollup == {("Grade 1", "late"): 1, ("Grade 2", "present"): 1}
+
+def test_grade_import_skips_existing_and_repeated_grades(db, tmp_path):
+    teacher = add_user(db, "teacher@example.com", role="teacher")
+    db.add(Staff(user_id=teacher.id, employee_id="E001", department="Math", position="Teacher", hire_date=date(2020, 1, 1)))
+    db.commit()
+    add_student(db, "S001")
+    file_path = _write_csv(tmp_path, "grades.csv", (
+        "student_id,subject,assessment_type,assessment_name,date_assigned,score,employee_id\n"
+        "S001,Math,Quiz,Quiz 1,2024-03-01,8,E999\n"  # unknown teacher
+        "S001,Math,Quiz,Quiz 1,2024-03-01,9,E001\n"
+        "S001,Math,Quiz,Quiz 1,2024-03-01,7,E001\n"  # repeat of the row above
+        "S001,Math,Quiz,Quiz 2,2024-03-08,9.5,E001\n"
+    ))
+    
+    result = import_grades_from_file(file_path, db)
+    
+    assert result["successful_records"] == 2
+    assert result["errors"] == [
+        "Row 1: employee_id does not exist",
+        "Row 3: grade is duplicated in the file",
+    ]
+    assert sorted(db.query(Grade.assessment_name, Grade.grade_value)) == [("Quiz 1", "9"), ("Quiz 2", "9.5")]
@@ -0,0 +1,82 @@
+# tests/test_attendance_rollup.py
+from datetime import date
+
+from sqlalchemy import func
+
+from app import crud, schemas
+from app.models.attendance import Attendance, AttendanceDailyRollup
+from app.models.student import Student
+from app.services.data_import_export import import_attendance_from_file, import_students_from_file
+from conftest import add_student, add_user
+
+def _rollup_counts(db):
+    """Non-zero rollup counts by (date, grade_level, status)"""
+    return {
+        (row.date, row.grade_level, row.status): row.count
+        for row in db.query(AttendanceDailyRollup) if row.count
+    }
+
+def _raw_counts(db):
+    """The same counts aggregated from the attendance table"""
+    status = func.lower(Attendance.status)
+    rows = db.query(Attendance.date, Student.grade_level, status, func.count(Attendance.id)).join(
+        Student, Student.id == Attendance.student_id
+    ).group_by(Attendance.date, Student.grade_level, status).all()
+    return {(day, grade_level, status): count for day, grade_level, status, count in rows}
+
+def _student_update(db_student: Student, **changes) -> schemas.StudentUpdate:
+    values = {field: getattr(db_student, field) for field in schemas.StudentUpdate.model_fields}
+    return schemas.StudentUpdate(**{**values, **changes})
+
+def test_rollup_follows_attendance_and_student_writes(db):
+    teacher = add_user(db, "teacher@example.com", role="teacher")
+    first = add_student(db, "S001", grade_level="Grade 1", email="s1@x.com")
+    second = add_student(db, "S002", grade_level="Grade 2", email="s2@x.com")
+    
+    records = [
+        crud.create_attendance(db, schemas.AttendanceCreate(student_id=db_student.id, date=date(2024, 3, day), status=status), teacher.id)
+        for db_student in (first, second)
+        for day, status in ((1, "Present"), (2, "Absent"), (3, "late"))
+    ]
+    assert _rollup_counts(db) == _raw_counts(db)
+    
+    # Status and date changes move the count between rollup rows
+    crud.update_attendance(db, records[0].id, schemas.AttendanceUpdate(student_id=first.id, date=date(2024, 3, 1), status="Excused"))
+    crud.update_attendance(db, records[1].id, schemas.AttendanceUpdate(student_id=first.id, date=date(2024, 3, 4), status="Absent"))
+    assert _rollup_counts(db) == _raw_counts(db)
+    
+    crud.delete_attendance(db, records[2].id)
+    assert _rollup_counts(db) == _raw_counts(db)
+    
+    # A regraded student's history is re-filed under the new grade level
+    crud.update_student(db, second.id, _student_update(second, grade_level="Grade 1"))
+    assert _rollup_counts(db) == _raw_counts(db)
+    assert {grade_level for _, grade_level, _ in _rollup_counts(db)} == {"Grade 1"}
+
+def test_rollup_follows_imports(db, tmp_path):
+    teacher = add_user(db, "teacher@example.com", role="teacher")
+    add_student(db, "S001", grade_level="Grade 1", email="s1@x.com")
+    add_student(db, "S002", grade_level="Grade 2", email="s2@x.com")
+    attendance_path = tmp_path / "attendance.csv"
+    attendance_path.write_text(
+        "student_id,date,status\n"
+        + "".join(f"S00{i % 2 + 1},2024-03-{day:02d},{('present', 'absent', 'late')[day % 3]}\n"
+                  for i in range(2) for day in range(1, 21))
+    )
+    import_attendance_from_file(str(attendance_path), db, imported_by=teacher.id)
+    assert _rollup_counts(db) == _raw_counts(db)
+    
+    # Upserting a student into another grade level re-files their attendance
+    students_path = tmp_path / "students.csv"
+    students_path.write_text(
+        "student_id,first_name,last_name,date_of_birth,gender,email,admission_date,grade_level\n"
+        "S002,Test,S002,2015-01-01,F,s2@x.com,2021-09-01,Grade 3\n"
+    )
+    result = import_students_from_file(str(students_path), db, mode="upsert")
+    assert result["successful_records"] == 1
+    assert _rollup_counts(db) == _raw_counts(db)
+    
+    # A full rebuild agrees with the incrementally maintained rollup
+    before = _rollup_counts(db)
+    crud.rebuild_attendance_daily_rollup(db)
+    assert _rollup_counts(db) == before
@@ -0,0 +1,63 @@
+# tests/test_delta_export.py
+import pytest
+from sqlalchemy import func, update
+
+from app.core.config import settings
+from app.models.student import Student
+from app.services.data_import_export import export_entity_delta
+from conftest import add_student, add_user
+
+@pytest.fixture
+def lag(monkeypatch):
+    monkeypatch.setattr(settings, "DELTA_EXPORT_WATERMARK_LAG_SECONDS", 300)
+
+def _stamp(db, student_id: str, seconds_ago: int) -> None:
+    # updated_at is stamped by the database clock (UTC on SQLite)
+    db.execute(update(Student).where(Student.student_id == student_id).values(
+        updated_at=func.datetime("now", f"-{seconds_ago} seconds")
+    ))
+    db.commit()
+
+def _export(db, tmp_path, consumer: str, exported_by: int):
+    file_path = tmp_path / f"{consumer}-{len(list(tmp_path.iterdir()))}.csv"
+    data_export = export_entity_delta(db, "students", consumer, str(file_path), "csv", exported_by)
+    rows = file_path.read_text().splitlines()[1:]
+    return data_export, sorted(row.split(",")[1] for row in rows)
+
+def test_delta_export_holds_back_recent_rows_until_they_age_past_the_lag(db, tmp_path, lag, monkeypatch):
+    admin = add_user(db, "admin@example.com")
+    for student_id, seconds_ago in (("S001", 3600), ("S002", 1800), ("S003", 10)):
+        add_student(db, student_id, email=f"{student_id}@x.com")
+        _stamp(db, student_id, seconds_ago)
+    
+    first, exported = _export(db, tmp_path, "warehouse", admin.id)
+    assert exported == ["S001", "S002"]
+    assert (first.status, first.total_records, first.since) == ("completed", 2, None)
+    
+    # S003 may still have been uncommitted at the first watermark; it follows once the lag has passed
+    monkeypatch.setattr(settings, "DELTA_EXPORT_WATERMARK_LAG_SECONDS", 0)
+    second, exported = _export(db, tmp_path, "warehouse", admin.id)
+    assert exported == ["S003"]
+    assert second.since == first.watermark
+    
+    # Nothing new since
+    _, exported = _export(db, tmp_path, "warehouse", admin.id)
+    assert exported == []
+    
+    # Each consumer has its own watermark
+    _, exported = _export(db, tmp_path, "auditor", admin.id)
+    assert exported == ["S001", "S002", "S003"]
+
+def test_watermark_never_moves_backwards(db, tmp_path, monkeypatch):
+    admin = add_user(db, "admin@example.com")
+    add_student(db, "S001", email="s1@x.com")
+    _stamp(db, "S001", 60)
+    monkeypatch.setattr(settings, "DELTA_EXPORT_WATERMARK_LAG_SECONDS", 0)
+    first, exported = _export(db, tmp_path, "warehouse", admin.id)
+    assert exported == ["S001"]
+    
+    # A longer lag configured later does not re-export rows already sent
+    monkeypatch.setattr(settings, "DELTA_EXPORT_WATERMARK_LAG_SECONDS", 3600)
+    second, exported = _export(db, tmp_path, "warehouse", admin.id)
+    assert exported == []
+    assert second.watermark == first.watermark
@@ -0,0 +1,82 @@
+# tests/test_import_worker.py
+import os
+
+from app import crud, schemas
+from app.core.config import settings
+from app.models.student import Student
+from app.services import import_worker
+from conftest import add_user
+
+STUDENT_HEADER = "student_id,first_name,last_name,date_of_birth,gender,email,admission_date,grade_level\n"
+
+def _add_import(db, imported_by: int, file_path: str = "", import_type: str = "students"):
+    return crud.create_data_import(db, schemas.DataImportCreate(
+        file_name="students.csv", file_size=0, file_type="CSV",
+        import_type=import_type, imported_by=imported_by
+    ), file_path=file_path)
+
+def test_bookkeeping_records_are_never_queued(db, tmp_path):
+    admin = add_user(db, "admin@example.com")
+    record = _add_import(db, admin.id)
+    
+    assert record.status == "pending"
+    assert crud.get_pending_data_import_ids(db) == []
+    assert crud.claim_data_import(db, record.id) is None
+    db.refresh(record)
+    assert record.status == "pending"
+
+def _write_upload(name: str, text: str) -> str:
+    os.makedirs(settings.IMPORT_UPLOAD_DIR, exist_ok=True)
+    file_path = os.path.join(settings.IMPORT_UPLOAD_DIR, name)
+    with open(file_path, "w") as f:
+        f.write(text)
+    return file_path
+
+def test_queued_upload_runs_to_completion(db):
+    admin = add_user(db, "admin@example.com")
+    file_path = _write_upload("students.csv", STUDENT_HEADER + (
+        "Q001,Ada,Lovelace,2015-05-01,F,q1@x.com,2021-09-01,Grade 1\n"
+        "Q002,Alan,Turing,not a date,M,q2@x.com,2021-09-01,Grade 1\n"
+    ))
+    record = _add_import(db, admin.id, file_path)
+    assert crud.get_pending_data_import_ids(db) == [record.id]
+    
+    import_worker._run_import(record.id)
+    
+    db.refresh(record)
+    assert record.status == "completed"
+    assert (record.total_records, record.successful_records, record.failed_records) == (2, 1, 1)
+    assert record.error_log == "Row 2: date_of_birth is not a valid date"
+    assert record.started_at is not None and record.completed_at is not None
+    assert not os.path.exists(file_path)
+    assert db.query(Student.student_id).all() == [("Q001",)]
+    
+    # A finished import is not claimed again
+    assert crud.get_pending_data_import_ids(db) == []
+    assert crud.claim_data_import(db, record.id) is None
+
+def test_failing_import_is_marked_failed(db):
+    admin = add_user(db, "admin@example.com")
+    file_path = _write_upload("students.csv", "student_id,first_name\nQ001,Ada\n")
+    record = _add_import(db, admin.id, file_path)
+    
+    import_worker._run_import(record.id)
+    
+    db.refresh(record)
+    assert record.status == "failed"
+    assert "Missing required columns" in record.error_log
+    assert record.completed_at is not None
+
+def test_file_outside_uploads_is_neither_read_nor_removed(db, tmp_path):
+    admin = add_user(db, "admin@example.com")
+    outside = tmp_path / "students.csv"
+    outside.write_text(STUDENT_HEADER + "Q001,Ada,Lovelace,2015-05-01,F,q1@x.com,2021-09-01,Grade 1\n")
+    record = _add_import(db, admin.id, str(outside))
+    
+    import_worker._run_import(record.id)
+    
+    db.refresh(record)
+    assert record.status == "failed"
+    assert record.error_log == "Import file is not a queued upload"
+    assert outside.exists()
+    assert db.query(Student).count() == 0
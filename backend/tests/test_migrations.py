@@ -0,0 +1,68 @@
+# tests/test_migrations.py
+from datetime import date
+
+from sqlalchemy import create_engine, func
+from sqlalchemy.orm import Session
+
+from app.database import Base
+from app.migrations import upgrade_schema
+from app.models.attendance import Attendance, AttendanceDailyRollup
+from app.models.student import Student
+from app.services import analytics
+from conftest import add_student, add_user
+
+STATUSES = ["Present", "Absent", "Late", "Excused", "present"]
+
+def _raw_daily_counts(db, class_name=None):
+    query = db.query(
+        Attendance.date, func.lower(Attendance.status), func.count(Attendance.id)
+    ).join(Student, Student.id == Attendance.student_id)
+    if class_name:
+        query = query.filter(Student.grade_level == class_name)
+    counts = {}
+    for day, status, count in query.group_by(Attendance.date, func.lower(Attendance.status)):
+        counts.setdefault(day, {})[status] = count
+    return counts
+
+def _analytics_daily_counts(db, class_name=None):
+    return {
+        row.date: {
+            status: count for status, count in (
+                ("present", row.present), ("absent", row.absent), ("late", row.late), ("excused", row.excused)
+            ) if count
+        }
+        for row in analytics.get_attendance_analytics(db, date(2024, 1, 1), date(2024, 12, 31), class_name=class_name)
+    }
+
+def test_upgrade_backfills_attendance_rollup(tmp_path):
+    # A database from before the rollup table existed, with attendance already recorded
+    legacy_engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    Base.metadata.create_all(
+        bind=legacy_engine,
+        tables=[table for table in Base.metadata.sorted_tables if table.name != "attendance_daily_rollup"]
+    )
+    with Session(bind=legacy_engine) as db:
+        teacher = add_user(db, "teacher@example.com", role="teacher")
+        students = [add_student(db, f"S{i:03d}", grade_level=f"Grade {i % 3 + 1}") for i in range(9)]
+        for day in range(1, 11):
+            for i, db_student in enumerate(students):
+                db.add(Attendance(
+                    student_id=db_student.id, date=date(2024, 3, day),
+                    status=STATUSES[(i + day) % len(STATUSES)], recorded_by=teacher.id
+                ))
+        db.commit()
+    
+    upgrade_schema(legacy_engine)
+    
+    with Session(bind=legacy_engine) as db:
+        assert db.query(AttendanceDailyRollup).count() > 0
+        assert _analytics_daily_counts(db) == _raw_daily_counts(db)
+        assert _analytics_daily_counts(db, "Grade 2") == _raw_daily_counts(db, "Grade 2")
+    
+    # Upgrading again leaves the rollup alone
+    with Session(bind=legacy_engine) as db:
+        db.query(AttendanceDailyRollup).filter(AttendanceDailyRollup.date == date(2024, 3, 1)).delete()
+        db.commit()
+    upgrade_schema(legacy_engine)
+    with Session(bind=legacy_engine) as db:
+        assert db.query(AttendanceDailyRollup).filter(AttendanceDailyRollup.date == date(2024, 3, 1)).count() == 0
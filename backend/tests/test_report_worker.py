@@ -0,0 +1,97 @@
+# tests/test_report_worker.py
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine
+
+from app import crud, schemas
+from app.core.config import settings
+from app.models.analytics import AtRiskStudentFlag
+from app.services import report_worker, reports
+from app.services.report_cache import ReportStore
+from conftest import add_student, add_user
+
+@pytest.fixture
+def report_store(tmp_path, monkeypatch):
+    store = ReportStore(str(tmp_path / "cache"), max_bytes=10 * 1024 * 1024)
+    monkeypatch.setattr(reports, "report_store", store)
+    return store
+
+@pytest.fixture
+def builder_calls(monkeypatch):
+    """Template types whose rows were built (not served from the cache), in order"""
+    calls = []
+    for template_type, builder in list(reports.REPORT_BUILDERS.items()):
+        def counting_builder(db, parameters, template_type=template_type, builder=builder):
+            calls.append(template_type)
+            return builder(db, parameters)
+        monkeypatch.setitem(reports.REPORT_BUILDERS, template_type, counting_builder)
+    return calls
+
+def _add_report(db, template_type: str, generated_by: int):
+    template = crud.create_report_template(
+        db, schemas.ReportTemplateCreate(name=template_type, template_type=template_type), created_by=generated_by
+    )
+    return crud.create_generated_report(
+        db, schemas.GeneratedReportCreate(template_id=template.id, report_name="Report", report_type="csv"),
+        generated_by=generated_by
+    )
+
+def _run(db, report):
+    report_worker._run_report(report.id)
+    db.refresh(report)
+    return report
+
+def test_report_lifecycle(db, report_store):
+    admin = add_user(db, "admin@example.com")
+    report = _add_report(db, "at_risk", admin.id)
+    assert report.status == "pending"
+    assert crud.get_pending_generated_report_ids(db) == [report.id]
+    
+    report = _run(db, report)
+    
+    assert report.status == "completed"
+    assert report.file_path.startswith(settings.REPORTS_DIR)
+    assert report.file_size > 0 and report.error is None
+    assert crud.get_pending_generated_report_ids(db) == []
+    assert crud.claim_generated_report(db, report.id) is None
+
+def test_failing_report_is_marked_failed(db, report_store):
+    admin = add_user(db, "admin@example.com")
+    report = _run(db, _add_report(db, "no such template", admin.id))
+    
+    assert report.status == "failed"
+    assert report.error == "Unsupported report template type: no such template"
+    assert report.file_path is None
+
+def test_cached_report_follows_writes_by_other_processes(db, report_store, builder_calls):
+    admin = add_user(db, "admin@example.com")
+    first = _run(db, _add_report(db, "at_risk", admin.id))
+    template_id = first.template_id
+    
+    def rerun():
+        report = crud.create_generated_report(
+            db, schemas.GeneratedReportCreate(template_id=template_id, report_name="Report", report_type="csv"),
+            generated_by=admin.id
+        )
+        return _run(db, report)
+    
+    # Same template, parameters and data: served from the cache
+    second = rerun()
+    assert builder_calls == ["at_risk"]
+    with open(first.file_path) as a, open(second.file_path) as b:
+        assert a.read() == b.read()
+    
+    # A write on another connection, which fires no data change hooks in this process
+    db_student = add_student(db, "S001")
+    other_process = create_engine(settings.SQLALCHEMY_DATABASE_URL)
+    with other_process.begin() as connection:
+        connection.execute(AtRiskStudentFlag.__table__.insert().values(
+            student_id=db_student.id, grade_level="Grade 1", reasons="low_attendance", computed_at=datetime.now()
+        ))
+    other_process.dispose()
+    
+    third = rerun()
+    assert builder_calls == ["at_risk", "at_risk"]
+    with open(third.file_path) as f:
+        assert "low_attendance" in f.read()
@@ -0,0 +1,88 @@
+# tests/test_staff_parent_import.py
+import pytest
+
+from app.models.parent import Parent
+from app.models.staff import Staff
+from app.models.user import User
+from app.services import data_import_export
+from app.services.data_import_export import import_parents_from_file, import_teachers_from_file
+from conftest import add_student, add_user
+
+TEACHER_HEADER = "employee_id,first_name,last_name,email,department,position,hire_date\n"
+PARENT_HEADER = "user_id,student_id,relationship_type\n"
+
+@pytest.fixture(autouse=True)
+def fast_password_hash(monkeypatch):
+    monkeypatch.setattr(data_import_export, "get_password_hash", lambda password: "hashed")
+
+def _write_csv(tmp_path, name: str, text: str) -> str:
+    path = tmp_path / name
+    path.write_text(text)
+    return str(path)
+
+def test_teacher_import_creates_account_and_staff_record(db, tmp_path):
+    add_user(db, "taken@x.com", role="parent")
+    file_path = _write_csv(tmp_path, "teachers.csv", TEACHER_HEADER + (
+        "E001,Grace,Hopper,grace@x.com,Math,Teacher,2020-01-01\n"
+        "E002,Alan,Turing,taken@x.com,Math,Teacher,2020-01-01\n"  # email of another account
+        "E002,Alan,Turing,alan@x.com,Math,Teacher,2020-01-01\n"   # corrected
+        "E001,Grace,Hopper,grace2@x.com,Math,Teacher,2020-01-01\n"
+    ))
+    
+    result = import_teachers_from_file(file_path, db)
+    
+    assert result["successful_records"] == 2
+    assert result["errors"] == [
+        "Row 2: email already exists",
+        "Row 4: employee_id is duplicated in the file",
+    ]
+    staff = dict(db.query(Staff.employee_id, User.email).join(User, User.id == Staff.user_id))
+    assert staff == {"E001": "grace@x.com", "E002": "alan@x.com"}
+    assert {role for (role,) in db.query(User.role).filter(User.email != "taken@x.com")} == {"teacher"}
+
+def test_teacher_upsert_updates_account_and_staff_record(db, tmp_path):
+    import_teachers_from_file(_write_csv(tmp_path, "first.csv", TEACHER_HEADER + (
+        "E001,Grace,Hopper,grace@x.com,Math,Teacher,2020-01-01\n"
+    )), db)
+    
+    result = import_teachers_from_file(_write_csv(tmp_path, "second.csv", TEACHER_HEADER + (
+        "E001,Grace,Hopper,hopper@x.com,Computing,Head of Department,2020-01-01\n"
+        "E003,Ada,Lovelace,ada@x.com,Math,Teacher,2021-01-01\n"
+    )), db, mode="upsert")
+    
+    assert result["successful_records"] == 2
+    assert result["errors"] == []
+    db.expire_all()
+    assert db.query(User).count() == 2
+    department, email = db.query(Staff.department, User.email).join(User, User.id == Staff.user_id).filter(
+        Staff.employee_id == "E001"
+    ).one()
+    assert (department, email) == ("Computing", "hopper@x.com")
+
+def test_parent_import_insert_and_upsert(db, tmp_path):
+    guardian = add_user(db, "parent@x.com", role="parent")
+    first = add_student(db, "S001", email="s1@x.com")
+    second = add_student(db, "S002", email="s2@x.com")
+    
+    result = import_parents_from_file(_write_csv(tmp_path, "parents.csv", PARENT_HEADER + (
+        f"{guardian.id},{first.id},Mother\n"
+        f"{guardian.id},{first.id},Guardian\n"  # same pair
+        f"{guardian.id},999,Mother\n"
+    )), db)
+    assert result["successful_records"] == 1
+    assert result["errors"] == [
+        "Row 2: user_id/student_id pair is duplicated in the file",
+        "Row 3: student_id does not exist",
+    ]
+    
+    upsert_file = _write_csv(tmp_path, "upsert.csv", PARENT_HEADER + (
+        f"{guardian.id},{first.id},Guardian\n"
+        f"{guardian.id},{second.id},Mother\n"
+    ))
+    assert import_parents_from_file(upsert_file, db)["errors"] == [
+        "Row 1: parent already exists for this user_id and student_id"
+    ]
+    result = import_parents_from_file(upsert_file, db, mode="upsert")
+    assert result["successful_records"] == 2
+    db.expire_all()
+    assert sorted(db.query(Parent.student_id, Parent.relationship_type)) == [(first.id, "Guardian"), (second.id, "Mother")]
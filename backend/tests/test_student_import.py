@@ -0,0 +1,136 @@
+# tests/test_student_import.py
+import json
+
+import pytest
+
+from app.models.student import Student
+from app.services import data_import_export
+from app.services.data_import_export import import_students_from_file
+from conftest import add_student
+
+HEADER = "student_id,first_name,last_name,date_of_birth,gender,email,admission_date,grade_level\n"
+
+def _student_row(student_id: str, email: str, grade_level: str = "Grade 1") -> str:
+    return f"{student_id},Ada,Lovelace,2015-05-01,F,{email},2021-09-01,{grade_level}\n"
+
+def _write_csv(tmp_path, *rows: str) -> str:
+    path = tmp_path / "students.csv"
+    path.write_text(HEADER + "".join(rows))
+    return str(path)
+
+@pytest.fixture(params=[10000, 1], ids=["one chunk", "chunk per row"])
+def chunk_size(request, monkeypatch):
+    monkeypatch.setattr(data_import_export, "IMPORT_CHUNK_SIZE", request.param)
+    return request.param
+
+def test_rejected_row_does_not_block_corrected_row(db, tmp_path, chunk_size):
+    add_student(db, "S001", email="s1@x.com")
+    file_path = _write_csv(tmp_path, _student_row("Q001", "s1@x.com"), _student_row("Q001", "q1@x.com"))
+    
+    result = import_students_from_file(file_path, db)
+    
+    assert result["successful_records"] == 1
+    assert result["errors"] == ["Row 1: email already exists"]
+    assert db.query(Student.email).filter(Student.student_id == "Q001").scalar() == "q1@x.com"
+
+def test_duplicates_in_file_keep_first_occurrence(db, tmp_path, chunk_size):
+    file_path = _write_csv(
+        tmp_path,
+        _student_row("Q001", "q1@x.com"),
+        _student_row("Q001", "q2@x.com"),
+        _student_row("Q003", "q1@x.com"),
+        _student_row("Q004", "q4@x.com"),
+    )
+    
+    result = import_students_from_file(file_path, db)
+    
+    assert result["successful_records"] == 2
+    # Rows of earlier chunks are already written, so later repeats are reported as existing
+    if chunk_size > 1:
+        assert result["errors"] == [
+            "Row 2: student_id is duplicated in the file",
+            "Row 3: email is duplicated in the file",
+        ]
+    else:
+        assert result["errors"] == ["Row 2: student_id already exists", "Row 3: email already exists"]
+    assert {student_id for (student_id,) in db.query(Student.student_id)} == {"Q001", "Q004"}
+
+def test_upsert_updates_existing_student(db, tmp_path, chunk_size):
+    add_student(db, "S001", grade_level="Grade 1", email="s1@x.com")
+    add_student(db, "S002", grade_level="Grade 1", email="s2@x.com")
+    file_path = _write_csv(
+        tmp_path,
+        _student_row("S001", "s1@x.com", grade_level="Grade 2"),
+        _student_row("S003", "s2@x.com"),
+    )
+    
+    result = import_students_from_file(file_path, db, mode="upsert")
+    
+    assert result["successful_records"] == 1
+    assert result["errors"] == ["Row 2: email already exists"]
+    db.expire_all()
+    assert db.query(Student.grade_level).filter(Student.student_id == "S001").scalar() == "Grade 2"
+    assert db.query(Student).count() == 2
+
+def test_insert_reports_existing_student(db, tmp_path, chunk_size):
+    add_student(db, "S001", email="s1@x.com")
+    file_path = _write_csv(tmp_path, _student_row("S001", "other@x.com"))
+    
+    result = import_students_from_file(file_path, db)
+    
+    assert result["successful_records"] == 0
+    assert result["errors"] == ["Row 1: student_id already exists"]
+
+def test_json_import(db, tmp_path, monkeypatch):
+    # Small reads, so records straddle read boundaries
+    monkeypatch.setattr(data_import_export, "JSON_READ_SIZE", 16)
+    path = tmp_path / "students.json"
+    path.write_text(json.dumps([
+        {"student_id": "Q001", "first_name": "Zoë", "last_name": "Lovelace", "date_of_birth": "2015-05-01",
+         "gender": "F", "email": "q1@x.com", "admission_date": "2021-09-01", "grade_level": "Grade 1", "phone": 5550100},
+        {"student_id": "Q002", "first_name": "Alan", "last_name": "Turing", "date_of_birth": "not a date",
+         "gender": "M", "email": "q2@x.com", "admission_date": "2021-09-01", "grade_level": "Grade 1"},
+    ], indent=2))
+    
+    result = import_students_from_file(str(path), db)
+    
+    assert result["successful_records"] == 1
+    assert result["errors"] == ["Row 2: date_of_birth is not a valid date"]
+    assert db.query(Student.first_name, Student.phone).one() == ("Zoë", "5550100")
+
+def test_json_import_rejects_non_array(db, tmp_path):
+    path = tmp_path / "students.json"
+    path.write_text('{"student_id": "Q001"}')
+    
+    with pytest.raises(Exception, match="must be an array of objects"):
+        import_students_from_file(str(path), db)
+
+def test_parallel_parse_matches_serial_parse(db, tmp_path, monkeypatch):
+    # Quoted fields spanning lines, and ranges small enough to split the file many times
+    rows = [
+        f'Q{i:03d},"Ada\n{i}",Lovelace,2015-05-01,F,q{i}@x.com,2021-09-01,Grade {i % 3}\n' if i % 4 else
+        f'Q{i:03d},Alan,"Turing, ""Jr""",bad date,M,q{i}@x.com,2021-09-01,Grade 1\n'
+        for i in range(200)
+    ]
+    file_path = _write_csv(tmp_path, *rows)
+    monkeypatch.setattr(data_import_export, "IMPORT_PARSE_CHUNK_BYTES", 512)
+    monkeypatch.setattr(data_import_export.settings, "IMPORT_PARALLEL_MIN_BYTES", 0)
+    parsed = {}
+    for processes in (0, 2):
+        monkeypatch.setattr(data_import_export.settings, "IMPORT_PARSE_PROCESSES", processes)
+        parsed[processes] = list(data_import_export._parsed_chunks(
+            file_path, data_import_export.STUDENT_REQUIRED_COLUMNS, data_import_export._parse_student_frame
+        ))
+    
+    def flatten(chunks):
+        rows, failures = [], []
+        for _, (columns, tuples, row_numbers, chunk_failures) in chunks:
+            rows += [(row_number, dict(zip(columns, values))) for row_number, values in zip(row_numbers, tuples)]
+            failures += chunk_failures
+        return rows, failures
+    
+    assert len(parsed[2]) > 1
+    assert flatten(parsed[2]) == flatten(parsed[0])
+    serial_rows, serial_failures = flatten(parsed[0])
+    assert len(serial_rows) == 150 and len(serial_failures) == 50
+    assert serial_rows[0][1]["first_name"] == "Ada\n1"